@@ -1,3 +1,22 @@
 from django.contrib import admin
 
+from normal_user.admin_mixins import ChangelistPerformanceMixin
+from .models import Attendance
+
 # Register your models here.
+
+@admin.register(Attendance)
+class AttendanceAdmin(ChangelistPerformanceMixin, admin.ModelAdmin):
+    # Crore rows wali table — COUNT(*) estimate se, FK labels ek hi JOIN mein
+    list_display = ('student', 'standard', 'date', 'status', 'marked_by')
+    # Har filter (status / standard) + ordering ke liye model mein index hai
+    list_filter = ('status', ('date', admin.DateFieldListFilter), 'standard')
+    search_fields = ('student__student_unique_id',)
+    raw_id_fields = ('student', 'standard', 'marked_by')
+    readonly_fields = ('created_at', 'updated_at')
+    list_per_page = 50
+    # Model ka 'student' ordering StudentProfile join + poori table sort karwata hai
+    ordering = ('-date', '-id')
+
+    # StudentProfile.__str__ user ka naam padhta hai
+    changelist_select_related = ('student__user',)
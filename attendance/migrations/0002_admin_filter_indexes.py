@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 10:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+        ('students', '0004_studentpromotion'),
+        ('students_classroom', '0010_join_request_inbox_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['status', '-date', '-id'], name='attendance__status_98ab87_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['standard', '-date', '-id'], name='attendance__standar_9982ea_idx'),
+        ),
+    ]
@@ -46,6 +46,11 @@ class Attendance(models.Model):
         unique_together = ('student', 'date')
         verbose_name_plural = "Attendance"
         ordering = ['-date', 'student']
+        indexes = [
+            # Admin changelist filters + default ordering
+            models.Index(fields=['status', '-date', '-id']),
+            models.Index(fields=['standard', '-date', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.student.student_unique_id} - {self.date} ({self.status})"
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Exam, ExamSubject
+from .models import DocumentJob, Exam, ExamSubject, ReportCard
 
 # 1. Subjects ko Exam ke andar hi dikhane ke liye Inline class
 class ExamSubjectInline(admin.TabularInline):
@@ -23,4 +23,21 @@ class ExamAdmin(admin.ModelAdmin):
     inlines = [ExamSubjectInline]
 
     # Hidden fields ko read-only bana dete hain taaki koi galti se change na kare
-    readonly_fields = ('external_id', 'created_at', 'updated_at', 'created_by')
\ No newline at end of file
+    readonly_fields = ('external_id', 'created_at', 'updated_at', 'created_by')
+
+
+@admin.register(ReportCard)
+class ReportCardAdmin(admin.ModelAdmin):
+    # Computed rows hain — edit nahi, "compute-report-cards" se dobara bante hain
+    list_display = ('student', 'exam', 'board', 'percentage', 'grade', 'rank', 'passed')
+    list_filter = ('board', 'passed', 'exam__organization')
+    search_fields = ('student__student_unique_id', 'exam__exam_title')
+    readonly_fields = [field.name for field in ReportCard._meta.fields]
+
+
+@admin.register(DocumentJob)
+class DocumentJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'exam', 'kind', 'bundle', 'status', 'processed', 'total', 'created_at')
+    list_filter = ('kind', 'status', 'exam__organization')
+    readonly_fields = [field.name for field in DocumentJob._meta.fields]
+
@@ -3,3 +3,19 @@ from django.apps import AppConfig
 
 class ExamsConfig(AppConfig):
     name = 'exams'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_init, post_save
+        from .leaderboard import (
+            exam_subject_deleted, exam_subject_saved, remember_result_state, remember_subject_max,
+            result_deleted, result_saved,
+        )
+
+        # Class leaderboard: result badla toh sirf us student ka bucket move (Fenwick tree)
+        post_init.connect(remember_result_state, sender='students.StudentResult', dispatch_uid='exams.leaderboard.result.init')
+        post_save.connect(result_saved, sender='students.StudentResult', dispatch_uid='exams.leaderboard.result.save')
+        post_delete.connect(result_deleted, sender='students.StudentResult', dispatch_uid='exams.leaderboard.result.delete')
+        # Subject hata / max_marks badle toh poore exam ka rebuild
+        post_init.connect(remember_subject_max, sender='exams.ExamSubject', dispatch_uid='exams.leaderboard.subject.init')
+        post_save.connect(exam_subject_saved, sender='exams.ExamSubject', dispatch_uid='exams.leaderboard.subject.save')
+        post_delete.connect(exam_subject_deleted, sender='exams.ExamSubject', dispatch_uid='exams.leaderboard.subject.delete')
@@ -0,0 +1,285 @@
+"""
+Batch document rendering — report cards aur hall tickets, poori class ek saath.
+
+Flow (DocumentJob):
+
+1. Parent process data chunks mein prefetch karta hai (keyset on id,
+   select_related) aur plain dicts banata hai — workers DB ko kabhi nahi chhoote.
+2. Chunks ek `ProcessPoolExecutor` (spawn) mein jaate hain. Har worker startup
+   pe ek baar Django setup + templates compile karta hai; phir sirf render +
+   layout (CPU wala kaam).
+3. Results aate hi (submit order mein) har student ki PDF storage mein likhi
+   jaati hai aur merged class PDF / ZIP temp file mein stream hota hai —
+   poora batch memory mein kabhi nahi. Har chunk pe job.processed update.
+
+In-flight chunks `workers * 2` tak limited hain, taaki prefetch render se
+bahut aage na bhaage.
+
+API request job banati hai aur `start_job()` commit ke baad background
+thread mein run_job chalata hai; `render_exam_documents` command wahi kaam
+synchronously karta hai.
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import pdf
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 100
+DOCUMENTS_ROOT = "documents"
+TEMPLATES = {
+    "REPORT_CARD": "exams/documents/report_card.txt",
+    "HALL_TICKET": "exams/documents/hall_ticket.txt",
+}
+
+
+def render_workers():
+    return getattr(settings, "DOCUMENT_RENDER_WORKERS", None) or os.cpu_count() or 2
+
+
+# ── Worker process ────────────────────────────────────────────────────
+
+_compiled = {}
+
+
+def _init_worker():
+    """Har worker process mein ek baar: Django setup + templates compile."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django.template.loader import get_template
+
+    for kind, name in TEMPLATES.items():
+        _compiled[kind] = get_template(name)
+
+
+def render_chunk(kind, shared, rows):
+    """[(filename, page streams)] — worker mein chalta hai, DB access nahi."""
+    if kind not in _compiled:
+        _init_worker()
+    template = _compiled[kind]
+    return [(row["filename"], pdf.layout(template.render({**shared, **row}))) for row in rows]
+
+
+# ── Data (parent process) ─────────────────────────────────────────────
+
+def _chunks(queryset):
+    """Keyset (id) chunks — OFFSET nahi."""
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by("id")[:CHUNK_SIZE])
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _student(profile):
+    return {"name": profile.user.get_full_name(), "unique_id": profile.student_unique_id}
+
+
+def _filename(profile):
+    return f"{profile.student_unique_id or 'student'}-{profile.pk}.pdf".replace("/", "-")
+
+
+def _shared(exam):
+    return {
+        "organization": {"name": exam.organization.name},
+        "standard": exam.target_standard.name,
+        "exam": {
+            "title": exam.exam_title,
+            "academic_year": exam.academic_year,
+            "start_date": exam.start_date.strftime("%d %b %Y"),
+            "end_date": exam.end_date.strftime("%d %b %Y"),
+        },
+    }
+
+
+def _report_card_source(exam):
+    cards = exam.report_cards.select_related("student__user")
+    shared = {**_shared(exam), "class_size": cards.count()}
+
+    def chunks():
+        for rows in _chunks(cards):
+            yield [{
+                "filename": _filename(card.student),
+                "student": _student(card.student),
+                "card": {
+                    "board": card.board,
+                    "total_obtained": card.total_obtained,
+                    "total_max": card.total_max,
+                    "percentage": card.percentage,
+                    "grade": card.grade,
+                    "passed": card.passed,
+                    "rank": card.rank,
+                    "percentile": card.percentile,
+                    "subjects": card.subjects,
+                },
+            } for card in rows]
+
+    return shared["class_size"], shared, chunks()
+
+
+def _hall_ticket_source(exam):
+    from students.models import StudentProfile
+
+    students = StudentProfile.objects.filter(
+        organization=exam.organization, current_standard=exam.target_standard, is_active=True
+    ).select_related("user")
+    shared = {
+        **_shared(exam),
+        "subjects": [{
+            "subject": subject.subject_name,
+            "date": subject.date.strftime("%d %b %Y"),
+            "start": subject.start_time.strftime("%I:%M %p"),
+            "end": subject.end_time.strftime("%I:%M %p"),
+            "room": subject.room_no,
+            "instruction": subject.instruction,
+        } for subject in exam.subjects.all()],
+    }
+    ticket_prefix = exam.external_id.hex[:6].upper()
+
+    def chunks():
+        for rows in _chunks(students):
+            yield [{
+                "filename": _filename(profile),
+                "student": _student(profile),
+                "ticket_no": f"{ticket_prefix}-{profile.pk:06d}",
+            } for profile in rows]
+
+    return students.count(), shared, chunks()
+
+
+SOURCES = {"REPORT_CARD": _report_card_source, "HALL_TICKET": _hall_ticket_source}
+
+
+# ── Job ───────────────────────────────────────────────────────────────
+
+class _Bundle:
+    """Merged class file — PDF (saare pages ek document) ya ZIP (har student ki PDF)."""
+
+    def __init__(self, kind, fileobj):
+        self.kind = kind
+        if kind == "ZIP":
+            self._zip = zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED)
+        else:
+            self._pdf = pdf.PdfWriter(fileobj)
+
+    def add(self, filename, pages, data):
+        if self.kind == "ZIP":
+            self._zip.writestr(filename, data)
+        else:
+            for content in pages:
+                self._pdf.add_page(content)
+
+    def close(self):
+        if self.kind == "ZIP":
+            self._zip.close()
+        else:
+            self._pdf.close()
+
+
+def run_job(job_id, workers=None):
+    """DocumentJob render karo (blocking). Failure job.status = FAILED + error mein."""
+    from .models import DocumentJob
+
+    job = DocumentJob.objects.select_related("exam__organization", "exam__target_standard").get(pk=job_id)
+    exam = job.exam
+    try:
+        total, shared, chunks = SOURCES[job.kind](exam)
+        prefix = f"{DOCUMENTS_ROOT}/{exam.external_id}/{job.pk}"
+        DocumentJob.objects.filter(pk=job.pk).update(
+            status="RUNNING", started_at=timezone.now(), total=total, processed=0, output_prefix=prefix, error=""
+        )
+
+        workers = workers or render_workers()
+        processed = 0
+        with tempfile.TemporaryFile() as bundle_file:
+            bundle = _Bundle(job.bundle, bundle_file)
+            try:
+                # spawn, fork nahi — child mein parent ke DB sockets / threads nahi aate
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                ) as pool:
+                    pending = deque()
+                    for rows in chunks:
+                        pending.append((len(rows), pool.submit(render_chunk, job.kind, shared, rows)))
+                        if len(pending) >= workers * 2:
+                            processed = _drain(pending, prefix, bundle, processed, job.pk)
+                    while pending:
+                        processed = _drain(pending, prefix, bundle, processed, job.pk)
+            finally:
+                bundle.close()
+            bundle_file.seek(0)
+            extension = "zip" if job.bundle == "ZIP" else "pdf"
+            name = f"{prefix}/{job.kind.lower()}-{exam.target_standard.name}.{extension}".replace(" ", "_")
+            output = default_storage.save(name, File(bundle_file, name=name))
+
+        DocumentJob.objects.filter(pk=job.pk).update(
+            status="DONE", processed=processed, output=output, finished_at=timezone.now()
+        )
+    except Exception as exc:
+        logger.exception("Document job %s failed", job_id)
+        DocumentJob.objects.filter(pk=job.pk).update(status="FAILED", error=str(exc)[:2000], finished_at=timezone.now())
+        raise
+
+
+def _drain(pending, prefix, bundle, processed, job_id):
+    """Sabse purana chunk (submit order) likho — merged file mein order stable rehta hai."""
+    from .models import DocumentJob
+
+    count, future = pending.popleft()
+    for filename, pages in future.result():
+        data = pdf.write_pdf(pages)
+        default_storage.save(f"{prefix}/{filename}", ContentFile(data))
+        bundle.add(filename, pages, data)
+    processed += count
+    DocumentJob.objects.filter(pk=job_id).update(processed=processed)
+    return processed
+
+
+# ── Background start (API) ────────────────────────────────────────────
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def _get_runner():
+    # Ek waqt pe ek job — har job khud saare cores use karta hai
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="document-jobs")
+        return _runner
+
+
+def _run_in_background(job_id):
+    try:
+        run_job(job_id)
+    except Exception:
+        pass  # run_job ne job FAILED mark + log kar diya
+    finally:
+        connection.close()
+
+
+def start_job(job_id):
+    """Commit ke baad job background thread mein queue karo."""
+    transaction.on_commit(lambda: _get_runner().submit(_run_in_background, job_id))
@@ -0,0 +1,286 @@
+"""
+Incremental class leaderboard — "rank in class" per exam.
+
+Exam yahan ek standard ka hota hai (Exam.target_standard), isliye
+(standard, exam) ka index = exam ka index. Har request pe poori class rank
+karne ki jagah:
+
+- LeaderboardEntry: har student ka current total + `bucket`
+  (percentage * 100, 0..10000).
+- LeaderboardNode: bucket counts ka Fenwick tree, DB mein sparse rows.
+  Update = O(log B) rows pe `count = count ± 1` (atomic, koi read-modify-write
+  nahi); prefix sum = O(log B) rows ka ek SUM.
+
+StudentResult save / delete hone pe sirf us student ka total dobara banta hai
+(O(subjects)) aur bucket badla toh tree mein -1 / +1. Rank aur percentile:
+entry (index lookup) + ek aggregate = O(log n). Top-N: (exam, -bucket) index
+scan = O(N).
+
+Rank competition style (ties same rank: 1, 2, 2, 4), percentile = kitne %
+students is score ya neeche — report_cards jaisa hi. Scores 0.01% tak
+compare hote hain.
+
+Bulk writes (bulk_create / queryset.update) signals nahi bhejte — unke baad
+`rebuild_leaderboards` chalao.
+"""
+from collections import Counter, defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+
+MAX_BUCKET = 10000  # 100.00%
+SIZE = MAX_BUCKET + 1  # Fenwick positions 1..SIZE (bucket b -> position b + 1)
+DEFAULT_TOP = 10
+MAX_TOP = 100
+
+
+def bucket_for(obtained, max_marks):
+    if not max_marks:
+        return 0
+    percentage = (Decimal(obtained) * 100 / Decimal(max_marks)).quantize(Decimal("0.01"), ROUND_HALF_UP)
+    return max(0, min(MAX_BUCKET, int(percentage * 100)))
+
+
+# ── Fenwick tree (DB rows) ────────────────────────────────────────────
+
+def _update_path(position):
+    while position <= SIZE:
+        yield position
+        position += position & -position
+
+
+def _prefix_path(position):
+    while position > 0:
+        yield position
+        position -= position & -position
+
+
+def _apply(exam_id, deltas):
+    """{bucket: ±n} tree pe lagao. Same node ke deltas pehle jud jaate hain (move = aksar chhota path)."""
+    from .models import LeaderboardNode
+
+    changes = Counter()
+    for bucket, delta in deltas.items():
+        for position in _update_path(bucket + 1):
+            changes[position] += delta
+    by_delta = defaultdict(list)
+    for position, delta in changes.items():
+        if delta:
+            by_delta[delta].append(position)
+    if not by_delta:
+        return
+
+    # Sparse tree — jo node abhi tak nahi bana, wo 0 se shuru
+    new_positions = [p for delta, positions in by_delta.items() if delta > 0 for p in positions]
+    if new_positions:
+        LeaderboardNode.objects.bulk_create(
+            [LeaderboardNode(exam_id=exam_id, position=p) for p in new_positions], ignore_conflicts=True
+        )
+    for delta, positions in by_delta.items():
+        LeaderboardNode.objects.filter(exam_id=exam_id, position__in=positions).update(count=F("count") + delta)
+
+
+def _student_totals(results):
+    """(student_id, subject_id, marks, max_marks) rows (id order) -> {student_id: (obtained, max)}."""
+    per_subject = {}
+    for student_id, subject_id, marks, max_marks in results:
+        per_subject[(student_id, subject_id)] = (marks, max_marks)  # Re-test: baad wala jeetega
+    totals = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for (student_id, _), (marks, max_marks) in per_subject.items():
+        totals[student_id][0] += marks
+        totals[student_id][1] += max_marks
+    return totals
+
+
+def _results(**filters):
+    from students.models import StudentResult
+
+    return StudentResult.objects.filter(exam_subject__isnull=False, **filters).values_list(
+        "student_id", "exam_subject_id", "marks_obtained", "exam_subject__max_marks"
+    ).order_by("id")
+
+
+# ── Maintenance ───────────────────────────────────────────────────────
+
+def refresh_student(exam_id, student_id):
+    """Is student ka exam total dobara banao aur tree ko incrementally update karo."""
+    from .models import LeaderboardEntry
+
+    with transaction.atomic():
+        # Pehle entry lock (na ho toh bana ke) — phir totals. Ulta order ho toh do
+        # parallel refresh mein purane totals wala baad mein likh ke naye ko overwrite kar deta
+        entry, created = LeaderboardEntry.objects.select_for_update().get_or_create(
+            exam_id=exam_id, student_id=student_id,
+            defaults={"obtained": 0, "max_marks": 0, "bucket": 0},
+        )
+        totals = _student_totals(_results(student_id=student_id, exam_subject__exam_id=exam_id))
+
+        if student_id not in totals:
+            entry.delete()
+            if not created:
+                _apply(exam_id, {entry.bucket: -1})
+            return None
+
+        obtained, max_marks = totals[student_id]
+        bucket = bucket_for(obtained, max_marks)
+        previous = entry.bucket
+        entry.obtained, entry.max_marks, entry.bucket = obtained, max_marks, bucket
+        entry.save(update_fields=["obtained", "max_marks", "bucket", "updated_at"])
+        if created:
+            _apply(exam_id, {bucket: +1})
+        elif previous != bucket:
+            _apply(exam_id, {previous: -1, bucket: +1})
+        return entry
+
+
+def rebuild(exam_id):
+    """Poora index results se dobara (backfill / bulk import ke baad). O(n + B)."""
+    from .models import LeaderboardEntry, LeaderboardNode
+
+    totals = _student_totals(_results(exam_subject__exam_id=exam_id).iterator())
+    entries = []
+    tree = [0] * (SIZE + 1)
+    for student_id, (obtained, max_marks) in totals.items():
+        bucket = bucket_for(obtained, max_marks)
+        entries.append(LeaderboardEntry(
+            exam_id=exam_id, student_id=student_id, obtained=obtained, max_marks=max_marks, bucket=bucket
+        ))
+        tree[bucket + 1] += 1
+    # Counts se Fenwick tree O(B) mein: har node apna sum parent ko de deta hai
+    for position in range(1, SIZE + 1):
+        parent = position + (position & -position)
+        if parent <= SIZE:
+            tree[parent] += tree[position]
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(exam_id=exam_id).delete()
+        LeaderboardNode.objects.filter(exam_id=exam_id).delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+        LeaderboardNode.objects.bulk_create([
+            LeaderboardNode(exam_id=exam_id, position=position, count=count)
+            for position, count in enumerate(tree) if position and count
+        ], batch_size=1000)
+    return len(entries)
+
+
+# ── Reads ─────────────────────────────────────────────────────────────
+
+def rank_of(exam_id, student_id):
+    """{"rank", "out_of", "percentile", ...} ya None (student ka is exam mein result nahi)."""
+    from .models import LeaderboardEntry, LeaderboardNode
+
+    entry = LeaderboardEntry.objects.filter(exam_id=exam_id, student_id=student_id).first()
+    if entry is None:
+        return None
+    at_or_below_path = list(_prefix_path(entry.bucket + 1))
+    total_path = list(_prefix_path(SIZE))
+    sums = LeaderboardNode.objects.filter(
+        exam_id=exam_id, position__in=set(at_or_below_path + total_path)
+    ).aggregate(
+        at_or_below=Sum("count", filter=Q(position__in=at_or_below_path)),
+        total=Sum("count", filter=Q(position__in=total_path)),
+    )
+    total, at_or_below = sums["total"] or 0, sums["at_or_below"] or 0
+    return {
+        "student_id": student_id,
+        "obtained": entry.obtained,
+        "max_marks": entry.max_marks,
+        "percentage": Decimal(entry.bucket).scaleb(-2),
+        "rank": total - at_or_below + 1,
+        "out_of": total,
+        "percentile": round(at_or_below * 100 / total, 2) if total else None,
+    }
+
+
+def top(exam_id, limit=DEFAULT_TOP):
+    """Top-N (rank order) — index scan, ties same rank."""
+    from .models import LeaderboardEntry
+
+    limit = max(1, min(limit, MAX_TOP))
+    entries = LeaderboardEntry.objects.filter(exam_id=exam_id).select_related("student__user").order_by(
+        "-bucket", "student_id"
+    )[:limit]
+    rows, rank, previous = [], 0, None
+    for position, entry in enumerate(entries, start=1):
+        if entry.bucket != previous:
+            rank, previous = position, entry.bucket
+        rows.append({
+            "rank": rank,
+            "student_id": entry.student_id,
+            "student_unique_id": entry.student.student_unique_id,
+            "student_name": entry.student.user.get_full_name(),
+            "obtained": entry.obtained,
+            "max_marks": entry.max_marks,
+            "percentage": Decimal(entry.bucket).scaleb(-2),
+        })
+    return rows
+
+
+# ── Signals ───────────────────────────────────────────────────────────
+# StudentResult: post_init pe (exam_subject, student, marks) ka snapshot —
+# save pe sirf tab kaam jab score ya exam badla. ExamSubject delete / max_marks
+# badla toh poore exam ka rebuild (commit ke baad).
+
+
+def _exam_ids(subject_ids):
+    from .models import ExamSubject
+
+    subject_ids = [s for s in subject_ids if s]
+    if not subject_ids:
+        return set()
+    return set(ExamSubject.objects.filter(pk__in=subject_ids).values_list("exam_id", flat=True))
+
+
+def _result_state(instance):
+    return (
+        instance.__dict__.get("exam_subject_id"),
+        instance.__dict__.get("student_id"),
+        instance.__dict__.get("marks_obtained"),
+    )
+
+
+def remember_result_state(sender, instance, **kwargs):
+    instance._leaderboard_state = _result_state(instance)
+
+
+def result_saved(sender, instance, created=False, **kwargs):
+    before = getattr(instance, "_leaderboard_state", None)
+    after = _result_state(instance)
+    instance._leaderboard_state = after
+    if not created and before == after:
+        return  # Grade / remarks badle — score same
+    touched = {(after[0], after[1])}
+    if before and not created:
+        touched.add((before[0], before[1]))
+    for subject_id, student_id in touched:
+        for exam_id in _exam_ids([subject_id]):
+            refresh_student(exam_id, student_id)
+
+
+def result_deleted(sender, instance, **kwargs):
+    subject_id, student_id, _ = getattr(instance, "_leaderboard_state", _result_state(instance))
+    for exam_id in _exam_ids([subject_id]):
+        refresh_student(exam_id, student_id)
+
+
+def schedule_rebuild(exam_id):
+    # Global "pending" set nahi — transaction rollback hua toh callback hat jaata,
+    # par id set mein atki reh jaati aur us exam ka rebuild kabhi schedule na hota.
+    # Ek transaction mein kai subjects badle toh rebuild kai baar — idempotent hai.
+    transaction.on_commit(lambda: rebuild(exam_id))
+
+
+def remember_subject_max(sender, instance, **kwargs):
+    instance._leaderboard_max = instance.__dict__.get("max_marks")
+
+
+def exam_subject_saved(sender, instance, created=False, **kwargs):
+    if not created and getattr(instance, "_leaderboard_max", None) != instance.max_marks:
+        schedule_rebuild(instance.exam_id)
+    instance._leaderboard_max = instance.max_marks
+
+
+def exam_subject_deleted(sender, instance, **kwargs):
+    # Results SET_NULL ho gaye (queryset update — signal nahi aata)
+    schedule_rebuild(instance.exam_id)
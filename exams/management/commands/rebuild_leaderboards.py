@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from exams.leaderboard import rebuild
+from exams.models import Exam
+
+
+class Command(BaseCommand):
+    help = 'Class leaderboards (rank index) results se dobara banata hai — backfill / bulk import ke baad'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', type=int, action='append', help='Sirf ye exam(s); default: saare active exams')
+
+    def handle(self, *args, **options):
+        exams = Exam.objects.filter(is_active=True)
+        if options['exam']:
+            exams = Exam.objects.filter(pk__in=options['exam'])
+
+        started = time.monotonic()
+        count, students = 0, 0
+        for exam_id in exams.values_list('id', flat=True).iterator():
+            students += rebuild(exam_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} leaderboards ({students} students) {time.monotonic() - started:.1f}s mein ban gaye.'
+        ))
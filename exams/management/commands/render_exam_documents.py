@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.documents import render_workers, run_job
+from exams.models import DocumentJob, Exam
+
+
+class Command(BaseCommand):
+    help = 'Exam ke report cards / hall tickets ki PDFs batch mein banata hai (process pool, synchronous)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('exam_id', type=int)
+        parser.add_argument('--kind', choices=['report_card', 'hall_ticket'], default='hall_ticket')
+        parser.add_argument('--bundle', choices=['pdf', 'zip'], default='pdf', help='Merged class file ka format')
+        parser.add_argument('--workers', type=int, default=None, help='Default: DOCUMENT_RENDER_WORKERS / CPU count')
+
+    def handle(self, *args, **options):
+        exam = Exam.objects.filter(pk=options['exam_id']).first()
+        if exam is None:
+            raise CommandError(f"Exam {options['exam_id']} nahi mila.")
+        kind = options['kind'].upper()
+        if kind == 'REPORT_CARD' and not exam.report_cards.exists():
+            raise CommandError('Bhai, pehle report cards compute karo (compute-report-cards).')
+
+        job = DocumentJob.objects.create(exam=exam, kind=kind, bundle=options['bundle'].upper())
+        workers = options['workers'] or render_workers()
+        started = time.monotonic()
+        run_job(job.pk, workers=workers)
+        job.refresh_from_db()
+        self.stdout.write(self.style.SUCCESS(
+            f'{job.processed} PDFs {time.monotonic() - started:.1f}s mein ({workers} workers). '
+            f'Merged: {job.output.name}'
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-19 10:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0001_initial'),
+        ('students', '0008_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=10)),
+                ('total_obtained', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('total_max', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('grade', models.CharField(max_length=5)),
+                ('passed', models.BooleanField(default=True)),
+                ('rank', models.PositiveIntegerField()),
+                ('percentile', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('subjects', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_cards', to='exams.exam')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_cards', to='students.studentprofile')),
+            ],
+            options={
+                'ordering': ['rank', 'student_id'],
+                'indexes': [models.Index(fields=['exam', 'rank'], name='exams_repor_exam_id_8c6e18_idx'), models.Index(fields=['student', '-computed_at'], name='exams_repor_student_1f0904_idx')],
+                'unique_together': {('exam', 'student')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-19 11:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_document_job'),
+        ('students', '0009_result_exam_subject'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('obtained', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('max_marks', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('bucket', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='exams.exam')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='students.studentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['exam', '-bucket', 'student'], name='exams_leade_exam_id_cefbaf_idx')],
+                'unique_together': {('exam', 'student')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardNode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_nodes', to='exams.exam')),
+            ],
+            options={
+                'unique_together': {('exam', 'position')},
+            },
+        ),
+    ]
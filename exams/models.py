@@ -46,4 +46,118 @@ class ExamSubject(models.Model):
     instruction = models.TextField(blank=True, null=True) # Har subject ke liye alag instruction (e.g. "Bring Calculator")
 
     class Meta:
-        ordering = ['date', 'start_time']
\ No newline at end of file
+        ordering = ['date', 'start_time']
+
+class ReportCard(models.Model):
+    """
+    Materialized report card — exams.report_cards.compute_report_cards() ek exam ke
+    saare results se ek vectorized pass mein banata hai; API seedha yahi rows serve karti hai.
+    `subjects` = [{subject, marks, max_marks, percentage, grade, rank, passed}, ...]
+    """
+    exam = models.ForeignKey(Exam, related_name='report_cards', on_delete=models.CASCADE)
+    student = models.ForeignKey('students.StudentProfile', related_name='report_cards', on_delete=models.CASCADE)
+    board = models.CharField(max_length=10)  # Grading table: CBSE / ICSE
+    total_obtained = models.DecimalField(max_digits=8, decimal_places=2)
+    total_max = models.DecimalField(max_digits=8, decimal_places=2)
+    percentage = models.DecimalField(max_digits=5, decimal_places=2)
+    grade = models.CharField(max_length=5)
+    passed = models.BooleanField(default=True)
+    rank = models.PositiveIntegerField()
+    percentile = models.DecimalField(max_digits=5, decimal_places=2)
+    subjects = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('exam', 'student')
+        ordering = ['rank', 'student_id']
+        indexes = [
+            models.Index(fields=['exam', 'rank']),
+            models.Index(fields=['student', '-computed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.exam_id}: {self.percentage}% (#{self.rank})"
+
+
+class DocumentJob(models.Model):
+    """
+    Batch PDF job (report cards / hall tickets) — exams.documents.run_job() process
+    pool mein render karta hai. Har student ki PDF `output_prefix` ke neeche; poori
+    class ek file mein (`output`: merged PDF ya ZIP). Client status yahin se poll karta hai.
+    """
+    KIND_CHOICES = [
+        ('REPORT_CARD', 'Report Card'),
+        ('HALL_TICKET', 'Hall Ticket'),
+    ]
+    BUNDLE_CHOICES = [
+        ('PDF', 'Merged PDF'),
+        ('ZIP', 'ZIP of PDFs'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    exam = models.ForeignKey(Exam, related_name='document_jobs', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    bundle = models.CharField(max_length=5, choices=BUNDLE_CHOICES, default='PDF')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    output_prefix = models.CharField(max_length=255, blank=True)  # Individual PDFs ka folder (storage mein)
+    output = models.FileField(max_length=255, blank=True)  # Merged class PDF / ZIP
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='document_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status} {self.processed}/{self.total})"
+
+    @property
+    def progress(self):
+        if self.status == 'DONE':
+            return 100
+        return round(self.processed * 100 / self.total) if self.total else 0
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Exam leaderboard mein ek student ka current score (exams.leaderboard).
+    `bucket` = percentage * 100 (0..10000) — Fenwick tree isi pe chalta hai;
+    top-N seedha (exam, -bucket) index se padhte hain.
+    """
+    exam = models.ForeignKey(Exam, related_name='leaderboard_entries', on_delete=models.CASCADE)
+    student = models.ForeignKey('students.StudentProfile', related_name='leaderboard_entries', on_delete=models.CASCADE)
+    obtained = models.DecimalField(max_digits=8, decimal_places=2)
+    max_marks = models.DecimalField(max_digits=8, decimal_places=2)
+    bucket = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('exam', 'student')
+        indexes = [
+            models.Index(fields=['exam', '-bucket', 'student']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.exam_id}: {self.bucket / 100}%"
+
+
+class LeaderboardNode(models.Model):
+    """
+    Fenwick (binary indexed) tree ka ek node — per exam, sparse (sirf wo
+    positions jinhe kabhi touch kiya). count = us node ki range mein kitne students.
+    """
+    exam = models.ForeignKey(Exam, related_name='leaderboard_nodes', on_delete=models.CASCADE)
+    position = models.PositiveIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('exam', 'position')
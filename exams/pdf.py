@@ -0,0 +1,162 @@
+"""
+Chhota, dependency-free PDF writer (report cards / hall tickets ke liye).
+
+Documents sirf text + lines hain, isliye poori PDF library ki zarurat nahi:
+standard Helvetica fonts (embed nahi hote), A4 pages, deflate-compressed
+content streams.
+
+Layout ek simple line markup se aata hai (templates isi mein render hote hain):
+
+    # Heading            bold 16pt
+    ## Sub heading       bold 12pt
+    || a | b | c         table header row (bold)
+    | a | b | c          table row — columns barabar width
+    ---                  horizontal rule
+    ~                    khali jagah
+    baaki sab            10pt text (lambi line wrap ho jaati hai)
+
+Khali lines ignore hoti hain (template tags wali lines bachti hain). Text
+WinAnsi (cp1252) mein encode hota hai — jo character usmein nahi, wo "?".
+
+`PdfWriter` file pe incrementally likhta hai — hazaron pages wala merged
+class PDF memory mein nahi banta.
+"""
+import io
+import textwrap
+import zlib
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 points
+MARGIN = 50
+FONTS = {"regular": b"/F1", "bold": b"/F2"}
+STYLES = {  # markup -> (font, size, line height)
+    "h1": ("bold", 16, 24),
+    "h2": ("bold", 12, 18),
+    "th": ("bold", 10, 15),
+    "td": ("regular", 10, 15),
+    "text": ("regular", 10, 14),
+}
+SPACER = 10
+AVG_CHAR_WIDTH = 0.5  # Helvetica ~0.5 em — wrap / column clipping ke liye kaafi
+
+
+def _escape(text):
+    raw = text.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _text_op(x, y, style, text):
+    font, size, _ = STYLES[style]
+    return b"BT %s %d Tf %.1f %.1f Td (%s) Tj ET\n" % (FONTS[font], size, x, y, _escape(text))
+
+
+def _fit(text, width, size):
+    limit = max(1, int(width / (size * AVG_CHAR_WIDTH)))
+    return text if len(text) <= limit else text[:max(1, limit - 1)] + "…"
+
+
+def layout(markup):
+    """Markup text -> page content streams (list of bytes, ek per page)."""
+    usable = PAGE_WIDTH - 2 * MARGIN
+    pages, ops = [], []
+    y = PAGE_HEIGHT - MARGIN
+
+    def need(height):
+        nonlocal ops, y
+        if y - height < MARGIN:
+            pages.append(b"".join(ops))
+            ops, y = [], PAGE_HEIGHT - MARGIN
+
+    for raw in markup.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line == "~":
+            need(SPACER)
+            y -= SPACER
+        elif line == "---":
+            need(SPACER)
+            y -= SPACER / 2
+            ops.append(b"0.5 w %d %.1f m %d %.1f l S\n" % (MARGIN, y, PAGE_WIDTH - MARGIN, y))
+            y -= SPACER / 2
+        elif line.startswith("|"):
+            style = "th" if line.startswith("||") else "td"
+            cells = [cell.strip() for cell in line.lstrip("|").split("|")]
+            _, size, height = STYLES[style]
+            need(height)
+            y -= height
+            column = usable / len(cells)
+            for i, cell in enumerate(cells):
+                ops.append(_text_op(MARGIN + i * column, y, style, _fit(cell, column - 4, size)))
+        else:
+            style, text = "text", line
+            if line.startswith("## "):
+                style, text = "h2", line[3:]
+            elif line.startswith("# "):
+                style, text = "h1", line[2:]
+            _, size, height = STYLES[style]
+            width = max(1, int(usable / (size * AVG_CHAR_WIDTH)))
+            for part in textwrap.wrap(text, width) or [""]:
+                need(height)
+                y -= height
+                ops.append(_text_op(MARGIN, y, style, part))
+
+    if ops or not pages:
+        pages.append(b"".join(ops))
+    return pages
+
+
+class PdfWriter:
+    """
+    Streaming PDF writer. Object numbers: 1 catalog, 2 pages tree, 3/4 fonts,
+    phir har page ke 2 (page + content). Pages tree aur xref close() pe.
+    """
+
+    def __init__(self, fileobj):
+        self._file = fileobj
+        self._offset = 0
+        self._offsets = {}
+        self._kids = []
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        self._next = 5
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def _object(self, number, body):
+        self._offsets[number] = self._offset
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    def add_page(self, content):
+        page, stream = self._next, self._next + 1
+        self._next += 2
+        self._object(page, (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+        ) % (PAGE_WIDTH, PAGE_HEIGHT, stream))
+        packed = zlib.compress(content)
+        self._object(stream, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(packed), packed))
+        self._kids.append(page)
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % kid for kid in self._kids)
+        self._object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._kids)))
+        xref_at = self._offset
+        size = self._next
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            self._write(b"%010d 00000 n \n" % self._offsets[number])
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at))
+
+
+def write_pdf(pages):
+    """Page content streams -> poora PDF (bytes)."""
+    buffer = io.BytesIO()
+    writer = PdfWriter(buffer)
+    for content in pages:
+        writer.add_page(content)
+    writer.close()
+    return buffer.getvalue()
@@ -0,0 +1,234 @@
+"""
+Report-card engine.
+
+Ek exam (term + standard) ke saare StudentResult rows ek students × subjects
+matrix mein load hote hain (numpy ho toh arrays, warna pure Python) aur ek hi
+pass mein:
+
+- totals, percentage (absent subject total_max mein nahi ginta)
+- board ke hisaab se grade — CBSE 9-point (A1..E) ya ICSE (1..9)
+- pass / fail (har subject passing_marks pe)
+- overall + subject-wise rank (ties same rank: 1, 2, 2, 4) aur percentile
+  (kitne % students is score ya neeche hain)
+
+Result ReportCard table mein materialize hota hai — API wahi rows serve karti
+hai, har request pe calculation nahi. Subject grades StudentResult.grade mein
+bhi likh diye jaate hain.
+"""
+from bisect import bisect_right
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:  # numpy optional hai — bina uske pure-Python path
+    np = None
+
+from django.db import transaction
+
+from students.models import StudentResult
+
+from .models import Exam, ReportCard
+
+# (lower bound %, grade) — ascending
+GRADING_TABLES = {
+    "CBSE": ((0, "E"), (33, "D"), (41, "C2"), (51, "C1"), (61, "B2"), (71, "B1"), (81, "A2"), (91, "A1")),
+    "ICSE": ((0, "9"), (20, "8"), (30, "7"), (40, "6"), (50, "5"), (60, "4"), (70, "3"), (80, "2"), (90, "1")),
+}
+DEFAULT_BOARD = "CBSE"
+
+
+def board_for(organization):
+    """affiliation_board free text hai ("ICSE", "CISCE / ISC", "CBSE", "State Board")."""
+    text = (organization.affiliation_board or "").upper()
+    if "ICSE" in text or "ISC" in text or "CISCE" in text:
+        return "ICSE"
+    return DEFAULT_BOARD
+
+
+def _money(value):
+    return Decimal(f"{value:.2f}")
+
+
+# ── Vector helpers (numpy / pure Python) ─────────────────────────────
+
+def _grades(percentages, board):
+    bounds = [bound for bound, _ in GRADING_TABLES[board]]
+    labels = [label for _, label in GRADING_TABLES[board]]
+    if np is not None:
+        index = np.searchsorted(np.asarray(bounds, dtype=float), np.nan_to_num(percentages), side="right") - 1
+        return np.asarray(labels, dtype=object)[index]
+    return [labels[bisect_right(bounds, value) - 1] for value in percentages]
+
+
+def _rank_and_percentile(values):
+    """
+    values (NaN / None = absent) -> (ranks, percentiles); absent ko rank nahi.
+    rank = 1 + kitne strictly upar; percentile = kitne (%) is score ya neeche.
+    """
+    if np is not None:
+        values = np.asarray(values, dtype=float)
+        present = ~np.isnan(values)
+        ranks = np.zeros(len(values), dtype=np.int64)
+        percentiles = np.zeros(len(values), dtype=float)
+        if present.any():
+            ordered = np.sort(values[present])
+            at_or_below = np.searchsorted(ordered, values[present], side="right")
+            ranks[present] = len(ordered) - at_or_below + 1
+            percentiles[present] = at_or_below / len(ordered) * 100
+        return ranks, percentiles
+
+    ordered = sorted(v for v in values if v is not None)
+    ranks, percentiles = [], []
+    for value in values:
+        if value is None:
+            ranks.append(0)
+            percentiles.append(0.0)
+            continue
+        at_or_below = bisect_right(ordered, value)
+        ranks.append(len(ordered) - at_or_below + 1)
+        percentiles.append(at_or_below / len(ordered) * 100)
+    return ranks, percentiles
+
+
+# ── Load ──────────────────────────────────────────────────────────────
+
+def load_matrix(exam):
+    """(student_ids, subjects, marks, result_ids) — marks[i][j] None/NaN = result nahi."""
+    subjects = list(exam.subjects.values("id", "subject_name", "max_marks", "passing_marks").order_by("date", "start_time", "id"))
+    column = {subject["id"]: j for j, subject in enumerate(subjects)}
+
+    rows = StudentResult.objects.filter(
+        exam_subject__exam=exam, student__is_active=True
+    ).values_list("id", "student_id", "exam_subject_id", "marks_obtained").order_by("student_id", "id")
+
+    student_ids, position, cells = [], {}, []
+    for result_id, student_id, subject_id, marks in rows.iterator():
+        if student_id not in position:
+            position[student_id] = len(student_ids)
+            student_ids.append(student_id)
+        # Ek subject ke do rows hon toh baad wala (re-test) jeetega
+        cells.append((position[student_id], column[subject_id], float(marks), result_id))
+
+    shape = (len(student_ids), len(subjects))
+    if np is not None:
+        marks = np.full(shape, np.nan)
+        result_ids = np.zeros(shape, dtype=np.int64)
+        for i, j, value, result_id in cells:
+            marks[i, j] = value
+            result_ids[i, j] = result_id
+    else:
+        marks = [[None] * shape[1] for _ in range(shape[0])]
+        result_ids = [[0] * shape[1] for _ in range(shape[0])]
+        for i, j, value, result_id in cells:
+            marks[i][j] = value
+            result_ids[i][j] = result_id
+    return student_ids, subjects, marks, result_ids
+
+
+# ── Compute ───────────────────────────────────────────────────────────
+
+def _compute_numpy(subjects, marks, board):
+    max_marks = np.asarray([s["max_marks"] or 0 for s in subjects], dtype=float)
+    passing = np.asarray([s["passing_marks"] or 0 for s in subjects], dtype=float)
+    present = ~np.isnan(marks)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        subject_pct = np.where(present & (max_marks > 0), marks / max_marks * 100, np.nan)
+        totals = np.nansum(marks, axis=1)
+        total_max = (present * max_marks).sum(axis=1)
+        overall_pct = np.where(total_max > 0, totals / total_max * 100, 0.0)
+    subject_passed = ~present | (marks >= passing)
+
+    subject_grades = np.empty(marks.shape, dtype=object)
+    subject_ranks = np.zeros(marks.shape, dtype=np.int64)
+    for j in range(marks.shape[1]):
+        subject_grades[:, j] = _grades(subject_pct[:, j], board)
+        subject_ranks[:, j], _ = _rank_and_percentile(np.round(subject_pct[:, j], 6))
+    ranks, percentiles = _rank_and_percentile(np.round(overall_pct, 6))
+    return {
+        "totals": totals.tolist(), "total_max": total_max.tolist(), "percentage": overall_pct.tolist(),
+        "grade": _grades(overall_pct, board).tolist(), "passed": subject_passed.all(axis=1).tolist(),
+        "rank": ranks.tolist(), "percentile": percentiles.tolist(),
+        "subject_pct": subject_pct.tolist(), "subject_grade": subject_grades.tolist(),
+        "subject_rank": subject_ranks.tolist(), "subject_passed": subject_passed.tolist(),
+    }
+
+
+def _compute_python(subjects, marks, board):
+    n, m = len(marks), len(subjects)
+    subject_pct = [[
+        marks[i][j] / subjects[j]["max_marks"] * 100 if marks[i][j] is not None and subjects[j]["max_marks"] else None
+        for j in range(m)] for i in range(n)]
+    totals = [sum(v for v in row if v is not None) for row in marks]
+    total_max = [sum(subjects[j]["max_marks"] or 0 for j in range(m) if row[j] is not None) for row in marks]
+    overall_pct = [t / mx * 100 if mx else 0.0 for t, mx in zip(totals, total_max)]
+    subject_passed = [[row[j] is None or row[j] >= (subjects[j]["passing_marks"] or 0) for j in range(m)] for row in marks]
+
+    subject_grade = [[None] * m for _ in range(n)]
+    subject_rank = [[0] * m for _ in range(n)]
+    for j in range(m):
+        column = [subject_pct[i][j] for i in range(n)]
+        grades = _grades([v or 0.0 for v in column], board)
+        ranks, _ = _rank_and_percentile([round(v, 6) if v is not None else None for v in column])
+        for i in range(n):
+            subject_grade[i][j] = grades[i]
+            subject_rank[i][j] = ranks[i]
+    ranks, percentiles = _rank_and_percentile([round(v, 6) for v in overall_pct])
+    return {
+        "totals": totals, "total_max": total_max, "percentage": overall_pct,
+        "grade": _grades(overall_pct, board), "passed": [all(row) for row in subject_passed],
+        "rank": ranks, "percentile": percentiles,
+        "subject_pct": subject_pct, "subject_grade": subject_grade,
+        "subject_rank": subject_rank, "subject_passed": subject_passed,
+    }
+
+
+def compute_report_cards(exam: Exam) -> dict:
+    """Exam ke report cards dobara banao (purane replace). Returns {"students", "subjects", "board"}."""
+    board = board_for(exam.organization)
+    student_ids, subjects, marks, result_ids = load_matrix(exam)
+    if not student_ids:
+        with transaction.atomic():
+            ReportCard.objects.filter(exam=exam).delete()
+        return {"students": 0, "subjects": len(subjects), "board": board}
+
+    computed = (_compute_numpy if np is not None else _compute_python)(subjects, marks, board)
+    if np is not None:
+        marks, result_ids = marks.tolist(), result_ids.tolist()
+
+    cards, graded = [], []
+    for i, student_id in enumerate(student_ids):
+        breakdown = []
+        for j, subject in enumerate(subjects):
+            value = marks[i][j]
+            if value is None or value != value:  # None / NaN = absent
+                continue
+            breakdown.append({
+                "subject": subject["subject_name"],
+                "marks": value,
+                "max_marks": subject["max_marks"],
+                "percentage": round(computed["subject_pct"][i][j], 2),
+                "grade": computed["subject_grade"][i][j],
+                "rank": computed["subject_rank"][i][j],
+                "passed": computed["subject_passed"][i][j],
+            })
+            graded.append(StudentResult(id=result_ids[i][j], grade=computed["subject_grade"][i][j]))
+        cards.append(ReportCard(
+            exam=exam,
+            student_id=student_id,
+            board=board,
+            total_obtained=_money(computed["totals"][i]),
+            total_max=_money(computed["total_max"][i]),
+            percentage=_money(computed["percentage"][i]),
+            grade=computed["grade"][i],
+            passed=computed["passed"][i],
+            rank=computed["rank"][i],
+            percentile=_money(computed["percentile"][i]),
+            subjects=breakdown,
+        ))
+
+    with transaction.atomic():
+        ReportCard.objects.filter(exam=exam).delete()
+        ReportCard.objects.bulk_create(cards, batch_size=500)
+        StudentResult.objects.bulk_update(graded, ["grade"], batch_size=500)
+    return {"students": len(cards), "subjects": len(subjects), "board": board}
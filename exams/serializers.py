@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Exam, ExamSubject
+from .models import DocumentJob, Exam, ExamSubject, ReportCard
 from students_classroom.models import Standard
 from django.db import transaction
 
@@ -15,7 +15,7 @@ class ExamSubjectSerializer(serializers.ModelSerializer):
 
 # 2. Detail Serializer (GET requests ke liye mast hai)
 from rest_framework import serializers
-from .models import Exam, ExamSubject
+from .models import DocumentJob, Exam, ExamSubject, ReportCard
 from students_classroom.models import Standard
 from django.db import transaction
 
@@ -132,4 +132,44 @@ class ExamCreateSerializer(serializers.ModelSerializer):
 
         # 5. Final Refresh
         instance.refresh_from_db()
-        return instance
\ No newline at end of file
+        return instance
+
+# 4. Report Card (materialized rows — compute_report_cards() se bante hain)
+class ReportCardSerializer(serializers.ModelSerializer):
+    student_unique_id = serializers.CharField(source='student.student_unique_id', read_only=True)
+    student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
+
+    class Meta:
+        model = ReportCard
+        fields = ['id', 'student_unique_id', 'student_name', 'board', 'total_obtained', 'total_max', 'percentage',
+                  'grade', 'passed', 'rank', 'percentile', 'subjects', 'computed_at']
+
+
+# 5. Document Job (batch PDF — report cards / hall tickets)
+class DocumentJobSerializer(serializers.ModelSerializer):
+    kind = serializers.ChoiceField(choices=DocumentJob.KIND_CHOICES)
+    bundle = serializers.ChoiceField(choices=DocumentJob.BUNDLE_CHOICES, default='PDF')
+    progress = serializers.IntegerField(read_only=True)
+    output_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DocumentJob
+        fields = ['id', 'kind', 'bundle', 'status', 'total', 'processed', 'progress', 'output_url',
+                  'output_prefix', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = ['status', 'total', 'processed', 'output_prefix', 'error',
+                            'created_at', 'started_at', 'finished_at']
+
+    def to_internal_value(self, data):
+        # "report_card" / "zip" bhi chale
+        data = data.copy()
+        for key in ('kind', 'bundle'):
+            if isinstance(data.get(key), str):
+                data[key] = data[key].upper()
+        return super().to_internal_value(data)
+
+    def get_output_url(self, obj):
+        if not obj.output:
+            return None
+        request = self.context.get('request')
+        return request.build_absolute_uri(obj.output.url) if request else obj.output.url
+
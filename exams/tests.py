@@ -1,3 +1,376 @@
-from django.test import TestCase
+import io
+import random
+import re
+import shutil
+import tempfile
+import zipfile
+import zlib
+from datetime import date, time
+from decimal import Decimal
+from unittest import skipIf
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from organizations.models import Organization
+from students.models import StudentProfile, StudentResult
+from students_classroom.models import Standard
+
+from . import documents, leaderboard, pdf, report_cards
+from .models import DocumentJob, Exam, ExamSubject, LeaderboardNode, ReportCard
+
+User = get_user_model()
+
+
+# ────────────────────────────────────────────────
+# Report-card engine
+# ────────────────────────────────────────────────
+
+SUBJECTS = [
+    {"id": 1, "subject_name": "Maths", "max_marks": 100, "passing_marks": 33},
+    {"id": 2, "subject_name": "Hindi", "max_marks": 50, "passing_marks": 17},
+]
+# Do students barabar (rank 2, 2 -> agla 4), aakhri wala Hindi mein absent
+MARKS = [
+    [95, 45],
+    [80, 40],
+    [80, 40],
+    [20, None],
+]
+EXPECTED = {
+    "totals": [140, 120, 120, 20],
+    "total_max": [150, 150, 150, 100],
+    "rank": [1, 2, 2, 4],
+    "percentile": [100, 75, 75, 25],
+    "passed": [True, True, True, False],
+    "subject_rank": [[1, 1], [2, 2], [2, 2], [4, 0]],
+}
+EXPECTED_GRADES = {"CBSE": ["A1", "B1", "B1", "E"], "ICSE": ["1", "2", "2", "8"]}
+
+
+class ReportCardComputeTests(SimpleTestCase):
+    """numpy aur pure-Python path ek hi report card banayein."""
+
+    def check(self, computed, board):
+        for key, expected in EXPECTED.items():
+            self.assertEqual(list(computed[key]), expected, key)
+        self.assertEqual(list(computed["grade"]), EXPECTED_GRADES[board])
+        self.assertAlmostEqual(computed["percentage"][0], 140 / 150 * 100)
+
+    def test_python_path(self):
+        for board in report_cards.GRADING_TABLES:
+            with self.subTest(board=board):
+                self.check(report_cards._compute_python(SUBJECTS, MARKS, board), board)
+
+    @skipIf(report_cards.np is None, "numpy installed nahi")
+    def test_numpy_path(self):
+        np = report_cards.np
+        marks = np.array([[np.nan if value is None else value for value in row] for row in MARKS], dtype=float)
+        for board in report_cards.GRADING_TABLES:
+            with self.subTest(board=board):
+                self.check(report_cards._compute_numpy(SUBJECTS, marks, board), board)
+
+    def test_grade_boundaries(self):
+        grades = report_cards._grades([0, 32.99, 33, 90.99, 91, 100], "CBSE")
+        self.assertEqual(list(grades), ["E", "E", "D", "A2", "A1", "A1"])
+
+
+class ReportCardMaterializeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        school = Organization.objects.create(name="Agra Public School", admin=admin, affiliation_board="CISCE / ICSE")
+        standard = Standard.objects.create(organization=school, name="Class 10", section="A")
+        cls.exam = Exam.objects.create(
+            organization=school, target_standard=standard, exam_title="Half Yearly", academic_year="2026-27",
+            start_date=date(2026, 9, 1), end_date=date(2026, 9, 10),
+        )
+        subjects = [
+            ExamSubject.objects.create(
+                exam=cls.exam, subject_name=subject["subject_name"], date=date(2026, 9, 1 + j),
+                start_time=time(9), end_time=time(12),
+                max_marks=subject["max_marks"], passing_marks=subject["passing_marks"],
+            )
+            for j, subject in enumerate(SUBJECTS)
+        ]
+        cls.students = []
+        for i, row in enumerate(MARKS + [[99, 50]]):
+            student = StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}", email=f"student{i}@example.com", password="x", mobile=f"940000000{i}",
+                ),
+                organization=school, student_unique_id=f"S-{i}", current_standard=standard,
+            )
+            cls.students.append(student)
+            for subject, value in zip(subjects, row):
+                if value is not None:
+                    StudentResult.objects.create(
+                        student=student, exam_subject=subject, exam_name=cls.exam.exam_title,
+                        marks_obtained=value, total_marks=subject.max_marks, exam_date=subject.date,
+                    )
+        # Inactive student (topper hota) ranking mein nahi aana chahiye
+        StudentProfile.objects.filter(pk=cls.students[-1].pk).update(is_active=False)
+
+    def test_cards_are_materialized(self):
+        summary = report_cards.compute_report_cards(self.exam)
+        self.assertEqual(summary, {"students": 4, "subjects": 2, "board": "ICSE"})
+
+        cards = {card.student_id: card for card in ReportCard.objects.filter(exam=self.exam)}
+        self.assertNotIn(self.students[-1].pk, cards)
+        self.assertEqual([cards[s.pk].rank for s in self.students[:4]], EXPECTED["rank"])
+        self.assertEqual([cards[s.pk].grade for s in self.students[:4]], EXPECTED_GRADES["ICSE"])
+        self.assertEqual(cards[self.students[0].pk].percentage, Decimal("93.33"))
+        self.assertEqual(len(cards[self.students[3].pk].subjects), 1)  # Absent subject breakdown mein nahi
+
+        grades = StudentResult.objects.filter(student=self.students[0]).values_list("grade", flat=True)
+        self.assertEqual(set(grades), {"1"})
+
+    def test_recompute_replaces_cards(self):
+        report_cards.compute_report_cards(self.exam)
+        StudentResult.objects.filter(student=self.students[3]).update(marks_obtained=100)
+        report_cards.compute_report_cards(self.exam)
+        self.assertEqual(ReportCard.objects.filter(exam=self.exam).count(), 4)
+        self.assertEqual(ReportCard.objects.get(exam=self.exam, student=self.students[3]).rank, 1)
+
+
+# ────────────────────────────────────────────────
+# PDF writer + batch documents
+# ────────────────────────────────────────────────
+
+class PdfAssertionsMixin:
+    def pdf_pages(self, data):
+        """xref/trailer check karke har page ka decompressed content stream."""
+        self.assertTrue(data.startswith(b"%PDF-1.4"))
+        self.assertTrue(data.endswith(b"%%EOF\n"))
+        xref_at = int(re.search(rb"startxref\n(\d+)\n", data).group(1))
+        self.assertTrue(data[xref_at:].startswith(b"xref\n"))
+        size = int(re.search(rb"/Size (\d+)", data).group(1))
+        entries = data[xref_at:].split(b"\n")[3:2 + size]
+        for number, entry in enumerate(entries, start=1):
+            self.assertTrue(data[int(entry[:10]):].startswith(b"%d 0 obj\n" % number), number)
+        kids, count = re.search(rb"/Kids \[([^\]]*)\] /Count (\d+)", data).groups()
+        self.assertEqual(kids.count(b" 0 R"), int(count))
+        return [zlib.decompress(body) for body in re.findall(rb"/FlateDecode >>\nstream\n(.*?)\nendstream", data, re.S)]
+
+
+class PdfLayoutTests(PdfAssertionsMixin, SimpleTestCase):
+    def test_document_structure(self):
+        pages = [pdf._text_op(50, 700, "h1", "Pehla (page)"), b"", pdf._text_op(50, 700, "text", "C:\\marks")]
+        self.assertEqual(self.pdf_pages(pdf.write_pdf(pages)), pages)
+        self.assertIn(b"(Pehla \\(page\\)) Tj", pages[0])
+        self.assertIn(b"(C:\\\\marks) Tj", pages[2])
+
+    def test_long_markup_paginates(self):
+        pages = pdf.layout("\n".join(["# Report"] + [f"| {i} | Maths | 95" for i in range(150)]))
+        self.assertGreater(len(pages), 1)
+        rows = 0
+        for content in pages:
+            ys = [float(y) for y in re.findall(rb"Tf [\d.]+ ([\d.]+) Td", content)]
+            self.assertTrue(ys)
+            self.assertTrue(all(pdf.MARGIN <= y <= pdf.PAGE_HEIGHT - pdf.MARGIN for y in ys))
+            rows += content.count(b"(Maths)")
+        self.assertEqual(rows, 150)
+
+    def test_wrap_and_clip(self):
+        (page,) = pdf.layout("shabd " * 200 + "\n| " + "x" * 300 + " | b")
+        lines = re.findall(rb"\((shabd[^)]*)\) Tj", page)
+        self.assertGreater(len(lines), 1)
+        self.assertEqual(b" ".join(lines).split(), [b"shabd"] * 200)
+        self.assertIn("…".encode("cp1252") + b") Tj", page)
+
+    def test_empty_markup_is_one_blank_page(self):
+        self.assertEqual(pdf.layout(""), [b""])
+
+
+class DocumentJobTests(PdfAssertionsMixin, TestCase):
+    """Process pool ke through hall tickets — har student ki PDF + merged bundle."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        school = Organization.objects.create(name="Agra Public School", admin=admin)
+        standard = Standard.objects.create(organization=school, name="Class 10", section="A")
+        cls.exam = Exam.objects.create(
+            organization=school, target_standard=standard, exam_title="Half Yearly", academic_year="2026-27",
+            start_date=date(2026, 9, 1), end_date=date(2026, 9, 10),
+        )
+        ExamSubject.objects.create(
+            exam=cls.exam, subject_name="Maths", date=date(2026, 9, 1), start_time=time(9), end_time=time(12),
+        )
+        for i in range(3):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}", email=f"student{i}@example.com", password="x", mobile=f"940000000{i}",
+                    first_name=f"Student {i}",
+                ),
+                organization=school, student_unique_id=f"S-{i}", current_standard=standard,
+            )
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+    def run_job(self, bundle):
+        job = DocumentJob.objects.create(exam=self.exam, kind="HALL_TICKET", bundle=bundle)
+        documents.run_job(job.pk, workers=1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.total, job.processed, job.progress), ("DONE", 3, 3, 100))
+        return job
+
+    def test_merged_pdf(self):
+        job = self.run_job("PDF")
+        _, files = default_storage.listdir(job.output_prefix)
+        self.assertEqual(sorted(name for name in files if name.startswith("S-")), sorted(
+            f"S-{i}-{pk}.pdf" for i, pk in enumerate(StudentProfile.objects.order_by("pk").values_list("pk", flat=True))
+        ))
+        with job.output.open("rb") as handle:
+            merged = self.pdf_pages(handle.read())
+        self.assertEqual(len(merged), 3)
+        # Submit order = id order
+        for i, content in enumerate(merged):
+            self.assertIn(b"Candidate: Student %d" % i, content)
+
+    def test_zip_bundle(self):
+        job = self.run_job("ZIP")
+        with job.output.open("rb") as handle, zipfile.ZipFile(io.BytesIO(handle.read())) as archive:
+            self.assertEqual(len(archive.namelist()), 3)
+            for name in archive.namelist():
+                self.assertEqual(len(self.pdf_pages(archive.read(name))), 1)
+
+
+# ────────────────────────────────────────────────
+# Class leaderboard (Fenwick tree)
+# ────────────────────────────────────────────────
+
+class LeaderboardTests(TestCase):
+    """Signals se incremental tree == rebuild() == brute-force ranking."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        school = Organization.objects.create(name="Agra Public School", admin=admin)
+        standard = Standard.objects.create(organization=school, name="Class 10", section="A")
+        cls.exam = Exam.objects.create(
+            organization=school, target_standard=standard, exam_title="Half Yearly", academic_year="2026-27",
+            start_date=date(2026, 9, 1), end_date=date(2026, 9, 10),
+        )
+        cls.subjects = [
+            ExamSubject.objects.create(
+                exam=cls.exam, subject_name=name, date=date(2026, 9, 1), start_time=time(9), end_time=time(12),
+                max_marks=max_marks,
+            )
+            for name, max_marks in (("Maths", 100), ("Hindi", 50))
+        ]
+        cls.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}", email=f"student{i}@example.com", password="x", mobile=f"94000000{i:02d}",
+                ),
+                organization=school, student_unique_id=f"S-{i}", current_standard=standard,
+            )
+            for i in range(12)
+        ]
+
+    def result(self, student, subject, marks):
+        return StudentResult.objects.create(
+            student=student, exam_subject=subject, exam_name=self.exam.exam_title,
+            marks_obtained=marks, total_marks=subject.max_marks, exam_date=subject.date,
+        )
+
+    def nodes(self):
+        return dict(LeaderboardNode.objects.filter(exam=self.exam).exclude(count=0).values_list("position", "count"))
+
+    def brute_force(self):
+        totals = {}
+        for student_id, obtained, max_marks in StudentResult.objects.filter(
+            exam_subject__exam=self.exam
+        ).values_list("student_id", "marks_obtained", "exam_subject__max_marks"):
+            current = totals.setdefault(student_id, [0, 0])
+            current[0] += obtained
+            current[1] += max_marks
+        buckets = {pk: leaderboard.bucket_for(*total) for pk, total in totals.items()}
+        return {
+            pk: (1 + sum(other > bucket for other in buckets.values()),
+                 round(sum(other <= bucket for other in buckets.values()) * 100 / len(buckets), 2))
+            for pk, bucket in buckets.items()
+        }
+
+    def assert_consistent(self):
+        expected = self.brute_force()
+        for student in self.students:
+            info = leaderboard.rank_of(self.exam.pk, student.pk)
+            if student.pk not in expected:
+                self.assertIsNone(info)
+                continue
+            self.assertEqual((info["rank"], info["percentile"], info["out_of"]), (*expected[student.pk], len(expected)))
+
+        incremental = self.nodes()
+        leaderboard.rebuild(self.exam.pk)
+        self.assertEqual(incremental, self.nodes())
+
+    def test_incremental_updates_match_rebuild(self):
+        rng = random.Random(7)
+        results = [
+            self.result(student, subject, rng.choice([10, 25, 25, 40, 50]) * subject.max_marks // 50)
+            for student in self.students[:10] for subject in self.subjects
+        ]
+        self.assert_consistent()
+
+        for result in rng.sample(results, 6):
+            result.marks_obtained = rng.randint(0, result.exam_subject.max_marks)
+            result.save()
+        for result in rng.sample(results, 3):
+            result.delete()
+        self.result(self.students[10], self.subjects[0], 100)  # Naya topper
+        self.assert_consistent()
+
+    def test_top_ties_share_rank(self):
+        for student, marks in zip(self.students[:4], (90, 70, 70, 40)):
+            self.result(student, self.subjects[0], marks)
+        self.assertEqual([row["rank"] for row in leaderboard.top(self.exam.pk)], [1, 2, 2, 4])
+
+    def test_rolled_back_subject_change_does_not_block_rebuild(self):
+        self.result(self.students[0], self.subjects[0], 40)
+        self.result(self.students[1], self.subjects[0], 30)
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            subject = ExamSubject.objects.get(pk=self.subjects[0].pk)
+            subject.max_marks = 50
+            subject.save()
+            raise RuntimeError
+
+        subject = ExamSubject.objects.get(pk=self.subjects[0].pk)
+        subject.max_marks = 50
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            subject.save()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(leaderboard.rank_of(self.exam.pk, self.students[0].pk)["percentage"], Decimal("80.00"))
+
+    def test_entry_is_locked_before_totals_are_read(self):
+        self.result(self.students[0], self.subjects[0], 40)
+        with CaptureQueriesContext(connection) as queries:
+            leaderboard.refresh_student(self.exam.pk, self.students[0].pk)
+        tables = [
+            table for query in queries.captured_queries
+            for table in ("exams_leaderboardentry", "students_studentresult") if table in query["sql"]
+        ]
+        # Pehli entry wali query (lock) totals padhne se pehle
+        self.assertEqual(tables[0], "exams_leaderboardentry")
+        self.assertIn("students_studentresult", tables)
+
+    def test_refresh_without_results_leaves_no_entry(self):
+        leaderboard.refresh_student(self.exam.pk, self.students[0].pk)
+        self.assertIsNone(leaderboard.rank_of(self.exam.pk, self.students[0].pk))
+        self.assertEqual(self.nodes(), {})
@@ -1,7 +1,8 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Exam
-from .serializers import ExamCreateSerializer, ExamDetailSerializer
+from .serializers import DocumentJobSerializer, ExamCreateSerializer, ExamDetailSerializer, ReportCardSerializer
 from .permissions import IsAdminOrTeacher
 from django.db import transaction  
 
@@ -148,4 +149,113 @@ class ExamViewSet(viewsets.ModelViewSet):
     
     def perform_update(self, serializer):
         instance = serializer.save()
-        instance.refresh_from_db() # Taaki serializer ko updated data mile
\ No newline at end of file
+        instance.refresh_from_db() # Taaki serializer ko updated data mile
+
+    # ── Report cards ──────────────────────────────────────────────────
+    @action(detail=True, methods=['post'], url_path='compute-report-cards')
+    def compute_report_cards(self, request, pk=None):
+        """Exam ke saare results se report cards dobara banao (purane replace ho jaate hain)."""
+        from .report_cards import compute_report_cards
+
+        exam = self.get_object()
+        summary = compute_report_cards(exam)
+        return Response({
+            "status": "success",
+            "message": f"{summary['students']} students ke report cards ban gaye ({summary['board']} grading).",
+            "data": summary,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path='report-cards')
+    def report_cards(self, request, pk=None):
+        """Materialized report cards (rank order). Student ko sirf apna card dikhega."""
+        exam = self.get_object()
+        cards = exam.report_cards.select_related('student__user')
+        if request.user.role == 'STUDENT':
+            cards = cards.filter(student__user=request.user)
+
+        page = self.paginate_queryset(cards)
+        serializer = ReportCardSerializer(page if page is not None else cards, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    # ── Batch documents (report cards / hall tickets PDF) ─────────────
+    @action(detail=True, methods=['get', 'post'], url_path='documents')
+    def documents(self, request, pk=None):
+        """
+        POST {"kind": "report_card" | "hall_ticket", "bundle": "pdf" | "zip"} -> job (202)
+        GET -> is exam ke jobs (latest pehle)
+        """
+        from .documents import start_job
+
+        if request.user.role == 'STUDENT':
+            return Response({"status": "error", "message": "Bhai, documents sirf school staff bana sakta hai."},
+                            status=status.HTTP_403_FORBIDDEN)
+        exam = self.get_object()
+
+        if request.method == 'GET':
+            serializer = DocumentJobSerializer(exam.document_jobs.all()[:20], many=True, context={'request': request})
+            return Response(serializer.data)
+
+        serializer = DocumentJobSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data['kind'] == 'REPORT_CARD' and not exam.report_cards.exists():
+            return Response({"status": "error", "message": "Bhai, pehle compute-report-cards chalao."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            job = serializer.save(exam=exam, created_by=request.user)
+            start_job(job.pk)
+        return Response({
+            "status": "success",
+            "message": "Documents ban rahe hain — status isi job pe check karo.",
+            "data": DocumentJobSerializer(job, context={'request': request}).data,
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'], url_path=r'documents/(?P<job_id>[0-9]+)')
+    def document_job(self, request, pk=None, job_id=None):
+        """Job status + progress; DONE hone pe output_url (merged PDF / ZIP)."""
+        if request.user.role == 'STUDENT':
+            return Response({"status": "error", "message": "Bhai, documents sirf school staff dekh sakta hai."},
+                            status=status.HTTP_403_FORBIDDEN)
+        exam = self.get_object()
+        job = exam.document_jobs.filter(pk=job_id).first()
+        if job is None:
+            return Response({"status": "error", "message": "Job nahi mila."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(DocumentJobSerializer(job, context={'request': request}).data)
+
+    # ── Class leaderboard (incremental rank index) ────────────────────
+    @action(detail=True, methods=['get'], url_path='leaderboard')
+    def leaderboard(self, request, pk=None):
+        """Top-N students (?limit=10, max 100)."""
+        from .leaderboard import DEFAULT_TOP, top
+
+        exam = self.get_object()
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_TOP))
+        except ValueError:
+            limit = DEFAULT_TOP
+        return Response(top(exam.pk, limit))
+
+    @action(detail=True, methods=['get'], url_path='rank')
+    def rank(self, request, pk=None):
+        """Student ka rank + percentile. Student ko apna; staff ?student=<profile id> bheje."""
+        from students.models import StudentProfile
+        from .leaderboard import rank_of
+
+        exam = self.get_object()
+        if request.user.role == 'STUDENT':
+            student_id = StudentProfile.objects.filter(user=request.user).values_list('id', flat=True).first()
+        else:
+            student_id = request.query_params.get('student')
+            if not str(student_id or '').isdigit():
+                return Response({"status": "error", "message": "Bhai, '?student=<id>' bhejo."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            student_id = int(student_id)
+
+        data = rank_of(exam.pk, student_id) if student_id else None
+        if data is None:
+            return Response({"status": "error", "message": "Is exam mein student ka result nahi mila."},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
+
@@ -1,7 +1,26 @@
 from django.contrib import admin
-from .models import NormalUser, Notification
+from .admin_mixins import ChangelistPerformanceMixin
+from .models import MediaBlob, NormalUser, Notification
 
 # Register your models here.
 
 admin.site.register(NormalUser)
-admin.site.register(Notification)
\ No newline at end of file
+
+
+@admin.register(Notification)
+class NotificationAdmin(ChangelistPerformanceMixin, admin.ModelAdmin):
+    list_display = ('recipient', 'title', 'notification_type', 'is_read', 'created_at')
+    # (filter, -created_at) composite indexes model mein hain
+    list_filter = ('notification_type', 'is_read')
+    search_fields = ('title', 'recipient__username')
+    raw_id_fields = ('recipient',)
+    list_per_page = 50
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(ChangelistPerformanceMixin, admin.ModelAdmin):
+    list_display = ('name', 'size', 'ref_count', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('digest', 'name')
+    readonly_fields = ('digest', 'name', 'size', 'ref_count', 'created_at', 'updated_at')
+    list_per_page = 50
@@ -0,0 +1,318 @@
+"""
+Shared ModelAdmin mixins.
+
+StreamingCSVExportMixin
+    Admin action jo queryset ko CSV mein stream karta hai — poori file memory mein
+    nahi banti. Columns ORM-style paths se declare hote hain
+    (e.g. "teacher__user__username"), unhi se select_related nikal liya jata hai
+    taaki har row pe extra query na lage. Beech mein koi FK null ho toh cell khali;
+    galat path (typo) pe export shuru hone se pehle hi error.
+
+ChangelistPerformanceMixin + EstimatedCountPaginator
+    Bade tables (Attendance, Notification, JoinRequest) ke changelist ke liye:
+    list_display se select_related, changelist-only annotations, aur exact
+    COUNT(*) ki jagah estimate / capped count.
+"""
+import csv
+import io
+import itertools
+import zlib
+from datetime import datetime
+
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ObjectDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+def related_prefixes(model, paths):
+    """
+    Har path ka sabse lamba FK/OneToOne prefix. "teacher__user__username"
+    -> "teacher__user"; "user__get_full_name" -> "user"; "status" -> kuch nahi.
+    """
+    related = set()
+    for path in paths:
+        current, chain = model, []
+        for part in path.lstrip("-").split("__"):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not (field.is_relation and (field.many_to_one or field.one_to_one)) or field.related_model is None:
+                break
+            chain.append(part)
+            current = field.related_model
+        if chain:
+            related.add("__".join(chain))
+    # Chhote prefixes bade wale mein already cover hain
+    return sorted(
+        r for r in related
+        if not any(other != r and other.startswith(r + "__") for other in related)
+    )
+
+
+def check_path(model, path):
+    """
+    Path ka har hissa model pe hona chahiye — field, relation, method ya
+    property. Relation ke baad related model pe aage check; non-relation ke
+    baad (e.g. "user__get_full_name") kuch nahi bachna chahiye.
+    """
+    current = model
+    parts = path.split("__")
+    for index, part in enumerate(parts):
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            field = None
+        if field is not None and field.is_relation and field.related_model is not None:
+            current = field.related_model
+            continue
+        if field is None and not hasattr(current, part):
+            raise ImproperlyConfigured(
+                f"CSV export path '{path}': {current.__name__} pe '{part}' naam ka field/attribute nahi hai."
+            )
+        if index != len(parts) - 1:
+            raise ImproperlyConfigured(
+                f"CSV export path '{path}': '{part}' relation nahi hai, uske aage '__' nahi chalega."
+            )
+
+
+class StreamingCSVExportMixin:
+    """
+    Usage::
+
+        class FooAdmin(StreamingCSVExportMixin, admin.ModelAdmin):
+            csv_export_fields = (
+                ("Code", "session_code"),
+                ("Teacher", "teacher__user__username"),
+                ("Teacher Name", "teacher__user__get_full_name"),  # callables bhi chalte hain
+            )
+            actions = ("export_as_csv", "export_as_csv_gzip")
+    """
+
+    csv_export_fields = ()
+    csv_export_filename = None       # default: model_name_plural
+    csv_export_chunk_size = 2000     # DB cursor chunk (.iterator)
+    csv_export_flush_rows = 500      # itni rows ke baad ek chunk yield hota hai
+    csv_export_bom = True            # Excel mein Hindi/Unicode naam sahi dikhe
+
+    # ── Column helpers ────────────────────────────────────────────────
+    def get_csv_export_fields(self, request):
+        if self.csv_export_fields:
+            return list(self.csv_export_fields)
+        # Fallback: model ke concrete fields
+        return [
+            (str(field.verbose_name).title(), field.attname)
+            for field in self.model._meta.concrete_fields
+        ]
+
+    def get_csv_export_select_related(self, paths):
+        return related_prefixes(self.model, paths)
+
+    @staticmethod
+    def resolve_csv_value(obj, path):
+        value = obj
+        for part in path.split("__"):
+            if value is None:
+                return ""
+            try:
+                value = getattr(value, part)
+            except ObjectDoesNotExist:
+                return ""  # Reverse one-to-one jo bana hi nahi
+            if callable(value):
+                value = value()
+        if value is None:
+            return ""
+        if isinstance(value, datetime):
+            if timezone.is_aware(value):
+                value = timezone.localtime(value)
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value
+
+    # ── Streaming ─────────────────────────────────────────────────────
+    def iter_csv_rows(self, request, queryset):
+        """Text chunks (str) yield karta hai — har chunk mein ~csv_export_flush_rows rows."""
+        fields = self.get_csv_export_fields(request)
+        headers = [header for header, _ in fields]
+        paths = [path for _, path in fields]
+        for path in paths:
+            check_path(self.model, path)
+
+        select_related = self.get_csv_export_select_related(paths)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self.csv_export_bom:
+            buffer.write("\ufeff")
+        writer.writerow(headers)
+        yield buffer.getvalue()  # Header turant — stream_csv_response isi pe paths validate karta hai
+        buffer.seek(0)
+        buffer.truncate(0)
+
+        pending = 0
+        for obj in queryset.iterator(chunk_size=self.csv_export_chunk_size):
+            writer.writerow([self.resolve_csv_value(obj, path) for path in paths])
+            pending += 1
+            if pending >= self.csv_export_flush_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+                pending = 0
+
+        tail = buffer.getvalue()
+        if tail:
+            yield tail
+
+    @staticmethod
+    def gzip_stream(chunks):
+        """On-the-fly gzip; har chunk compress hote hi aage bhej diya jata hai."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def get_csv_export_filename(self):
+        return self.csv_export_filename or str(self.model._meta.verbose_name_plural).replace(" ", "_").lower()
+
+    def stream_csv_response(self, request, queryset, compress=False):
+        rows = self.iter_csv_rows(request, queryset)
+        header = next(rows)  # Paths yahin check ho jaate hain — response shuru hone se pehle
+        rows = itertools.chain([header], rows)
+        filename = self.get_csv_export_filename()
+        if compress:
+            response = StreamingHttpResponse(self.gzip_stream(rows), content_type="application/gzip")
+            filename += ".csv.gz"
+        else:
+            response = StreamingHttpResponse(
+                (chunk.encode("utf-8") for chunk in rows),
+                content_type="text/csv; charset=utf-8",
+            )
+            filename += ".csv"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    # ── Admin actions ─────────────────────────────────────────────────
+    @admin.action(description="Export to CSV")
+    def export_as_csv(self, request, queryset):
+        return self.stream_csv_response(request, queryset)
+
+    @admin.action(description="Export to CSV (gzip)")
+    def export_as_csv_gzip(self, request, queryset):
+        return self.stream_csv_response(request, queryset, compress=True)
+
+
+# ────────────────────────────────────────────────
+# Changelist performance
+# ────────────────────────────────────────────────
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator jo crore-row tables pe exact COUNT(*) nahi chalata.
+
+    - Bina filter ke: DB ke catalog stats se estimate (Postgres reltuples,
+      MySQL TABLE_ROWS), warna integer pk range (MAX - MIN, index se O(log n)).
+    - Filter/search ke saath: `LIMIT count_cap` wala bounded count — index se
+      chalega aur cap se upar gina hi nahi jayega.
+    - Chhote tables (estimate < exact_below) pe normal exact count.
+    """
+
+    exact_below = 10_000
+    count_cap = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+
+        if not queryset.query.where:
+            estimate = self._estimate_table_rows(queryset)
+            if estimate is not None and estimate >= self.exact_below:
+                return estimate
+            return queryset.count()
+
+        # Filtered: pehle cap+1 rows tak hi gino
+        return queryset.order_by()[: self.count_cap + 1].count()
+
+    def _estimate_table_rows(self, queryset):
+        model = queryset.model
+        connection = connections[queryset.db]
+        table = model._meta.db_table
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == "postgresql":
+                    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+                    row = cursor.fetchone()
+                    if row and row[0] and row[0] > 0:
+                        return int(row[0])
+                elif connection.vendor == "mysql":
+                    cursor.execute(
+                        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                        [table],
+                    )
+                    row = cursor.fetchone()
+                    if row and row[0]:
+                        return int(row[0])
+        except Exception:
+            pass
+
+        # Fallback: auto-increment pk ka range (deletes ke baad thoda zyada dikhata hai).
+        # MIN aur MAX alag queries mein — ek saath hon toh SQLite poora index scan karta hai.
+        if model._meta.pk.get_internal_type() in ("AutoField", "BigAutoField", "SmallAutoField"):
+            pks = model._default_manager.using(queryset.db).order_by().values_list("pk", flat=True)
+            hi = pks.order_by("-pk").first()
+            if hi is None:
+                return 0
+            return hi - pks.order_by("pk").first() + 1
+        return None
+
+
+class ChangelistPerformanceMixin:
+    """
+    - list_select_related: list_display ke FK fields + callables ke
+      `@admin.display(ordering="a__b__field")` paths + `changelist_select_related`.
+    - changelist_annotations: {"name": expression} — sirf changelist pe lagte hain.
+    - Exact total count band (show_full_result_count) aur EstimatedCountPaginator.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    changelist_select_related = ()
+    changelist_annotations = {}
+
+    def _is_changelist(self, request):
+        match = getattr(request, "resolver_match", None)
+        return bool(match and match.url_name and match.url_name.endswith("_changelist"))
+
+    def get_list_select_related(self, request):
+        declared = super().get_list_select_related(request)
+        if declared is True:
+            return True
+
+        paths = list(declared or ()) + list(self.changelist_select_related)
+        for item in self.get_list_display(request):
+            if callable(item):
+                ordering = getattr(item, "admin_order_field", None)
+            else:
+                attr = getattr(self, item, None)
+                ordering = getattr(attr, "admin_order_field", None) if attr is not None else None
+                if ordering is None:
+                    ordering = item
+            if isinstance(ordering, str):
+                paths.append(ordering)
+
+        return related_prefixes(self.model, paths) or False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.changelist_annotations and self._is_changelist(request):
+            queryset = queryset.annotate(**self.changelist_annotations)
+        return queryset
@@ -3,3 +3,18 @@ from django.apps import AppConfig
 
 class NormalUserConfig(AppConfig):
     name = 'normal_user'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_init, post_save
+        from .images import IMAGE_FIELDS, image_saved
+        from .storage import blob_refs_deleted, blob_refs_saved, remember_blob_names
+
+        # Logo / profile picture upload -> background mein WebP/JPEG variants
+        for model in IMAGE_FIELDS:
+            post_save.connect(image_saved, sender=model, dispatch_uid=f'normal_user.images.{model}')
+
+        # Content-addressed uploads ka ref_count (blobs/ wale file fields)
+        for model in IMAGE_FIELDS:
+            post_init.connect(remember_blob_names, sender=model, dispatch_uid=f'normal_user.blobs.init.{model}')
+            post_save.connect(blob_refs_saved, sender=model, dispatch_uid=f'normal_user.blobs.save.{model}')
+            post_delete.connect(blob_refs_deleted, sender=model, dispatch_uid=f'normal_user.blobs.delete.{model}')
@@ -0,0 +1,14 @@
+"""
+Shared cache — settings.CACHES["shared"].
+
+`django.core.cache.cache` (default) process-local ho sakta hai (LocMem). Jo
+cheez sab processes ko same dikhni chahiye — index change-logs, invalidation
+versions — wo yahan se jaati hai. `cache` jaisa hi proxy: har thread ko apna
+connection.
+"""
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+SHARED_CACHE_ALIAS = "shared"
+
+shared_cache = ConnectionProxy(caches, SHARED_CACHE_ALIAS)
@@ -0,0 +1,212 @@
+"""
+Image derivatives (logo / profile picture ke chhote variants).
+
+Dashboard aur login response original upload ka URL dete the — phone pe har
+load pe multi-MB logo. Yahan har image ke fixed-width variants (WebP + JPEG)
+bante hain aur serializers `srcset` jaisa field dete hain.
+
+- Path content-hashed: derivatives/<sha[:2]>/<sha>/<width>w.<ext>. Same image
+  do jagah upload ho toh variants share; image badli toh naya path (cache-bust free).
+- Upload pe (post_save, on_commit) background thread pool generate karta hai —
+  request thread kabhi resize nahi karta.
+- Purani (legacy) images: serializer ko manifest nahi mila toh generation queue
+  hoti hai aur us response mein sirf original milta hai; agli request se variants.
+- Manifest (original name -> variants) storage mein JSON + cache mein, taaki
+  serializer har baar file hash na kare.
+"""
+import hashlib
+import io
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (80, 160, 320, 640)
+VARIANT_FORMATS = {"webp": ("WEBP", 80), "jpeg": ("JPEG", 82)}
+DERIVATIVE_ROOT = "derivatives"
+MANIFEST_CACHE_PREFIX = "images:manifest:"
+MANIFEST_CACHE_TTL = 24 * 60 * 60
+_PENDING = "__pending__"
+
+# Har model ka image field — signals inhi pe lagte hain
+IMAGE_FIELDS = {
+    "organizations.Organization": "logo",
+    "students.StudentProfile": "profile_picture",
+    "teachers.Teacher": "profile_picture",
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_DERIVATIVE_WORKERS", 2),
+                thread_name_prefix="image-derivatives",
+            )
+        return _executor
+
+
+def _manifest_key(name):
+    return MANIFEST_CACHE_PREFIX + hashlib.sha1(name.encode()).hexdigest()
+
+
+def _manifest_path(name):
+    return f"{DERIVATIVE_ROOT}/manifests/{hashlib.sha1(name.encode()).hexdigest()}.json"
+
+
+# ── Generation (worker threads) ───────────────────────────────────────
+
+def _render(image, width, fmt, quality):
+    from PIL import Image
+
+    variant = image.copy()
+    if variant.width > width:
+        height = max(1, round(variant.height * width / variant.width))
+        variant = variant.resize((width, height), Image.LANCZOS)
+    if fmt == "JPEG" and variant.mode != "RGB":
+        # JPEG mein transparency nahi — logo ko white background pe rakho
+        background = Image.new("RGB", variant.size, (255, 255, 255))
+        rgba = variant.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        variant = background
+    buffer = io.BytesIO()
+    variant.save(buffer, fmt, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def generate_derivatives(name, storage=None):
+    """
+    Ek original ke saare variants banata hai (jo pehle se hain woh skip) aur
+    manifest save karta hai. Manifest return hota hai; image kharab ho toh None.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    storage = storage or default_storage
+    with storage.open(name, "rb") as handle:
+        data = handle.read()
+    digest = hashlib.sha256(data).hexdigest()
+    folder = f"{DERIVATIVE_ROOT}/{digest[:2]}/{digest}"
+
+    try:
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        image.load()
+    except (UnidentifiedImageError, OSError):
+        logger.warning("Bhai, '%s' image nahi lagti — variants skip.", name)
+        return None
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    # Original se bade variants mat banao — sabse chhota width hamesha rahe
+    widths = [w for w in VARIANT_WIDTHS if w < image.width] or [min(VARIANT_WIDTHS)]
+    manifest = {"hash": digest, "variants": {ext: [] for ext in VARIANT_FORMATS}}
+    for width in widths:
+        for ext, (fmt, quality) in VARIANT_FORMATS.items():
+            path = f"{folder}/{width}w.{ext}"
+            if not storage.exists(path):
+                path = storage.save(path, ContentFile(_render(image, width, fmt, quality)))
+            manifest["variants"][ext].append([min(width, image.width), path])
+
+    manifest_path = _manifest_path(name)
+    if storage.exists(manifest_path):
+        storage.delete(manifest_path)
+    storage.save(manifest_path, ContentFile(json.dumps(manifest).encode()))
+    cache.set(_manifest_key(name), manifest, MANIFEST_CACHE_TTL)
+    return manifest
+
+
+def _run_job(name):
+    try:
+        generate_derivatives(name)
+    except Exception:
+        logger.exception("Image derivatives fail hue: %s", name)
+        cache.delete(_manifest_key(name))
+    finally:
+        with _inflight_lock:
+            _inflight.discard(name)
+
+
+def schedule_derivatives(name):
+    """Background pool mein job daalo (ek name ka ek hi job ek time pe)."""
+    if not name:
+        return
+    with _inflight_lock:
+        if name in _inflight:
+            return
+        _inflight.add(name)
+    # Pending marker — baaki requests storage pe manifest dhoondhne na jaayein
+    cache.add(_manifest_key(name), _PENDING, 60)
+    _get_executor().submit(_run_job, name)
+
+
+def get_manifest(name):
+    """Cache -> storage manifest. Dono mein nahi toh generation queue, None return."""
+    manifest = cache.get(_manifest_key(name))
+    if manifest == _PENDING:
+        return None
+    if manifest is not None:
+        return manifest
+
+    manifest_path = _manifest_path(name)
+    try:
+        if default_storage.exists(manifest_path):
+            with default_storage.open(manifest_path, "rb") as handle:
+                manifest = json.loads(handle.read())
+            cache.set(_manifest_key(name), manifest, MANIFEST_CACHE_TTL)
+            return manifest
+    except (OSError, ValueError):
+        pass
+    schedule_derivatives(name)
+    return None
+
+
+# ── Upload hook ───────────────────────────────────────────────────────
+
+def image_saved(sender, instance, **kwargs):
+    """post_save: naya/badla image ho toh commit ke baad variants banwao."""
+    field_name = IMAGE_FIELDS.get(sender._meta.label)
+    name = getattr(instance, field_name).name if field_name else None
+    if name and cache.get(_manifest_key(name)) is None:
+        # get_manifest: storage mein manifest hai toh bas cache, warna job queue
+        transaction.on_commit(lambda: get_manifest(name))
+
+
+# ── Serializer field ──────────────────────────────────────────────────
+
+def image_variants(field_file, build_url=None):
+    """
+    {"original", "webp", "jpeg", "ready"} — webp/jpeg `srcset` strings
+    ("url 80w, url 160w"). Variants abhi tayyar nahi toh sirf original.
+    """
+    if not field_file:
+        return None
+    build_url = build_url or (lambda url: url)
+    data = {"original": build_url(field_file.url), "webp": None, "jpeg": None, "ready": False}
+    manifest = get_manifest(field_file.name)
+    if manifest:
+        for ext, variants in manifest["variants"].items():
+            data[ext] = ", ".join(f"{build_url(default_storage.url(path))} {width}w" for width, path in variants)
+        data["ready"] = True
+    return data
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """`logo_variants = ImageVariantsField(source='logo')` — srcset-style output."""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        return image_variants(value, request.build_absolute_uri if request else None)
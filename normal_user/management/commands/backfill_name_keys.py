@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from normal_user.phonetic import name_keys
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Sab users ke first_name_key / last_name_key (phonetic search) dobara calculate karta hai'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Soft-deleted users bhi — restore hone pe search mein wapas aane chahiye
+        users = User.all_objects.only('id', 'first_name', 'last_name', 'first_name_key', 'last_name_key')
+
+        last_id, scanned, updated = 0, 0, 0
+        while True:
+            # pk range pe chunks — OFFSET nahi, badi table pe bhi har batch same speed
+            batch = list(users.filter(id__gt=last_id).order_by('id')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+
+            changed = []
+            for user in batch:
+                keys = name_keys(user.first_name, user.last_name)
+                if keys != (user.first_name_key, user.last_name_key):
+                    user.first_name_key, user.last_name_key = keys
+                    changed.append(user)
+            if changed:
+                with transaction.atomic():
+                    User.all_objects.bulk_update(changed, ['first_name_key', 'last_name_key'])
+                updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f'Done! {scanned} users check kiye, {updated} ki keys update hui.'))
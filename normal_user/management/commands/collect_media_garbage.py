@@ -0,0 +1,77 @@
+import os
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from normal_user.models import MediaBlob
+from normal_user.storage import BLOB_PREFIX, blob_fields, blob_storage
+
+
+class Command(BaseCommand):
+    help = 'Content-addressed media (blobs/) ke orphan files delete karta hai (ref_count 0 + grace period)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recount', action='store_true',
+                            help='Pehle saari tables scan karke ref_count dobara banao')
+        parser.add_argument('--grace-hours', type=int, default=24,
+                            help='Isse naye blobs nahi chhedte — upload ho gaya par model save abhi baaki ho sakta hai')
+        parser.add_argument('--dry-run', action='store_true', help='Sirf batao, kuch delete mat karo')
+
+    def handle(self, *args, **options):
+        storage = blob_storage()
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        dry_run = options['dry_run']
+
+        if options['recount']:
+            self._recount(dry_run)
+
+        # 1. ref_count 0 wale blobs (rows + files)
+        orphans = MediaBlob.objects.filter(ref_count__lte=0, created_at__lt=cutoff)
+        freed, removed = 0, 0
+        for blob in orphans.iterator():
+            freed += blob.size
+            removed += 1
+            if not dry_run:
+                storage.delete(blob.name)
+                blob.delete()
+
+        # 2. Disk pe files jinki row hi nahi (upload ke beech crash) + bache hue temp files
+        known = set(MediaBlob.objects.values_list('name', flat=True))
+        root = storage.path(BLOB_PREFIX)
+        stray = 0
+        for folder, _dirs, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(folder, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+                if name in known or os.path.getmtime(path) > cutoff.timestamp():
+                    continue
+                stray += 1
+                freed += os.path.getsize(path)
+                if not dry_run:
+                    os.unlink(path)
+
+        prefix = 'DRY RUN — ' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{removed} orphan blobs + {stray} stray files, {freed / 1024 / 1024:.1f} MB free.'
+        ))
+
+    def _recount(self, dry_run):
+        started = time.monotonic()
+        counts = Counter()
+        for model in apps.get_models():
+            for field in blob_fields(model):
+                names = model._base_manager.exclude(**{f'{field.name}__isnull': True}).values_list(field.name, flat=True)
+                counts.update(name for name in names.iterator() if name and name.startswith(BLOB_PREFIX))
+
+        fixed = []
+        for blob in MediaBlob.objects.only('id', 'name', 'ref_count').iterator():
+            if blob.ref_count != counts.get(blob.name, 0):
+                blob.ref_count = counts.get(blob.name, 0)
+                fixed.append(blob)
+        if fixed and not dry_run:
+            MediaBlob.objects.bulk_update(fixed, ['ref_count'], batch_size=1000)
+        self.stdout.write(f'{len(fixed)} blobs ka ref_count theek kiya ({time.monotonic() - started:.1f}s).')
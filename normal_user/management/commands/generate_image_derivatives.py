@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.apps import apps
+
+from normal_user.images import IMAGE_FIELDS, generate_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Purani logo / profile pictures ke WebP/JPEG variants ek saath bana deta hai (backfill)'
+
+    def handle(self, *args, **options):
+        generated, failed = 0, 0
+        for label, field_name in IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            names = (
+                model.objects.exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                .values_list(field_name, flat=True).distinct().iterator()
+            )
+            for name in names:
+                try:
+                    manifest = generate_derivatives(name)
+                except OSError as exc:
+                    self.stdout.write(self.style.WARNING(f"  {name}: {exc}"))
+                    failed += 1
+                    continue
+                if manifest is None:
+                    failed += 1
+                else:
+                    generated += 1
+            self.stdout.write(f"{label}.{field_name} done.")
+
+        self.stdout.write(self.style.SUCCESS(f'Done! {generated} images ke variants bane, {failed} skip hui.'))
@@ -6,6 +6,7 @@ from faker import Faker
 
 # Models Import
 from students.models import StudentProfile
+from students.sequences import next_student_id
 from organizations.models import Organization
 from students_classroom.models import Standard 
 
@@ -69,7 +70,7 @@ class Command(BaseCommand):
                     StudentProfile.objects.create(
                         user=user,
                         organization=selected_org,
-                        student_unique_id=f"STU-{random.randint(10000, 99999)}",
+                        student_unique_id=next_student_id(selected_org),
                         current_standard=selected_class,
                         is_active=True,
                         bio=f"Student of {selected_class.name} at {selected_org.name}"
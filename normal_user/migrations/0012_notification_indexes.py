@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('normal_user', '0011_remove_normaluser_normal_user_email_dcb66b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['-created_at', '-id'], name='normal_user_created_972514_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at', '-id'], name='normal_user_recipie_e2b432_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', '-created_at', '-id'], name='normal_user_is_read_8af70d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['notification_type', '-created_at', '-id'], name='normal_user_notific_b0d6d0_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('normal_user', '0012_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='normaluser',
+            name='first_name_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='normaluser',
+            name='last_name_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.utils import timezone
 import time
 from django.conf import settings
 
+from .phonetic import name_keys
+
 
 class SoftDeleteQuerySet(models.QuerySet):
     def delete(self):
@@ -69,6 +71,11 @@ class NormalUser(AbstractUser):
         editable=False
     )
 
+    # Phonetic keys (normal_user/phonetic.py) — "Sivam" search pe "Shivam" bhi mile.
+    # save() pe apne aap bante hain; purane rows ke liye `backfill_name_keys`.
+    first_name_key = models.CharField(max_length=12, blank=True, default='', db_index=True, editable=False)
+    last_name_key = models.CharField(max_length=12, blank=True, default='', db_index=True, editable=False)
+
     @property
     def is_school_admin(self):
         return self.role == self.Roles.SCHOOL_ADMIN
@@ -113,6 +120,13 @@ class NormalUser(AbstractUser):
     def __str__(self):
         return self.get_full_name() or self.username or self.email or f"User {self.id}"
 
+    def save(self, *args, **kwargs):
+        self.first_name_key, self.last_name_key = name_keys(self.first_name, self.last_name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'first_name', 'last_name'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'first_name_key', 'last_name_key'}
+        super().save(*args, **kwargs)
+
     def soft_delete(self, deleted_by=None):
         """Safe soft delete – all unique fields ko modify kar deta hai"""
         self.is_active = False
@@ -182,6 +196,33 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at'] # Naye notification sabse upar dikhenge
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['recipient', '-created_at', '-id']),
+            models.Index(fields=['is_read', '-created_at', '-id']),
+            models.Index(fields=['notification_type', '-created_at', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient.username} - {self.title}"
+
+class MediaBlob(models.Model):
+    """
+    Content-addressed upload (normal_user.storage.ContentAddressedStorage).
+    Ek content ki ek hi file; ref_count = kitne model fields isko point karte hain.
+    ref_count 0 wale blobs `collect_media_garbage` delete karta hai.
+    """
+    digest = models.CharField(max_length=64, db_index=True)  # sha256 hex
+    name = models.CharField(max_length=255, unique=True)      # storage path, e.g. blobs/ab/cd/<digest>.png
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ref_count', 'created_at']),
+        ]
 
     def __str__(self):
-        return f"{self.recipient.username} - {self.title}"
\ No newline at end of file
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,232 @@
+"""
+Keyset (seek) pagination.
+
+PageNumberPagination har page pe COUNT(*) + OFFSET chalata hai — purani history
+jitni badi, utna slow. Yahan cursor mein last row ki ordering values hoti hain
+aur agla page `WHERE (created_at, id) < (:c, :id)` se seedha index se aata hai.
+Page 1 ho ya page 500, cost same.
+
+Cursor opaque hai (base64 JSON); client ko bas `next` link follow karna hai.
+"""
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Strict keyset pagination over a fixed ordering.
+
+    `ordering` ke fields mein aakhri field unique honi chahiye (usually "id"),
+    warna ties pe rows skip/repeat ho sakti hain. Sab fields same direction
+    mein hone chahiye ("-created_at", "-id") taaki ek composite index kaam aaye.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    # True = do queries: pehle pk list, phir sirf us page ki rows (joins wali querysets ke liye)
+    deferred_join = False
+    invalid_cursor_message = "Bhai, cursor galat hai ya expire ho gaya."
+
+    # ── Config helpers ────────────────────────────────────────────────
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(getattr(view, "keyset_ordering", None) or self.ordering)
+        descending = {field.startswith("-") for field in ordering}
+        assert len(descending) == 1, "KeysetPagination: saare ordering fields ek hi direction mein hone chahiye."
+        return ordering
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    # ── Cursor encode / decode ────────────────────────────────────────
+    @staticmethod
+    def _jsonable(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, UUID):
+            return str(value)
+        return value
+
+    def encode_cursor(self, row):
+        values = [self._jsonable(getattr(row, field.lstrip("-"))) for field in self.ordering]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            model = queryset.model
+            decoded = []
+            for field_name, value in zip(self.ordering, values):
+                field = model._meta.get_field(field_name.lstrip("-"))
+                if field.get_internal_type() == "DateTimeField":
+                    value = parse_datetime(value)
+                    if value is None:
+                        raise ValueError
+                decoded.append(field.to_python(value))
+            return decoded
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # ── Seek predicate ────────────────────────────────────────────────
+    def seek_filter(self, position):
+        """
+        (a, b, c) < (x, y, z) ko OR-of-ANDs mein todta hai:
+          a < x  OR  (a = x AND b < y)  OR  (a = x AND b = y AND c < z)
+        SQLite/Postgres dono isse leading index column pe range scan karte hain.
+        """
+        lookup = "lt" if self.ordering[0].startswith("-") else "gt"
+        predicate = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            predicate |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return predicate
+
+    # ── DRF hooks ─────────────────────────────────────────────────────
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.page_size_value = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position))
+
+        # Ek extra row se pata chal jata hai ki agla page hai ya nahi (COUNT nahi)
+        limit = self.page_size_value + 1
+        if self.deferred_join:
+            # Pehle sirf pk — ordering columns covering index se aa jaate hain,
+            # sort/seek poori table ki wide rows (+ select_related joins) pe nahi hota.
+            # Phir sirf is page ki rows full joins ke saath.
+            pks = list(queryset.values_list("pk", flat=True)[:limit])
+            rows = list(queryset.filter(pk__in=pks)) if pks else []
+        else:
+            rows = list(queryset[:limit])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[: self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "first": self.get_first_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "first": {"type": "string", "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class OptionalKeysetPagination(BasePagination):
+    """
+    Purane endpoints ke liye opt-in keyset mode.
+
+    Default: `page_number_class` (count / next / previous — response same jaisa tha).
+    `?pagination=cursor` (ya `?cursor=...`) pe KeysetPagination over (created_at, id):
+    na COUNT(*), na OFFSET — response mein `has_more` + opaque `next` cursor.
+    Cursor mode mein `?ordering=` ignore hota hai; order hamesha newest first.
+    """
+
+    page_number_class = None
+    keyset_class = KeysetPagination
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+    deferred_join = False
+
+    def __init__(self):
+        self.page_number = self.page_number_class()
+        # Dono modes mein page size same rahe
+        self.keyset = self.keyset_class()
+        self.keyset.page_size = self.page_number.page_size
+        self.keyset.max_page_size = self.page_number.max_page_size or self.keyset.max_page_size
+        self.keyset.deferred_join = self.deferred_join
+        self.active = self.page_number
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.keyset.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.active = self.keyset if self.use_cursor(request) else self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = self.active.get_paginated_response(data)
+        if self.active is self.keyset:
+            response.data["has_more"] = self.keyset.has_next
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number.get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "'cursor' = keyset pagination (COUNT/OFFSET nahi, deep pages bhi fast).",
+                "schema": {"type": "string", "enum": [self.cursor_mode]},
+            },
+            {
+                "name": self.keyset.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pichhle response ka opaque cursor (`next` link mein hota hai).",
+                "schema": {"type": "string"},
+            },
+        ]
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.active, "display_page_controls", False)
+
+    def to_html(self):
+        return self.active.to_html()
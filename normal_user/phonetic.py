@@ -0,0 +1,88 @@
+"""
+Indian names ke liye phonetic key (metaphone-style, Hinglish spellings ke hisaab se).
+
+Ek hi naam kai tarah likha jata hai — "Shivam"/"Sivam", "Prabha"/"Prabhaa",
+"Lakshmi"/"Laxmi", "Vijay"/"Wijay", "Aditya"/"Adittya". Key unhe ek bana deti hai:
+
+1. Aspirated / digraph consonants ek jaise: sh->s, kh->k, bh->b, th->t, ph->f ...
+   x/ksh -> ks, w->v, z->j, q->k.
+2. Shuru ka vowel "a" ban jata hai (Ishaan/Eshan); baaki vowels, y aur beech
+   ke h hata diye jaate hain — transliteration mein sabse zyada farak wahin hota hai.
+3. Lagataar double consonants ek (tt->t), key max KEY_LENGTH chars.
+
+Key NormalUser.first_name_key / last_name_key mein save hoti hai (indexed);
+search exact `key = ?` lookup se hota hai — fuzzy recall, par index ki speed pe.
+"""
+import re
+import unicodedata
+
+from django.db.models import Q
+
+KEY_LENGTH = 12
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 4
+
+# Order zaroori hai — lambe patterns pehle
+_REPLACEMENTS = (
+    ("chh", "c"), ("ksh", "ks"), ("x", "ks"),
+    ("sh", "s"), ("ch", "c"), ("kh", "k"), ("gh", "g"), ("th", "t"), ("dh", "d"),
+    ("ph", "f"), ("bh", "b"), ("jh", "j"),
+    ("ck", "k"), ("q", "k"), ("w", "v"), ("z", "j"),
+)
+_VOWELS = set("aeiouy")
+_NON_ALPHA_RE = re.compile(r"[^a-z]+")
+
+
+def _ascii_letters(text):
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return _NON_ALPHA_RE.sub("", text.lower())
+
+
+def phonetic_key(word):
+    """Ek word ki key. Khali ya non-latin input pe "" milta hai."""
+    word = _ascii_letters(word)
+    if not word:
+        return ""
+    for pattern, replacement in _REPLACEMENTS:
+        word = word.replace(pattern, replacement)
+
+    key = ["a" if word[0] in _VOWELS else word[0]]
+    previous = word[0]
+    for char in word[1:]:
+        # Sirf lagataar wale double (tt, mm) ek — "Mohammed" mein dono m alag syllables hain
+        if char not in _VOWELS and char != "h" and char != previous:
+            key.append(char)
+        previous = char
+    return "".join(key)[:KEY_LENGTH]
+
+
+def name_keys(first_name, last_name):
+    """
+    (first_name_key, last_name_key). Kai words wale naam mein first name ka pehla
+    word aur last name ka aakhri word — search mein log aksar wahi likhte hain.
+    """
+    first_words = (first_name or "").split()
+    last_words = (last_name or "").split()
+    return (
+        phonetic_key(first_words[0]) if first_words else "",
+        phonetic_key(last_words[-1]) if last_words else "",
+    )
+
+
+def phonetic_name_q(text, prefix=""):
+    """
+    Search text -> Q jo har word ko first ya last name key pe match karta hai
+    (words ke beech AND). `prefix` = user tak ka path, e.g. "user__".
+    Koi naam-jaisa word na ho (mobile, student id) toh None.
+    """
+    terms = [
+        phonetic_key(term) for term in (text or "").split()[:MAX_TERMS]
+        if term.isalpha() and len(term) >= MIN_TERM_LENGTH
+    ]
+    terms = [key for key in terms if key]
+    if not terms:
+        return None
+    query = Q()
+    for key in dict.fromkeys(terms):
+        query &= Q(**{f"{prefix}first_name_key": key}) | Q(**{f"{prefix}last_name_key": key})
+    return query
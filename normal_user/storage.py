@@ -0,0 +1,137 @@
+"""
+Content-addressed, deduplicated upload storage.
+
+Same school logo / stock photo baar-baar upload hota tha aur har baar nayi file
+banti thi (org_logos/%Y/%m/, students/profiles/, teacher_profiles/%Y/%m/).
+Ab upload stream hote hue sha256 hota hai aur file ek hi baar
+`blobs/<aa>/<bb>/<digest><ext>` pe rakhi jaati hai — dusri baar wahi name
+return hota hai, disk pe kuch naya nahi.
+
+- MediaBlob row har blob ki: size + ref_count. Model ke file fields badalne /
+  row delete hone pe signals ref_count update karte hain (same transaction).
+- `collect_media_garbage` ref_count 0 wale (grace period ke baad) blobs hatata
+  hai; `--recount` tables se counts dobara banata hai.
+- URL content ke saath badalta hai, isliye `serve_blob` immutable cache
+  headers + Range ke saath serve karta hai.
+
+Purane (legacy) paths as-is chalte rehte hain — location wahi MEDIA_ROOT hai.
+"""
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = "blobs/"
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # Final name content se banta hai (_save mein) — "_aB3xY" suffix ki zarurat nahi
+        return name
+
+    def blob_name(self, digest, original_name):
+        ext = os.path.splitext(original_name)[1].lower()[:10]
+        return f"{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        folder = self.path(BLOB_PREFIX)
+        os.makedirs(folder, exist_ok=True)
+        digest, size = hashlib.sha256(), 0
+        # Temp file usi disk pe — os.replace atomic rahe
+        handle, temp_path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+        try:
+            with os.fdopen(handle, "wb") as temp:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp.write(chunk)
+                    size += len(chunk)
+
+            digest = digest.hexdigest()
+            blob_name = self.blob_name(digest, name)
+            full_path = self.path(blob_name)
+            if os.path.exists(full_path):
+                os.unlink(temp_path)  # Duplicate — pehle wali file hi kaafi hai
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(temp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        # ref_count 0 se — model save hone pe signal +1 karega
+        MediaBlob.objects.get_or_create(name=blob_name, defaults={"digest": digest, "size": size})
+        return blob_name
+
+
+_storage = None
+
+
+def blob_storage():
+    """FileField(storage=blob_storage) ke liye callable — migrations mein class path nahi aata."""
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage()
+    return _storage
+
+
+# ── Reference counting (signals) ──────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def blob_fields(model):
+    """Model ke wo file fields jo ContentAddressedStorage pe hain (har post_init pe chahiye, isliye cached)."""
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "storage", None) is not None and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def _adjust(names, delta):
+    from .models import MediaBlob
+
+    names = [name for name in names if name and name.startswith(BLOB_PREFIX)]
+    if names:
+        MediaBlob.objects.filter(name__in=names).update(ref_count=F("ref_count") + delta)
+
+
+def remember_blob_names(sender, instance, **kwargs):
+    """post_init: load ke waqt file names yaad rakho (deferred fields ko touch nahi karte)."""
+    instance._blob_names = {
+        field.attname: str(instance.__dict__[field.attname] or "")
+        for field in blob_fields(sender)
+        if field.attname in instance.__dict__
+    }
+
+
+def blob_refs_saved(sender, instance, **kwargs):
+    previous = getattr(instance, "_blob_names", {})
+    removed, added = [], []
+    for field in blob_fields(sender):
+        if field.attname not in instance.__dict__:
+            continue
+        current = getattr(instance, field.attname).name or ""
+        before = previous.get(field.attname, "")
+        if current != before:
+            removed.append(before)
+            added.append(current)
+        previous[field.attname] = current
+    instance._blob_names = previous
+    _adjust(removed, -1)
+    _adjust(added, +1)
+
+
+def blob_refs_deleted(sender, instance, **kwargs):
+    _adjust(list(getattr(instance, "_blob_names", {}).values()), -1)
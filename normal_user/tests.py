@@ -1,3 +1,317 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from organizations.models import Organization
+from students_classroom.models import JoinRequest
+from teachers.models import Teacher
+
+from . import images
+from .phonetic import name_keys, phonetic_key, phonetic_name_q
+from .admin_mixins import EstimatedCountPaginator, StreamingCSVExportMixin, check_path
+from .models import MediaBlob, Notification
+from .storage import BLOB_PREFIX, blob_storage
+
+User = get_user_model()
+
+
+class CSVExportPathTests(SimpleTestCase):
+    """Export columns ke paths — typo chupke se khali column nahi banna chahiye."""
+
+    def test_registered_exports_have_valid_paths(self):
+        for model, model_admin in admin.site._registry.items():
+            if not isinstance(model_admin, StreamingCSVExportMixin):
+                continue
+            for _, path in model_admin.get_csv_export_fields(None):
+                with self.subTest(model=model.__name__, path=path):
+                    check_path(model, path)
+
+    def test_unknown_attribute_is_rejected(self):
+        # reviewed_by ek Teacher hai — username uske user pe hai
+        with self.assertRaises(ImproperlyConfigured):
+            check_path(JoinRequest, "reviewed_by__username")
+        with self.assertRaises(ImproperlyConfigured):
+            check_path(JoinRequest, "status__foo")
+        check_path(JoinRequest, "reviewed_by__user__username")
+        check_path(JoinRequest, "user__get_full_name")
+
+    def test_null_relation_is_blank(self):
+        resolve = StreamingCSVExportMixin.resolve_csv_value
+        reviewer = Teacher(user=User(username="class.teacher"))
+        self.assertEqual(resolve(JoinRequest(reviewed_by=reviewer), "reviewed_by__user__username"), "class.teacher")
+        self.assertEqual(resolve(JoinRequest(reviewed_by=None), "reviewed_by__user__username"), "")
+        with self.assertRaises(AttributeError):
+            resolve(JoinRequest(reviewed_by=reviewer), "reviewed_by__username")
+
+
+# ────────────────────────────────────────────────
+# Image derivatives
+# ────────────────────────────────────────────────
+
+def image_file(size, mode="RGB", fmt="PNG"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 40, 40, 128)[:len(mode)]).save(buffer, format=fmt)
+    return ContentFile(buffer.getvalue())
+
+
+class ImageDerivativeTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cache.clear()
+
+    def test_variants_per_width_and_format(self):
+        name = default_storage.save("org_logos/logo.png", image_file((1000, 500), mode="RGBA"))
+        manifest = images.generate_derivatives(name)
+
+        for ext, (fmt, _) in images.VARIANT_FORMATS.items():
+            variants = manifest["variants"][ext]
+            self.assertEqual([width for width, _ in variants], list(images.VARIANT_WIDTHS))
+            for width, path in variants:
+                self.assertTrue(path.startswith(f"{images.DERIVATIVE_ROOT}/{manifest['hash'][:2]}/{manifest['hash']}/"))
+                with default_storage.open(path, "rb") as handle:
+                    variant = Image.open(handle)
+                    self.assertEqual(variant.format, fmt)
+                    self.assertEqual(variant.size, (width, width // 2))
+
+    def test_small_image_is_not_upscaled(self):
+        name = default_storage.save("teacher_profiles/tiny.png", image_file((50, 50)))
+        manifest = images.generate_derivatives(name)
+        self.assertEqual([width for width, _ in manifest["variants"]["webp"]], [50])
+
+    def test_same_content_shares_variants(self):
+        first = default_storage.save("a/logo.png", image_file((300, 300)))
+        second = default_storage.save("b/logo.png", image_file((300, 300)))
+        self.assertEqual(images.generate_derivatives(first)["variants"], images.generate_derivatives(second)["variants"])
+
+    def test_broken_image_is_skipped(self):
+        name = default_storage.save("org_logos/broken.png", ContentFile(b"not an image"))
+        self.assertIsNone(images.generate_derivatives(name))
+
+    def test_serializer_output(self):
+        name = default_storage.save("org_logos/logo.png", image_file((400, 200)))
+        images.generate_derivatives(name)
+        cache.clear()  # Manifest storage se padha jaana chahiye
+
+        logo = Organization(logo=name).logo
+        data = images.image_variants(logo)
+        self.assertTrue(data["ready"])
+        self.assertEqual(data["webp"].count("w,") + 1, 3)  # 80, 160, 320
+        self.assertTrue(data["jpeg"].endswith(" 320w"))
+
+
+# ────────────────────────────────────────────────
+# Content-addressed uploads
+# ────────────────────────────────────────────────
+
+class MediaBlobRefCountTests(TestCase):
+    """ref_count = kitni rows blob ko point karti hain — GC isi pe bharosa karta hai."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+    def school(self, name, logo=None):
+        org = Organization(name=name, admin=self.admin)
+        if logo is not None:
+            org.logo.save("logo.png", logo, save=False)
+        org.save()
+        return org
+
+    def refs(self, name):
+        return MediaBlob.objects.get(name=name).ref_count
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.school("Agra Public School", image_file((8, 8)))
+        second = self.school("Taj Convent", image_file((8, 8)))
+
+        self.assertEqual(first.logo.name, second.logo.name)
+        self.assertTrue(first.logo.name.startswith(BLOB_PREFIX))
+        self.assertEqual(MediaBlob.objects.count(), 1)
+        self.assertEqual(self.refs(first.logo.name), 2)
+
+    def test_replace_and_delete_move_counts(self):
+        org = self.school("Agra Public School", image_file((8, 8)))
+        old = org.logo.name
+
+        org = Organization.objects.get(pk=org.pk)
+        org.logo.save("new.png", image_file((16, 16)), save=True)
+        self.assertEqual(self.refs(old), 0)
+        self.assertEqual(self.refs(org.logo.name), 1)
+
+        Organization.objects.get(pk=org.pk).delete()
+        self.assertEqual(self.refs(org.logo.name), 0)
+
+    def test_unchanged_save_keeps_count(self):
+        org = self.school("Agra Public School", image_file((8, 8)))
+        org.save()
+        Organization.objects.get(pk=org.pk).save()
+        self.assertEqual(self.refs(org.logo.name), 1)
+
+    def test_garbage_collection(self):
+        kept = self.school("Agra Public School", image_file((8, 8)))
+        orphan = blob_storage().save("logo.png", image_file((16, 16)))
+        MediaBlob.objects.filter(name=kept.logo.name).update(ref_count=5)  # Drift
+
+        call_command("collect_media_garbage", "--recount", "--grace-hours=0", stdout=io.StringIO())
+
+        self.assertEqual(self.refs(kept.logo.name), 1)
+        self.assertTrue(blob_storage().exists(kept.logo.name))
+        self.assertFalse(MediaBlob.objects.filter(name=orphan).exists())
+        self.assertFalse(blob_storage().exists(orphan))
+
+    def test_blob_response_headers(self):
+        org = self.school("Agra Public School", image_file((8, 8)))
+        url = "/" + settings.MEDIA_URL.strip("/") + "/" + org.logo.name
+        size = MediaBlob.objects.get(name=org.logo.name).size
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(self.client.get(url, headers={"If-None-Match": response["ETag"]}).status_code, 304)
+
+        partial = self.client.get(url, headers={"Range": "bytes=0-9"})
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(b"".join(partial.streaming_content), b"".join(response.streaming_content)[:10])
+        self.assertEqual(partial["Content-Range"], f"bytes 0-9/{size}")
+        self.assertEqual(self.client.get(url, headers={"Range": f"bytes={size}-"}).status_code, 416)
+
+
+# ────────────────────────────────────────────────
+# Changelist count (estimate vs exact)
+# ────────────────────────────────────────────────
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_user(
+            username="root", email="root@example.com", password="x", mobile="9000000000",
+            is_staff=True, is_superuser=True,
+        )
+        Notification.objects.bulk_create([
+            Notification(recipient=cls.admin_user, title=f"Notice {i}", message="-", is_read=i % 2 == 0)
+            for i in range(10)
+        ])
+        # Beech ki rows delete -> pk range (estimate) 10, asli rows 6
+        pks = list(Notification.objects.order_by("pk").values_list("pk", flat=True))
+        Notification.objects.filter(pk__in=pks[2:6]).delete()
+
+    def count(self, queryset, **attrs):
+        with mock.patch.multiple(EstimatedCountPaginator, **attrs):
+            return EstimatedCountPaginator(queryset, 50).count
+
+    def test_estimate_above_threshold(self):
+        self.assertEqual(self.count(Notification.objects.all(), exact_below=5), 10)
+
+    def test_exact_below_threshold(self):
+        self.assertEqual(self.count(Notification.objects.all(), exact_below=11), 6)
+
+    def test_filtered_count_is_capped(self):
+        unread = Notification.objects.filter(is_read=False)
+        self.assertEqual(self.count(unread, count_cap=100), unread.count())
+        self.assertEqual(self.count(unread, count_cap=2), 3)
+
+    def test_plain_list_falls_back_to_len(self):
+        self.assertEqual(EstimatedCountPaginator(list(range(7)), 5).count, 7)
+
+    def test_changelist_uses_estimate(self):
+        self.client.force_login(self.admin_user)
+        with mock.patch.object(EstimatedCountPaginator, "exact_below", 5):
+            response = self.client.get("/admin/normal_user/notification/")
+        self.assertEqual(response.status_code, 200)
+        changelist = response.context["cl"]
+        self.assertIsInstance(changelist.paginator, EstimatedCountPaginator)
+        self.assertEqual(changelist.result_count, 10)
+        self.assertIsNone(changelist.full_result_count)
+
+        response = self.client.get("/admin/normal_user/notification/")
+        self.assertEqual(response.context["cl"].result_count, 6)
+
+
+# ────────────────────────────────────────────────
+# Phonetic name keys
+# ────────────────────────────────────────────────
+
+class PhoneticKeyTests(SimpleTestCase):
+
+    def test_spelling_variants_share_a_key(self):
+        for left, right in (
+            ("Sivam", "Shivam"), ("Lakshmi", "Laxmi"), ("Vijay", "Wijay"),
+            ("Aditya", "Adittya"), ("Ishaan", "Eshan"), ("Prabha", "Prabhaa"), ("SHIVAM", "shivam"),
+        ):
+            with self.subTest(left=left, right=right):
+                self.assertEqual(phonetic_key(left), phonetic_key(right))
+
+    def test_different_names_stay_apart(self):
+        self.assertNotEqual(phonetic_key("Ravi"), phonetic_key("Rohit"))
+        self.assertNotEqual(phonetic_key("Shivam"), phonetic_key("Shyam"))
+
+    def test_empty_and_non_latin(self):
+        self.assertEqual(phonetic_key(""), "")
+        self.assertEqual(phonetic_key(None), "")
+        self.assertEqual(phonetic_key("अमित"), "")
+        self.assertLessEqual(len(phonetic_key("Subramanyanarayanaswamy")), 12)
+
+    def test_name_keys_use_first_and_last_word(self):
+        self.assertEqual(name_keys("Shiv Kumar", "Das Gupta"), (phonetic_key("Shiv"), phonetic_key("Gupta")))
+        self.assertEqual(name_keys("", None), ("", ""))
+
+    def test_search_terms(self):
+        self.assertIsNone(phonetic_name_q("9876543210"))
+        self.assertIsNone(phonetic_name_q("S-123 a"))
+        self.assertIsNotNone(phonetic_name_q("sivam 9876543210"))
+
+
+class NameKeyRefreshTests(TestCase):
+
+    def test_save_refreshes_keys(self):
+        user = User.objects.create_user(
+            username="shivam", email="shivam@example.com", password="x", mobile="9000000000",
+            first_name="Shivam", last_name="Laxmi",
+        )
+        self.assertEqual((user.first_name_key, user.last_name_key), ("svm", "lksm"))
+        self.assertEqual(User.objects.filter(phonetic_name_q("Sivam Lakshmi")).get(), user)
+
+        # update_fields mein sirf first_name — keys phir bhi DB tak jaani chahiye
+        user.first_name = "Vijay"
+        user.save(update_fields=["first_name"])
+        stored = User.objects.values_list("first_name_key", "last_name_key").get(pk=user.pk)
+        self.assertEqual(stored, (phonetic_key("Wijay"), "lksm"))
+        self.assertFalse(User.objects.filter(phonetic_name_q("Sivam")).exists())
+
+    def test_backfill_command_fixes_stale_keys(self):
+        user = User.objects.create_user(
+            username="aditya", email="aditya@example.com", password="x", mobile="9000000001",
+            first_name="Aditya", last_name="Rao",
+        )
+        # .update() save() nahi chalata — keys purani reh jaati hain
+        User.objects.filter(pk=user.pk).update(first_name="Ishaan")
+        call_command("backfill_name_keys", stdout=io.StringIO())
+        self.assertEqual(
+            User.objects.values_list("first_name_key", flat=True).get(pk=user.pk), phonetic_key("Eshan"),
+        )
@@ -11,8 +11,13 @@ from django_ratelimit.decorators import ratelimit
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from rest_framework.throttling import UserRateThrottle
 import logging
+import mimetypes
+import os
+import re
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from .serializers import SignupSerializer, LoginSerializer, AccountDeleteSerializer, NormalUserSignupSerializer
 from .models import NormalUser
+from .images import image_variants
 from organizations.serializers import OrganizationDetailSerializer, SchoolAdminUserSerializer
 from organizations.models import Organization, SchoolAdmin
 from django.contrib.auth import authenticate 
@@ -412,6 +417,8 @@ class DashboardDataView(APIView):
             "organization_name": first_org.name if first_org else None,
             # Logo URL fix: media handling safe rahegi
             "organization_logo": request.build_absolute_uri(first_org.logo.url) if first_org and first_org.logo else None,
+            # Chhote WebP/JPEG variants (srcset) — app inhi mein se screen ke hisaab se le
+            "organization_logo_variants": image_variants(first_org.logo, request.build_absolute_uri) if first_org else None,
             "schoolsList": schools_list
         })
     
@@ -446,4 +453,66 @@ class UserMeView(APIView):
                 "user": user_data,
                 "schools": schools # Dashboard pe redirect karne ke liye kaam aayega
             }
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+# ────────────────────────────────────────────────
+# Content-addressed media (blobs/) — immutable + Range
+# ────────────────────────────────────────────────
+BLOB_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _read_range(path, start, length, chunk_size=64 * 1024):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_blob(request, name):
+    """
+    GET /media/blobs/<aa>/<bb>/<digest>.<ext>. URL content ke saath badalta hai, isliye
+    browser/CDN saal bhar cache kare (immutable). Video/PDF ke liye single `Range` bhi.
+    """
+    from .storage import BLOB_PREFIX, blob_storage
+
+    storage = blob_storage()
+    blob_name = BLOB_PREFIX + name
+    if '..' in name.split('/') or not storage.exists(blob_name):
+        raise Http404('Blob nahi mila')
+
+    path = storage.path(blob_name)
+    size = os.path.getsize(path)
+    etag = '"%s"' % os.path.basename(name).split('.')[0]
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    else:
+        match = _RANGE_RE.match(request.headers.get('Range', '').strip())
+        start, end = 0, size - 1
+        if match and match.group(1) + match.group(2):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            else:  # bytes=-500 -> aakhri 500 bytes
+                start = max(size - int(match.group(2)), 0)
+            if start > end or start >= size:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+            response = StreamingHttpResponse(_read_range(path, start, end - start + 1),
+                                             status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = BLOB_CACHE_CONTROL
+    return response
@@ -0,0 +1,368 @@
+"""
+Bulk organization onboarding (chains with dozens/hundreds of branches).
+
+CSV ek stream ki tarah padhi jaati hai aur `chunk_size` rows ke chunks mein:
+1. Har row ka validation — model fields ke apne validators (`field.clean`),
+   choices, required admin columns. Galat row skip, baaki chalti hain.
+2. Chunk ke saare admins ka ek hi lookup (mobile / email / username IN ...);
+   same admin kai branches mein ho toh ek hi user banta hai.
+3. Ek transaction mein bulk_create: users -> organizations -> SchoolAdmin links.
+   Organization.save() wala kaam (slug, org_id, admin_custom_id, SCHOOL_ADMIN role,
+   SchoolAdmin link) yahan set-based hota hai — har row pe 4-5 queries nahi.
+4. Commit ke baad search index + school directory ko batch mein khabar.
+
+Passwords: PBKDF2 hash ~0.4s ka hai, isliye sirf naye users ke liye aur threads
+mein (hashlib GIL chhod deta hai). `admin_password` khali ho toh unusable password.
+"""
+import csv
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from normal_user.phonetic import name_keys
+from .models import Organization, SchoolAdmin
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_DESIGNATION = "Principal/Owner"
+MOBILE_RE = re.compile(r"^\+?1?\d{9,15}$")  # OrganizationSerializer wala hi regex
+
+# CSV column -> Organization field. API wale naam (org_name, org_city...) bhi chalte hain.
+ORG_COLUMNS = {
+    "name": "name", "org_name": "name",
+    "org_type": "org_type",
+    "affiliation_board": "affiliation_board", "org_board": "affiliation_board",
+    "registration_number": "registration_number",
+    "description": "description",
+    "address": "address", "org_address": "address",
+    "phone_number": "phone_number", "org_mobile": "phone_number",
+    "contact_email": "contact_email", "org_email": "contact_email",
+    "website": "website",
+    "established_year": "established_year",
+    "city": "city", "org_city": "city",
+    "locality": "locality",
+    "pincode": "pincode", "org_pincode": "pincode",
+    "instruction_medium": "instruction_medium",
+    "gender_type": "gender_type",
+    "fee_category": "fee_category",
+    "monthly_fees_min": "monthly_fees_min",
+    "has_transport": "has_transport",
+    "has_hostel": "has_hostel",
+    "has_smart_class": "has_smart_class",
+    "has_library": "has_library",
+    "has_playground": "has_playground",
+}
+ADMIN_COLUMNS = ("admin_name", "admin_email", "admin_mobile", "admin_password", "admin_designation")
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "haan"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", "nahi", ""}
+
+
+class ImportAborted(Exception):
+    """Poori file hi galat hai (e.g. header missing) — row-level error nahi."""
+
+
+def _admin_custom_id(name):
+    # Organization.save() wala format: ADM-<naam ke 3 letters>-<4 hex>
+    name_part = (name or "").replace(" ", "")[:3].upper().ljust(3, "X")
+    return f"ADM-{name_part}-{uuid.uuid4().hex[:4].upper()}"
+
+
+class OrganizationImporter:
+    def __init__(self, created_by=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+        self.created_by = created_by
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.report = {
+            "dry_run": dry_run,
+            "total_rows": 0,
+            "created_organizations": 0,
+            "created_users": 0,
+            "reused_users": 0,
+            "errors": [],
+        }
+        # Poori file ke across: same branch do baar na bane, same admin ek hi user rahe
+        self._seen_branches = set()
+        self._seen_registrations = set()
+        self._run_users = {}   # ("mobile"/"email", value) -> User (is run mein bana)
+        self._reused = set()   # pehle se maujood users ke pks
+        self._org_fields = {field.name: field for field in Organization._meta.get_fields() if field.concrete}
+
+    # ── Public API ────────────────────────────────────────────────────
+    def run(self, text_stream):
+        """text_stream: text-mode file / lines ka iterable (Excel BOM ke liye `utf-8-sig` se kholo)."""
+        reader = csv.DictReader(text_stream)
+        headers = {(h or "").strip().lower() for h in reader.fieldnames or []}
+        if not headers & {"name", "org_name"} or "admin_mobile" not in headers:
+            raise ImportAborted("Bhai, CSV mein kam se kam 'name' (ya 'org_name') aur 'admin_mobile' columns chahiye.")
+
+        # line_num = file ki asli line (quoted multi-line cells ke baad bhi sahi)
+        rows = ((reader.line_num, row) for row in reader)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.report["total_rows"] += len(chunk)
+            self._process_chunk(chunk)
+
+        self.report["error_count"] = len(self.report["errors"])
+        return self.report
+
+    # ── Row validation ────────────────────────────────────────────────
+    def _error(self, line, errors):
+        self.report["errors"].append({"row": line, "errors": errors})
+
+    def _clean_org(self, row):
+        data, errors = {}, {}
+        for column, field_name in ORG_COLUMNS.items():
+            if column not in row or field_name in data:
+                continue
+            raw = (row.get(column) or "").strip()
+            field = self._org_fields[field_name]
+            try:
+                if field.get_internal_type() == "BooleanField":
+                    if raw.lower() not in TRUE_VALUES | FALSE_VALUES:
+                        raise ValidationError("Yes/No (ya 1/0) likho.")
+                    value = raw.lower() in TRUE_VALUES
+                elif raw == "" and field.null:
+                    value = None
+                elif raw == "" and field.has_default():
+                    continue  # Khali cell -> model ka default (e.g. org_type="school")
+                else:
+                    value = field.clean(raw, None)
+                data[field_name] = value
+            except ValidationError as exc:
+                errors[column] = exc.messages
+        if not data.get("name"):
+            errors.setdefault("name", ["Organization ka naam zaroori hai."])
+        return data, errors
+
+    def _clean_admin(self, row):
+        admin = {column: (row.get(column) or "").strip() for column in ADMIN_COLUMNS}
+        admin["admin_email"] = admin["admin_email"].lower()
+        errors = {}
+        if not MOBILE_RE.match(admin["admin_mobile"]):
+            errors["admin_mobile"] = ["Valid mobile number chahiye (9-15 digits)."]
+        if admin["admin_email"]:
+            try:
+                validate_email(admin["admin_email"])
+            except ValidationError as exc:
+                errors["admin_email"] = exc.messages
+        if admin["admin_password"] and len(admin["admin_password"]) < 8:
+            errors["admin_password"] = ["Password kam se kam 8 characters ka ho."]
+        return admin, errors
+
+    # ── Chunk processing ──────────────────────────────────────────────
+    def _process_chunk(self, chunk):
+        valid = []
+        for line, row in chunk:
+            row = {(key or "").strip().lower(): value for key, value in row.items()}
+            org, org_errors = self._clean_org(row)
+            admin, admin_errors = self._clean_admin(row)
+            errors = {**org_errors, **admin_errors}
+            if not errors:
+                branch = (org["name"].casefold(), (org.get("pincode") or org.get("city") or "").casefold())
+                registration = (org.get("registration_number") or "").casefold()
+                if branch in self._seen_branches:
+                    errors["name"] = ["Same naam + pincode/city wali branch file mein pehle aa chuki hai."]
+                elif registration and registration in self._seen_registrations:
+                    errors["registration_number"] = ["Yeh registration number file mein pehle aa chuka hai."]
+                else:
+                    self._seen_branches.add(branch)
+                    if registration:
+                        self._seen_registrations.add(registration)
+            if errors:
+                self._error(line, errors)
+            else:
+                valid.append((line, org, admin))
+
+        valid = self._drop_registered(valid)
+        plans = self._resolve_admins(valid)
+        if not plans:
+            return
+        if not self.dry_run:
+            self._write(plans)
+            return
+
+        # Dry run: sirf counts; naye (unsaved) users bhi yaad rakho taaki agle chunk mein dobara na gine
+        new_users = list({id(user): user for *_, user in plans if user.pk is None}.values())
+        new_users = [user for user in new_users if ("mobile", user.mobile) not in self._run_users]
+        for user in new_users:
+            self._run_users[("mobile", user.mobile)] = user
+            self._run_users[("email", user.email)] = user
+        self._reused.update(user.pk for *_, user in plans if user.pk is not None)
+        self.report["created_organizations"] += len(plans)
+        self.report["created_users"] += len(new_users)
+        self.report["reused_users"] = len(self._reused)
+
+    def _drop_registered(self, valid):
+        """DB mein pehle se registered registration_number wali rows — ek query mein."""
+        numbers = [org["registration_number"] for _, org, _ in valid if org.get("registration_number")]
+        if not numbers:
+            return valid
+        taken = {
+            number.casefold()
+            for number in Organization.objects.filter(registration_number__in=numbers)
+            .values_list("registration_number", flat=True)
+        }
+        kept = []
+        for line, org, admin in valid:
+            if (org.get("registration_number") or "").casefold() in taken:
+                self._error(line, {"registration_number": ["Is registration number se organization pehle se hai."]})
+            else:
+                kept.append((line, org, admin))
+        return kept
+
+    def _resolve_admins(self, valid):
+        """Har row ke liye (line, org, admin, user) — user existing ho ya naya (unsaved)."""
+        mobiles = {admin["admin_mobile"] for _, _, admin in valid}
+        emails = {admin["admin_email"] for _, _, admin in valid if admin["admin_email"]}
+
+        by_mobile, by_email = {}, {}
+        existing = User.all_objects.filter(
+            Q(mobile__in=mobiles) | Q(email__in=emails) | Q(username__in=emails)
+        ).order_by("id") if valid else []
+        for user in existing:
+            by_mobile.setdefault(user.mobile, user)
+            by_email.setdefault(user.email.lower(), user)
+            by_email.setdefault(user.username.lower(), user)
+        for (kind, value), user in self._run_users.items():
+            (by_mobile if kind == "mobile" else by_email)[value] = user
+
+        plans = []
+        for line, org, admin in valid:
+            mobile, email = admin["admin_mobile"], admin["admin_email"]
+            mobile_user = by_mobile.get(mobile)
+            email_user = by_email.get(email) if email else None
+            if mobile_user and email_user and mobile_user is not email_user:
+                self._error(line, {"admin_email": ["Yeh email kisi aur user ka hai (mobile alag account se juda hai)."]})
+                continue
+            user = mobile_user or email_user
+            if user is not None and getattr(user, "is_deleted", False):
+                self._error(line, {"admin_mobile": ["Yeh account delete ho chuka hai."]})
+                continue
+
+            if user is None:
+                if not email:
+                    self._error(line, {"admin_email": ["Naye admin ke liye email zaroori hai."]})
+                    continue
+                first_name = admin["admin_name"] or email.split("@")[0]
+                user = User(
+                    username=email, email=email, mobile=mobile, first_name=first_name,
+                    role=User.Roles.SCHOOL_ADMIN, is_active=True,
+                    admin_custom_id=_admin_custom_id(first_name),
+                )
+                user._import_password = admin["admin_password"]
+                user.first_name_key, user.last_name_key = name_keys(user.first_name, user.last_name)
+                by_mobile[mobile] = by_email[email] = user
+            plans.append((line, org, admin, user))
+        return plans
+
+    # ── Writes ────────────────────────────────────────────────────────
+    def _hash_passwords(self, users):
+        with_password = [user for user in users if user._import_password]
+        for user in users:
+            if not user._import_password:
+                user.set_unusable_password()
+        if with_password:
+            workers = max(1, min(8, os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                hashes = pool.map(make_password, [user._import_password for user in with_password])
+            for user, hashed in zip(with_password, hashes):
+                user.password = hashed
+
+    @staticmethod
+    def _make_unique(model, field, objs, regenerate):
+        """objs ka `field` DB mein ya batch ke andar takraaye toh regenerate(obj) se naya value."""
+        while objs:
+            values = [getattr(obj, field) for obj in objs]
+            taken = set(model.objects.filter(**{f"{field}__in": values}).values_list(field, flat=True))
+            seen, clashes = set(), []
+            for obj, value in zip(objs, values):
+                if value in taken or value in seen:
+                    clashes.append(obj)
+                seen.add(value)
+            if not clashes:
+                return
+            for obj in clashes:
+                setattr(obj, field, regenerate(obj))
+
+    def _write(self, plans):
+        new_users = list({id(user): user for *_, user in plans if user.pk is None}.values())
+        self._hash_passwords(new_users)
+
+        # Existing users: Organization.save() jaisa — role SCHOOL_ADMIN + admin_custom_id
+        promote, fresh_ids = {}, list(new_users)
+        for *_, user in plans:
+            if user.pk is not None and (user.role != User.Roles.SCHOOL_ADMIN or not user.admin_custom_id):
+                if not user.admin_custom_id:
+                    user.admin_custom_id = _admin_custom_id(user.first_name or user.username)
+                    fresh_ids.append(user)
+                user.role = User.Roles.SCHOOL_ADMIN
+                promote[user.pk] = user
+
+        # Naye admin_custom_id unique hon (4 hex = 65k combos, badi chain mein takra sakte hain)
+        self._make_unique(User, "admin_custom_id", fresh_ids, lambda user: _admin_custom_id(user.first_name or user.username))
+
+        year = timezone.now().year
+        orgs = []
+        for line, data, admin, user in plans:
+            org = Organization(**data, admin=user, created_by=self.created_by)
+            org.slug = slugify(org.name)[:240] or uuid.uuid4().hex[:8]
+            org.org_id = f"ORG-{year}-{uuid.uuid4().hex[:6].upper()}"
+            org._import_designation = admin["admin_designation"] or DEFAULT_DESIGNATION
+            orgs.append(org)
+
+        # Chain ki branches ka naam aksar same hota hai ("DPS") — slug mein suffix
+        self._make_unique(Organization, "slug", orgs, lambda org: f"{slugify(org.name)[:240]}-{uuid.uuid4().hex[:4]}")
+        self._make_unique(Organization, "org_id", orgs, lambda org: f"ORG-{year}-{uuid.uuid4().hex[:6].upper()}")
+
+        with transaction.atomic():
+            User.objects.bulk_create(new_users, batch_size=500)
+            if promote:
+                User.objects.bulk_update(list(promote.values()), ["role", "admin_custom_id"], batch_size=500)
+            for org, (*_, user) in zip(orgs, plans):
+                org.admin = user   # bulk_create ke baad user.pk set hai
+            Organization.objects.bulk_create(orgs, batch_size=500)
+            SchoolAdmin.objects.bulk_create(
+                [
+                    SchoolAdmin(user=org.admin, organization=org, designation=org._import_designation,
+                                created_by=self.created_by)
+                    for org in orgs
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
+            transaction.on_commit(lambda: _after_import(orgs))
+
+        for user in new_users:
+            self._run_users[("mobile", user.mobile)] = user
+            self._run_users[("email", user.email)] = user
+        created = {key[1] for key, user in self._run_users.items() if key[0] == "mobile"}
+        self._reused.update(user.pk for *_, user in plans if user.mobile not in created)
+        self.report["created_organizations"] += len(orgs)
+        self.report["created_users"] += len(new_users)
+        self.report["reused_users"] = len(self._reused)
+
+
+def _after_import(orgs):
+    """bulk_create signals nahi bhejta — search index aur directory ko khud batao."""
+    from school_directory.geo import bump_geo_version
+    from school_directory.index import record_change
+    from search import backend as search_backend
+
+    search_backend.index_objects("organization", orgs)
+    for org in orgs:
+        record_change(org.pk)
+    bump_geo_version()
@@ -0,0 +1,77 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from organizations.models import Organization
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Organization.save() ka benchmark — purana full-row save vs dirty-field save (sab rollback hota hai)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help='Har scenario mein kitne saves')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        try:
+            with transaction.atomic():
+                self._run(count)
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS('Done! Benchmark ka data rollback ho gaya.'))
+
+    def _run(self, count):
+        suffix = uuid.uuid4().hex[:8]
+        admins = [
+            User.objects.create(username=f'bench_{suffix}_{i}', email=f'bench_{suffix}_{i}@example.com',
+                                mobile=f'900000000{i}',
+                                first_name='Bench')
+            for i in range(2)
+        ]
+        org = Organization.objects.create(name=f'Benchmark School {suffix}', admin=admins[0])
+        org = Organization.objects.get(pk=org.pk)
+
+        def legacy_unchanged(i):
+            # Purana behaviour: poori row UPDATE + har baar admin linking
+            models.Model.save(org)
+            org._link_admin()
+
+        def unchanged(i):
+            org.save()
+
+        def description(i):
+            org.description = f'Edit {i}'
+            org.save()
+
+        def admin_switch(i):
+            org.admin = admins[i % 2]
+            org.save()
+
+        self.stdout.write(f'{count} saves per scenario:')
+        for label, step in (
+            ('legacy full save (unchanged)', legacy_unchanged),
+            ('unchanged', unchanged),
+            ('description edit', description),
+            ('admin change', admin_switch),
+        ):
+            queries = []
+            # execute_wrapper — CaptureQueriesContext 9000 queries pe ruk jata hai
+            with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                started = time.perf_counter()
+                for i in range(count):
+                    step(i)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'  {label:<30} {elapsed:7.2f}s  {elapsed / count * 1e6:8.1f} us/save  '
+                f'{len(queries) / count:5.2f} queries/save'
+            )
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from organizations.importer import DEFAULT_CHUNK_SIZE, ImportAborted, OrganizationImporter
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'CSV se bulk organizations + unke admins import karta hai (chain onboarding)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to CSV (columns: name, city, pincode, ..., admin_name, admin_email, admin_mobile)')
+        parser.add_argument('--dry-run', action='store_true', help='Sirf validate karo, kuch save mat karo')
+        parser.add_argument('--created-by', help='Audit ke liye super-admin ka username')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        created_by = None
+        if options['created_by']:
+            created_by = User.objects.filter(username=options['created_by']).first()
+            if created_by is None:
+                raise CommandError(f"Bhai, '{options['created_by']}' naam ka user nahi mila.")
+
+        importer = OrganizationImporter(
+            created_by=created_by, chunk_size=options['chunk_size'], dry_run=options['dry_run'],
+        )
+        try:
+            with open(options['csv_file'], encoding='utf-8-sig', newline='') as handle:
+                report = importer.run(handle)
+        except (OSError, ImportAborted) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors']:
+            details = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in error['errors'].items())
+            self.stdout.write(self.style.WARNING(f"  Row {error['row']}: {details}"))
+
+        prefix = 'DRY RUN — ' if report['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{report['total_rows']} rows: {report['created_organizations']} organizations, "
+            f"{report['created_users']} naye admins, {report['reused_users']} existing admins, "
+            f"{report['error_count']} errors."
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 10:46
+
+import normal_user.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0004_alter_organization_admin_alter_organization_pincode_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='organization',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=normal_user.storage.blob_storage, upload_to='org_logos/%Y/%m/', verbose_name='Logo'),
+        ),
+    ]
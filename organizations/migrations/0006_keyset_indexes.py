@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 10:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_logo_blob_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['-created_at', '-id'], name='organizatio_created_70a9be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schooladmin',
+            index=models.Index(fields=['-created_at', '-id'], name='organizatio_created_f4c959_idx'),
+        ),
+    ]
@@ -10,7 +10,25 @@ from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator
 from django.urls import reverse
 from django.utils import timezone  # Correct way to get current year
+from django.core.files import File
+import copy
 import uuid
+from normal_user.storage import blob_storage
+
+def _comparable(value):
+    """
+    Snapshot / compare ke liye value ki copy — live object nahi. FieldFile
+    in-place badalta hai (`logo.save()` usi object ka name badalta hai), isliye
+    uska name; JSON dict/list deepcopy. Naya upload (commit nahi hua) hamesha dirty.
+    """
+    if isinstance(value, File):
+        if not getattr(value, '_committed', False):
+            return object()
+        return value.name
+    if isinstance(value, (dict, list, set)):
+        return copy.deepcopy(value)
+    return value
+
 
 class Organization(models.Model):
     """
@@ -80,6 +98,7 @@ class Organization(models.Model):
     # ── Profile & Contact Details ──────────────────────────────────────────────
     logo = models.ImageField(
         upload_to='org_logos/%Y/%m/',
+        storage=blob_storage,
         null=True,
         blank=True,
         verbose_name=_("Logo")
@@ -192,12 +211,48 @@ class Organization(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['org_id']),
             models.Index(fields=['org_type']),
+            models.Index(fields=['-created_at', '-id']),  # ?pagination=cursor
         ]
 
     def __str__(self):
         return f"{self.name} ({self.org_id or _('No ID')})"
 
+    # ── Dirty-field tracking ───────────────────────────────────────────────────
+    # DB se load hote waqt values ka snapshot; save() sirf badle hue columns likhta hai
+    # aur admin-linking wala kaam sirf create / admin change pe hota hai.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_loaded_values()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_loaded_values()
+
+    def _snapshot_loaded_values(self):
+        self._loaded_values = {
+            field.attname: _comparable(self.__dict__[field.attname])
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def get_dirty_fields(self):
+        """Load ke baad badle hue field names (attname nahi — 'admin', 'admin_id' nahi)."""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return {field.name for field in self._meta.concrete_fields}
+        dirty = set()
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # deferred aur kabhi touch nahi hua
+            if field.attname not in loaded or _comparable(self.__dict__[field.attname]) != loaded[field.attname]:
+                dirty.add(field.name)
+        return dirty
+
     def save(self, *args, **kwargs):
+        adding = self._state.adding
+
         # 1. Slug & Org ID Logic (Tera Purana Logic - No Change)
         if not self.slug:
             self.slug = slugify(self.name)
@@ -207,9 +262,28 @@ class Organization(models.Model):
             unique_suffix = uuid.uuid4().hex[:6].upper()
             self.org_id = f"ORG-{current_year}-{unique_suffix}"
 
+        admin_changed = adding
+        if not adding and not kwargs.get('force_insert'):
+            dirty = self.get_dirty_fields()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                dirty &= {self._meta.get_field(name).name for name in update_fields}
+            if not dirty:
+                # Kuch badla hi nahi — na UPDATE, na signals, na admin queries
+                return
+            admin_changed = 'admin' in dirty
+            if update_fields is None:
+                # Sirf badle columns (+ updated_at, auto_now) — poori row dobara nahi likhni
+                kwargs['update_fields'] = dirty | {'updated_at'}
+
         # 2. Save Organization Record (Important: Pehle org save hogi)
         super().save(*args, **kwargs)
+        self._snapshot_loaded_values()
+
+        if admin_changed:
+            self._link_admin()
 
+    def _link_admin(self):
         # 3. [NEW] Auto SchoolAdmin Profile (Sirf ye extra add kiya hai safely)
         from organizations.models import SchoolAdmin
         SchoolAdmin.objects.get_or_create(
@@ -335,6 +409,7 @@ class SchoolAdmin(models.Model):
             models.Index(fields=["user", "organization"]),
             models.Index(fields=["is_active"]),
             models.Index(fields=["organization", "is_active"]),
+            models.Index(fields=["-created_at", "-id"]),  # ?pagination=cursor
         ]
 
         # Useful for permission checks in views / DRF
@@ -4,6 +4,7 @@ from django.db import transaction
 from django.core.validators import RegexValidator
 from .models import Organization, SchoolAdmin
 from normal_user.models import NormalUser
+from normal_user.images import ImageVariantsField
 from django.db import models # Q object ke liye zaroori hai
 
 class OrganizationSerializer(serializers.ModelSerializer):
@@ -118,13 +119,14 @@ class SchoolAdminUserSerializer(serializers.ModelSerializer):
 class OrganizationDetailSerializer(serializers.ModelSerializer):
     admin_custom_id = serializers.CharField(source='admin.admin_custom_id', read_only=True)
     status_display = serializers.CharField(source='is_verified_display', read_only=True) # Ye naya!
+    logo_variants = ImageVariantsField(source='logo')
 
     class Meta:
         model = Organization
         # Saare fields jo tumne models.py mein likhe hain (Explicitly)
         fields = [
             'id', 'admin_custom_id', 'status_display', 'name', 'slug', 'org_id', 'registration_number', 'org_type',
-            'affiliation_board', 'logo', 'description', 'address', 'phone_number',
+            'affiliation_board', 'logo', 'logo_variants', 'description', 'address', 'phone_number',
             'contact_email', 'website', 'established_year', 'city', 'locality',
             'pincode', 'instruction_medium', 'gender_type', 'fee_category',
             'monthly_fees_min', 'has_transport', 'has_hostel', 'has_smart_class',
@@ -139,11 +141,12 @@ class OrganizationLoginSerializer(serializers.ModelSerializer):
     """Login response ko super light rakhne ke liye"""
     admin_custom_id = serializers.CharField(source='admin.admin_custom_id', read_only=True)
     status_display = serializers.CharField(source='is_verified_display', read_only=True)
+    logo_variants = ImageVariantsField(source='logo')
 
     class Meta:
         model = Organization
         fields = [
             'id', 'admin_custom_id', 'status_display', 'name', 
-            'org_id', 'affiliation_board', 'logo', 
+            'org_id', 'affiliation_board', 'logo', 'logo_variants',
             'contact_email', 'is_active', 'is_verified'
         ]
\ No newline at end of file
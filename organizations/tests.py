@@ -1,3 +1,253 @@
-from django.test import TestCase
+import csv
+import io
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .importer import ImportAborted, OrganizationImporter
+from .models import Organization, SchoolAdmin, _comparable
+
+User = get_user_model()
+
+
+def png(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), color).save(buffer, format="PNG")
+    return ContentFile(buffer.getvalue())
+
+
+class OrganizationDirtyFieldTests(TestCase):
+    """save() sirf badle columns likhta hai — par asli badlav kabhi skip nahi hona chahiye."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.org = Organization.objects.create(name="Dirty Field School", admin=cls.admin)
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def stored_logo(self):
+        return Organization.objects.values_list("logo", flat=True).get(pk=self.org.pk)
+
+    def test_unchanged_save_skips_query(self):
+        org = Organization.objects.get(pk=self.org.pk)
+        with self.assertNumQueries(0):
+            org.save()
+
+    def test_changed_field_is_written(self):
+        org = Organization.objects.get(pk=self.org.pk)
+        org.city = "Agra"
+        self.assertEqual(org.get_dirty_fields(), {"city"})
+        org.save()
+        self.assertEqual(Organization.objects.get(pk=org.pk).city, "Agra")
+
+    def test_repeated_logo_saves_are_written(self):
+        # FieldFile in-place badalta hai — snapshot mein wahi object hota toh dusra save skip ho jaata
+        org = Organization.objects.get(pk=self.org.pk)
+        org.logo.save("first.png", png("red"), save=True)
+        self.assertEqual(self.stored_logo(), org.logo.name)
+
+        first = org.logo.name
+        org.logo.save("second.png", png("blue"), save=True)
+        self.assertNotEqual(org.logo.name, first)
+        self.assertEqual(self.stored_logo(), org.logo.name)
+
+        with self.assertNumQueries(0):
+            org.save()
+
+    def test_new_upload_is_dirty(self):
+        org = Organization.objects.get(pk=self.org.pk)
+        org.logo = png("green")
+        org.logo.name = "logo.png"
+        self.assertIn("logo", org.get_dirty_fields())
+
+    def test_mutable_values_are_copied(self):
+        # JSON-style values: snapshot ke baad in-place edit bhi badlav hai
+        value = {"transport": ["bus"]}
+        snapshot = _comparable(value)
+        value["transport"].append("van")
+        self.assertNotEqual(_comparable(value), snapshot)
+
+
+# ────────────────────────────────────────────────
+# Bulk CSV import
+# ────────────────────────────────────────────────
+
+IMPORT_COLUMNS = (
+    "name", "city", "pincode", "registration_number", "org_type", "has_transport",
+    "admin_name", "admin_email", "admin_mobile", "admin_password",
+)
+
+
+def branch(name, pincode, mobile, email="", **extra):
+    row = {"name": name, "city": "Agra", "pincode": pincode, "admin_mobile": mobile, "admin_email": email}
+    row.update(extra)
+    return row
+
+
+def csv_text(rows, columns=IMPORT_COLUMNS):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, restval="")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+class OrganizationImporterTests(TestCase):
+    """CSV rows: line number ke saath errors, file + DB ke across duplicates, chunk boundaries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.existing_admin = User.objects.create_user(
+            username="owner", email="owner@example.com", password="x", mobile="9000000000",
+        )
+        Organization.objects.create(name="Old School", admin=cls.existing_admin, registration_number="REG-OLD")
+
+    def run_import(self, rows, **options):
+        importer = OrganizationImporter(**options)
+        with self.captureOnCommitCallbacks(execute=True):
+            return importer.run(io.StringIO(csv_text(rows)))
+
+    @staticmethod
+    def errors(report):
+        return {error["row"]: sorted(error["errors"]) for error in report["errors"]}
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        report = self.run_import([
+            branch("Good School", "282001", "9100000001", "good@example.com", has_transport="haan"),
+            branch("Bad Mobile", "282002", "12ab"),
+            branch("Bad Email", "282003", "9100000003", "not-an-email"),
+            branch("Short Password", "282004", "9100000004", "short@example.com", admin_password="abc"),
+            branch("Bad Pincode", "28", "9100000005", "pin@example.com"),
+            branch("Bad Flag", "282006", "9100000006", "flag@example.com", has_transport="maybe"),
+            branch("Bad Type", "282007", "9100000007", "type@example.com", org_type="temple"),
+            branch("", "282008", "9100000008", "noname@example.com"),
+            branch("No Email", "282009", "9100000009"),
+        ])
+        self.assertEqual(self.errors(report), {
+            3: ["admin_mobile"],
+            4: ["admin_email"],
+            5: ["admin_password"],
+            6: ["pincode"],
+            7: ["has_transport"],
+            8: ["org_type"],
+            9: ["name"],
+            10: ["admin_email"],
+        })
+        self.assertEqual((report["total_rows"], report["created_organizations"], report["error_count"]), (9, 1, 8))
+
+        org = Organization.objects.get(name="Good School")
+        self.assertTrue(org.has_transport)
+        self.assertEqual(org.admin.email, "good@example.com")
+        self.assertEqual(org.admin.role, User.Roles.SCHOOL_ADMIN)
+        self.assertFalse(org.admin.has_usable_password())
+        self.assertTrue(SchoolAdmin.objects.filter(user=org.admin, organization=org).exists())
+
+    def test_duplicates_and_existing_admins(self):
+        report = self.run_import([
+            branch("DPS", "282001", "9100000001", "chain@example.com", registration_number="REG-1"),
+            branch("DPS", "282002", "9100000001", "chain@example.com"),
+            branch("dps", "282001", "9100000002", "other@example.com"),
+            branch("Another", "282003", "9100000003", "third@example.com", registration_number="reg-1"),
+            branch("Renamed Old", "282004", "9100000004", "fourth@example.com", registration_number="REG-OLD"),
+            branch("Owner's Second", "282005", "9000000000"),
+            branch("Clash", "282006", "9000000000", "chain@example.com"),
+        ])
+        self.assertEqual(self.errors(report), {
+            4: ["name"],
+            5: ["registration_number"],
+            6: ["registration_number"],
+            8: ["admin_email"],
+        })
+        self.assertEqual(
+            (report["created_organizations"], report["created_users"], report["reused_users"]), (3, 1, 1),
+        )
+
+        # Chain ki do branches — ek hi admin, slugs alag
+        branches = Organization.objects.filter(name="DPS")
+        self.assertEqual(branches.values("admin").distinct().count(), 1)
+        self.assertEqual(len({org.slug for org in branches}), 2)
+        self.assertEqual(User.objects.filter(mobile="9100000001").count(), 1)
+
+        # Existing user (mobile se mila) reuse hua — naya user nahi
+        second = Organization.objects.get(name="Owner's Second")
+        self.assertEqual(second.admin_id, self.existing_admin.pk)
+        self.assertEqual(User.objects.get(pk=self.existing_admin.pk).role, User.Roles.SCHOOL_ADMIN)
+
+    def test_chunk_boundaries(self):
+        rows = [
+            branch("Alpha", "282001", "9100000001", "shared@example.com"),
+            branch("Beta", "282002", "9100000002", "beta@example.com"),
+            branch("Gamma", "282003", "9100000003", "gamma@example.com"),
+            branch("Delta", "282004", "9100000001", "shared@example.com"),  # pehle chunk wala admin
+            branch("alpha", "282001", "9100000005", "dup@example.com"),     # pehle chunk wali branch
+        ]
+        dry = self.run_import(rows, chunk_size=2, dry_run=True)
+        self.assertFalse(Organization.objects.filter(name="Alpha").exists())
+
+        report = self.run_import(rows, chunk_size=2)
+        for key in ("total_rows", "created_organizations", "created_users", "error_count"):
+            self.assertEqual(dry[key], report[key], key)
+        self.assertEqual((report["created_organizations"], report["created_users"]), (4, 3))
+        self.assertEqual(self.errors(report), {6: ["name"]})
+        self.assertEqual(
+            Organization.objects.get(name="Alpha").admin_id, Organization.objects.get(name="Delta").admin_id,
+        )
+
+    def test_missing_headers_abort(self):
+        with self.assertRaises(ImportAborted):
+            OrganizationImporter().run(io.StringIO(csv_text([{"name": "X"}], columns=("name", "city"))))
+
+
+class ImportOrganizationsCommandTests(TestCase):
+
+    def write_csv(self, text):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", encoding="utf-8-sig", newline="") as stream:
+            stream.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_command_imports_and_reports(self):
+        path = self.write_csv(csv_text([
+            branch("Command School", "282001", "9100000001", "cmd@example.com", admin_password="long-password"),
+            branch("Broken", "282002", "123"),
+        ]))
+        out = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_organizations", path, "--chunk-size=1", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("Row 3: admin_mobile", output)
+        self.assertIn("2 rows: 1 organizations, 1 naye admins, 0 existing admins, 1 errors.", output)
+        admin = Organization.objects.get(name="Command School").admin
+        self.assertTrue(admin.check_password("long-password"))
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write_csv(csv_text([branch("Dry School", "282001", "9100000001", "dry@example.com")]))
+        out = io.StringIO()
+        call_command("import_organizations", path, "--dry-run", stdout=out)
+        self.assertIn("DRY RUN", out.getvalue())
+        self.assertFalse(Organization.objects.exists())
+
+    def test_bad_input_raises_command_error(self):
+        with self.assertRaises(CommandError):
+            call_command("import_organizations", self.write_csv("city\nAgra\n"), stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command("import_organizations", "/nonexistent/file.csv", stdout=io.StringIO())
+        path = self.write_csv(csv_text([branch("X", "282001", "9100000001", "x@example.com")]))
+        with self.assertRaises(CommandError):
+            call_command("import_organizations", path, "--created-by=ghost", stdout=io.StringIO())
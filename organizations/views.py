@@ -1,4 +1,5 @@
 #views.py
+import io
 import logging
 from django.db import transaction
 from django.shortcuts import get_object_or_404
@@ -7,8 +8,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.pagination import PageNumberPagination
+from normal_user.pagination import OptionalKeysetPagination
+from rest_framework.parsers import MultiPartParser
 from rest_framework.throttling import UserRateThrottle, ScopedRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
+from search.filters import FullTextSearchFilter
+from .importer import ImportAborted, OrganizationImporter
 from .models import Organization, SchoolAdmin
 from .serializers import OrganizationSerializer, SchoolAdminProfileSerializer
 from django.contrib.auth import get_user_model
@@ -33,6 +38,11 @@ class StandardPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+
+class OptionalCursorPagination(OptionalKeysetPagination):
+    # ?pagination=cursor -> (created_at, id) keyset, bina COUNT/OFFSET
+    page_number_class = StandardPagination
+
 # ────────────────────────────────────────────────
 # 2. Organization ViewSet (The Core Hub)
 # ────────────────────────────────────────────────
@@ -44,12 +54,14 @@ class OrganizationViewSet(viewsets.ModelViewSet):
     - Security: Throttled, logged, and atomic updates.
     """
     serializer_class = OrganizationSerializer
-    pagination_class = StandardPagination
+    pagination_class = OptionalCursorPagination
     throttle_classes = [UserRateThrottle, ScopedRateThrottle]
     throttle_scope = 'organization_api'
     
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'registration_number', 'domain']
+    # ?search= FTS5 index se (bm25 rank); FullTextSearchFilter OrderingFilter ke baad hi rehna chahiye
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    search_index = 'organization'
+    search_fields = ['name', 'registration_number', 'org_id', 'city']   # fallback (non-SQLite)
     ordering_fields = ['created_at', 'name', 'updated_at']
     ordering = ['-created_at']
 
@@ -64,8 +76,8 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         return OrganizationSerializer
     
     def get_permissions(self):
-        # 'create' aur 'destroy' sirf Super-Admin (staff) ke liye rakho
-        if self.action in ['create', 'destroy']:
+        # 'create', 'destroy' aur bulk import sirf Super-Admin (staff) ke liye rakho
+        if self.action in ['create', 'destroy', 'bulk_import']:
             return [permissions.IsAdminUser()]
         
         # 'update' aur 'partial_update' principal bhi kar sakega (agar uska school hai)
@@ -117,7 +129,57 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         # Agar models mein 'updated_by' nahi hai, toh sirf save() likho
         serializer.save() 
         logger.info(f"Organization ID: {serializer.instance.id} updated by User: {self.request.user.id}")
-    
+
+    @action(detail=False, methods=['post'], url_path='bulk-import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        POST /api/v1/organizations/bulk-import/  (multipart: file=<branches.csv>, dry_run=true|false)
+
+        Chain ki saari branches + unke admins ek CSV se. Galat rows skip hoti hain
+        aur response mein row number ke saath errors aate hain; baaki rows ban jaati hain.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Bhai, CSV file 'file' field mein bhejo."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        importer = OrganizationImporter(created_by=request.user, dry_run=dry_run)
+        try:
+            # Upload ko stream ki tarah padho — poori file memory mein decode nahi hoti
+            report = importer.run(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+        except ImportAborted as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except UnicodeDecodeError:
+            return Response({"error": "Bhai, file UTF-8 CSV honi chahiye."}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(
+            f"Bulk import by User {request.user.id}: {report['created_organizations']} orgs, "
+            f"{report['error_count']} row errors (dry_run={dry_run})"
+        )
+        if report['created_organizations'] == 0 and report['error_count']:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'], url_path='fee-dashboard')
+    def fee_dashboard(self, request, pk=None):
+        """
+        GET /api/v1/organizations/<id>/fee-dashboard/?days=30
+
+        Outstanding / overdue, aging buckets, din-wise collection aur top defaulters —
+        sab materialized ledger tables se (students.fee_ledger), fees scan nahi.
+        """
+        from students.fee_ledger import DEFAULT_DASHBOARD_DAYS, organization_dashboard
+
+        organization = get_object_or_404(Organization, pk=pk)
+        user = request.user
+        if not (user.is_staff or user.school_admin_profile.filter(organization=organization, is_active=True).exists()):
+            raise PermissionDenied("Bhai, sirf is school ke admin fee dashboard dekh sakte hain.")
+        try:
+            days = int(request.query_params.get('days', DEFAULT_DASHBOARD_DAYS))
+        except ValueError:
+            days = DEFAULT_DASHBOARD_DAYS
+        return Response(organization_dashboard(organization, days))
+
 # ────────────────────────────────────────────────
 # 3. SchoolAdminProfile ViewSet (Profile Management)
 # ────────────────────────────────────────────────
@@ -128,7 +190,7 @@ class SchoolAdminViewSet(viewsets.ModelViewSet):
     - User: Strict ownership (can only view/manage their own profile).
     """
     serializer_class = SchoolAdminProfileSerializer
-    pagination_class = StandardPagination
+    pagination_class = OptionalCursorPagination
     throttle_classes = [UserRateThrottle, ScopedRateThrottle]
     throttle_scope = 'profile_api'
     
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parents', '0001_initial'),
+        ('students', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parentstudentlink',
+            index=models.Index(fields=['parent', 'status', '-created_at', '-id'], name='parents_par_parent__dcdd08_idx'),
+        ),
+    ]
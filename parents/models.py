@@ -108,4 +108,8 @@ class ParentStudentLink(models.Model):
     class Meta:
         verbose_name = _("Parent Student Link")
         verbose_name_plural = _("Parent Student Links")
-        unique_together = ('parent', 'student') # Taki duplicate link na bane
\ No newline at end of file
+        unique_together = ('parent', 'student') # Taki duplicate link na bane
+        indexes = [
+            # my-children keyset pagination (?pagination=cursor)
+            models.Index(fields=['parent', 'status', '-created_at', '-id']),
+        ]
\ No newline at end of file
@@ -9,6 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from rest_framework.pagination import PageNumberPagination
+from normal_user.pagination import OptionalKeysetPagination
 from rest_framework.throttling import UserRateThrottle
 from django.db.models import Q
 
@@ -16,6 +17,7 @@ from django.db.models import Q
 from django.contrib.auth import get_user_model
 User = get_user_model()
 
+from normal_user.phonetic import phonetic_name_q
 from students.models import StudentProfile
 from .models import ParentProfile, ParentStudentLink
 from .serializers import (
@@ -36,6 +38,12 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class ChildrenPagination(OptionalKeysetPagination):
+    # ?pagination=cursor -> (created_at, id) keyset, bina COUNT/OFFSET
+    page_number_class = StandardResultsSetPagination
+    deferred_join = True  # select_related wali rows sirf us page ke pks ke liye
+
+
 # ────────────────────────────────────────────────
 # Permissions
 # ────────────────────────────────────────────────
@@ -63,7 +71,7 @@ class ParentViewSet(viewsets.GenericViewSet):
     queryset = ParentProfile.objects.all()
     serializer_class = ParentProfileDetailSerializer
     permission_classes = [permissions.IsAuthenticated, IsParent]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ChildrenPagination
     throttle_classes = [UserRateThrottle]
 
     # ────────────────────────────────────────────────
@@ -106,12 +114,18 @@ class ParentViewSet(viewsets.GenericViewSet):
     # ────────────────────────────────────────────────
     @action(detail=False, methods=["GET"], url_path="search-student")
     def search_student(self, request):
-        query = request.query_params.get("q")
+        query = (request.query_params.get("q") or "").strip()
         if not query:
-            raise ValidationError({"detail": "Please provide mobile number or student ID to search."})
+            raise ValidationError({"detail": "Please provide mobile number, student ID or name to search."})
+
+        match = Q(user__mobile=query) | Q(student_unique_id=query)
+        # Naam se bhi — phonetic key pe exact (indexed) lookup, spelling farak chalega
+        sounds_like = phonetic_name_q(query, prefix="user__")
+        if sounds_like is not None:
+            match |= sounds_like
 
         students_qs = StudentProfile.objects.filter(
-            Q(user__mobile=query) | Q(student_unique_id=query),
+            match,
             is_active=True
         ).select_related("user", "organization")[:50]  # limit for performance
 
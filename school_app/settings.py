@@ -49,6 +49,8 @@ INSTALLED_APPS = [
     'parents',
     'students_classroom',
     'attendance', 
+    'school_directory',
+    'search',
 ]
 
 # MIDDLEWARE - CORS sabse upar hona chahiye
@@ -92,6 +94,37 @@ DATABASES = {
     }
 }
 
+# Cache
+# - default: process-local (throttling, short-TTL read-through caches).
+# - shared: sab processes (gunicorn workers, management commands) mein SAME —
+#   directory / geo index ke change-log + versions aur teacher access-set
+#   versions isi pe hain. LocMem yahan nahi chalega (har process ka alag).
+# REDIS_URL ho toh dono Redis pe; warna shared = DB table (migrate se banti hai).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'shared',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        },
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -19,6 +19,7 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from normal_user.views import serve_blob
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -38,6 +39,9 @@ urlpatterns = [
     
     path('api/v1/teachers/', include('teachers.urls')),
 
+    # Parent-facing school search (facets)
+    path('api/v1/directory/', include('school_directory.urls')),
+
     # Auth
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
@@ -50,4 +54,7 @@ urlpatterns = [
     ),
     path('api/v1/exams/', include('exams.urls')),
     path('api/v1/attendance/', include('attendance.urls')),
+
+    # Content-addressed uploads (logo / profile pics) — immutable cache + Range
+    path('media/blobs/<path:name>', serve_blob, name='media-blob'),
 ]
\ No newline at end of file
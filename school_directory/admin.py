@@ -1,3 +1,11 @@
 from django.contrib import admin
 
+from .models import PincodeLocation
+
 # Register your models here.
+
+@admin.register(PincodeLocation)
+class PincodeLocationAdmin(admin.ModelAdmin):
+    list_display = ('pincode', 'office_name', 'district', 'state', 'latitude', 'longitude')
+    list_filter = ('state',)
+    search_fields = ('pincode', 'district', 'office_name')
@@ -3,3 +3,19 @@ from django.apps import AppConfig
 
 class SchoolDirectoryConfig(AppConfig):
     name = 'school_directory'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .signals import organization_changed, tutor_changed
+
+        # Organization save/delete -> directory index ka change-log
+        post_save.connect(organization_changed, sender='organizations.Organization',
+                          dispatch_uid='school_directory.organization_saved')
+        post_delete.connect(organization_changed, sender='organizations.Organization',
+                            dispatch_uid='school_directory.organization_deleted')
+
+        # Tutor ke service areas -> "near me" proximity grid
+        post_save.connect(tutor_changed, sender='teachers.Teacher',
+                          dispatch_uid='school_directory.tutor_saved')
+        post_delete.connect(tutor_changed, sender='teachers.Teacher',
+                            dispatch_uid='school_directory.tutor_deleted')
@@ -0,0 +1,242 @@
+"""
+"Schools / tutors near me" — offline proximity search.
+
+- Location: PincodeLocation table (bundled CSV / India Post directory). School
+  ka `pincode` na mile toh uski city ka centroid (us district ke pincodes ka
+  average). Tutors ke `service_areas` mein pincodes ya city naam — har ek ek point.
+- Grid index: 0.1° (~11 km) cells. Query ke radius wale cells ke candidates hi
+  dekhe jaate hain, phir unpe vectorized haversine (numpy; na ho toh plain loop).
+- Refresh: Organization/Teacher/pincode change -> `shared_cache` version bump ->
+  har process agli query pe rebuild (MIN_REBUILD_INTERVAL se zyada baar nahi).
+  Bump na aaye (queryset.update / bulk_create) tab bhi MAX_INDEX_AGE ke baad
+  rebuild.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.db.models import Avg
+
+from normal_user.cache import shared_cache
+
+try:
+    import numpy as np
+except ImportError:  # numpy optional hai — bina uske pure-Python fallback
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEGREES = 0.1
+KM_PER_DEGREE = 111.32
+MAX_RADIUS_KM = 100
+
+GEO_VERSION_KEY = "directory:geo-version"
+MIN_REBUILD_INTERVAL = 5  # seconds
+MAX_INDEX_AGE = 5 * 60  # seconds
+
+KIND_SCHOOL = "school"
+KIND_TUTOR = "tutor"
+KINDS = (KIND_SCHOOL, KIND_TUTOR)
+
+# Tutors jo ghar/center pe padhate hain; pure online wale location se match nahi hote
+TUTOR_MODES = ("offline", "hybrid")
+
+
+def _normalize_place(value):
+    return " ".join(str(value or "").split()).casefold()
+
+
+def _cell(lat, lon):
+    return (math.floor(lat / CELL_DEGREES), math.floor(lon / CELL_DEGREES))
+
+
+def haversine_km(lat, lon, lats, lons):
+    """
+    (lat, lon) se har candidate ki doori km mein. lats/lons radians mein;
+    numpy arrays ho toh ek hi vectorized pass.
+    """
+    lat, lon = math.radians(lat), math.radians(lon)
+    if np is not None:
+        dlat = lats - lat
+        dlon = lons - lon
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat) * np.cos(lats) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    cos_lat = math.cos(lat)
+    out = []
+    for p_lat, p_lon in zip(lats, lons):
+        a = math.sin((p_lat - lat) / 2) ** 2 + cos_lat * math.cos(p_lat) * math.sin((p_lon - lon) / 2) ** 2
+        out.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+    return out
+
+
+def bump_geo_version():
+    shared_cache.add(GEO_VERSION_KEY, 0, timeout=None)
+    try:
+        shared_cache.incr(GEO_VERSION_KEY)
+    except ValueError:
+        shared_cache.set(GEO_VERSION_KEY, 1, timeout=None)
+
+
+class GeoIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._seen_version = None
+        self._built_at = 0.0
+        self.pincodes = {}
+
+    # ── Building ──────────────────────────────────────────────────────
+    def _load_places(self):
+        from .models import PincodeLocation
+
+        pincodes = {
+            pin: (lat, lon)
+            for pin, lat, lon in PincodeLocation.objects.values_list("pincode", "latitude", "longitude")
+        }
+        # City naam -> district centroid; "Delhi" jaise naam jo sirf state level
+        # pe milte hain unke liye state centroid (district wala pehle jeetta hai)
+        cities = {}
+        for column in ("state", "district"):
+            rows = (
+                PincodeLocation.objects.exclude(**{column: ""})
+                .values(column)
+                .annotate(lat=Avg("latitude"), lon=Avg("longitude"))
+                .order_by()
+            )
+            for row in rows:
+                cities[_normalize_place(row[column])] = (row["lat"], row["lon"])
+        return pincodes, cities
+
+    def rebuild(self):
+        from organizations.models import Organization
+        from teachers.models import Teacher
+
+        with self._lock:
+            version = shared_cache.get(GEO_VERSION_KEY, 0)
+            pincodes, cities = self._load_places()
+
+            kinds, refs, lats, lons, precision = [], [], [], [], []
+
+            def add(kind, ref, point, how):
+                kinds.append(kind)
+                refs.append(ref)
+                lats.append(point[0])
+                lons.append(point[1])
+                precision.append(how)
+
+            schools = Organization.objects.filter(is_active=True).values_list("id", "pincode", "city")
+            for org_id, pincode, city in schools.iterator(chunk_size=5000):
+                pincode = (pincode or "").strip()
+                if pincode in pincodes:
+                    add(KIND_SCHOOL, org_id, pincodes[pincode], "pincode")
+                elif _normalize_place(city) in cities:
+                    add(KIND_SCHOOL, org_id, cities[_normalize_place(city)], "city")
+
+            tutors = Teacher.objects.filter(
+                is_active_teacher=True, preferred_mode__in=TUTOR_MODES,
+            ).values_list("id", "service_areas")
+            for teacher_id, areas in tutors.iterator(chunk_size=5000):
+                seen = set()
+                for area in areas if isinstance(areas, list) else []:
+                    area = str(area).strip()
+                    if area.isdigit() and area in pincodes:
+                        point, how = pincodes[area], "pincode"
+                    elif _normalize_place(area) in cities:
+                        point, how = cities[_normalize_place(area)], "city"
+                    else:
+                        continue
+                    if point not in seen:
+                        seen.add(point)
+                        add(KIND_TUTOR, teacher_id, point, how)
+
+            grid = defaultdict(list)
+            for index, (lat, lon) in enumerate(zip(lats, lons)):
+                grid[_cell(lat, lon)].append(index)
+
+            if np is not None:
+                self.lats = np.radians(np.asarray(lats, dtype=np.float64))
+                self.lons = np.radians(np.asarray(lons, dtype=np.float64))
+                self.grid = {cell: np.asarray(idx, dtype=np.int64) for cell, idx in grid.items()}
+            else:
+                self.lats = [math.radians(v) for v in lats]
+                self.lons = [math.radians(v) for v in lons]
+                self.grid = dict(grid)
+            self.kinds, self.refs, self.precision = kinds, refs, precision
+            self.pincodes = pincodes
+            self._seen_version = version
+            self._built_at = time.monotonic()
+            self._built = True
+
+    def sync(self):
+        if not self._built:
+            self.rebuild()
+            return
+        age = time.monotonic() - self._built_at
+        if age >= MAX_INDEX_AGE or (
+            age >= MIN_REBUILD_INTERVAL and shared_cache.get(GEO_VERSION_KEY, 0) != self._seen_version
+        ):
+            self.rebuild()
+
+    # ── Querying ──────────────────────────────────────────────────────
+    def locate(self, pincode):
+        self.sync()
+        return self.pincodes.get((pincode or "").strip())
+
+    def _candidates(self, lat, lon, radius_km):
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        lo_lat, lo_lon = _cell(lat - lat_span, lon - lon_span)
+        hi_lat, hi_lon = _cell(lat + lat_span, lon + lon_span)
+        found = [
+            self.grid[(i, j)]
+            for i in range(lo_lat, hi_lat + 1)
+            for j in range(lo_lon, hi_lon + 1)
+            if (i, j) in self.grid
+        ]
+        if np is not None:
+            return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+        return [index for chunk in found for index in chunk]
+
+    def nearby(self, lat, lon, radius_km, kinds=KINDS, limit=50):
+        """
+        [(kind, ref_id, distance_km, precision)] doori ke order mein. Ek tutor
+        ke kai service points hon toh sabse paas wala hi gina jata hai.
+        """
+        self.sync()
+        with self._lock:
+            candidates = self._candidates(lat, lon, radius_km)
+            if len(candidates) == 0:
+                return []
+
+            if np is not None:
+                distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+                inside = distances <= radius_km
+                candidates, distances = candidates[inside], distances[inside]
+                order = np.argsort(distances, kind="stable")
+                ranked = zip(candidates[order].tolist(), distances[order].tolist())
+            else:
+                distances = haversine_km(
+                    lat, lon,
+                    [self.lats[i] for i in candidates],
+                    [self.lons[i] for i in candidates],
+                )
+                ranked = sorted(
+                    ((i, d) for i, d in zip(candidates, distances) if d <= radius_km),
+                    key=lambda item: item[1],
+                )
+
+            hits, seen = [], set()
+            for index, distance in ranked:
+                kind = self.kinds[index]
+                key = (kind, self.refs[index])
+                if kind not in kinds or key in seen:
+                    continue
+                seen.add(key)
+                hits.append((kind, self.refs[index], round(distance, 2), self.precision[index]))
+                if len(hits) >= limit:
+                    break
+            return hits
+
+
+geo_index = GeoIndex()
@@ -0,0 +1,486 @@
+"""
+In-memory bitmap index for the parent-facing school directory.
+
+Har active Organization ko ek "slot" (0..n) milta hai. Har facet value ke liye
+ek bitset hai — Python ka int, jiska bit `slot` set hai agar school us value
+mein aata hai. Filter = bitsets ka AND/OR, facet count = `(mask & bitset).bit_count()`.
+50k schools = ~6 KB per bitset, toh poora index kuch MB mein aa jata hai.
+
+Refresh:
+- Process start ke baad pehli query pe full build (ek DB query).
+- Organization save/delete -> on_commit signal shared cache mein change-log
+  entry likhta hai (version counter + changed id). Har process agli query pe
+  apne version se aage ki entries padh ke sirf wahi schools reload karta hai.
+- Log entry cache se gayab (eviction) mili toh full rebuild.
+- Change-log `shared_cache` (settings.CACHES["shared"]) pe hai — sab processes ka ek.
+  Phir bhi koi change chhoot jaye (bulk queryset.update signal nahi bhejta,
+  DB cache ka incr atomic nahi) toh MAX_INDEX_AGE ke baad full rebuild —
+  staleness ki upper limit.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from django.core.files.storage import default_storage
+
+from normal_user.cache import shared_cache
+
+# ── Dimensions ─────────────────────────────────────────────────────────
+# Single-valued: har school ki ek value. "amenities" multi-valued hai.
+DIMENSIONS = (
+    "city", "locality", "pincode", "board", "medium",
+    "gender", "fee_category", "fee_band", "org_type", "amenities",
+)
+
+# Multi-valued dimension mein selected values AND hoti hain
+# (transport + hostel = dono chahiye); baaki sab mein OR.
+AND_DIMENSIONS = {"amenities"}
+
+AMENITY_FIELDS = {
+    "transport": "has_transport",
+    "hostel": "has_hostel",
+    "smart_class": "has_smart_class",
+    "library": "has_library",
+    "playground": "has_playground",
+}
+
+# monthly_fees_min -> band (upper bound exclusive)
+FEE_BANDS = (
+    ("under_1000", 0, 1000),
+    ("1000_2500", 1000, 2500),
+    ("2500_5000", 2500, 5000),
+    ("5000_10000", 5000, 10000),
+    ("10000_plus", 10000, None),
+)
+
+# Derived dimensions ke display labels (baaki labels data se aate hain)
+STATIC_LABELS = {
+    "fee_band": {
+        "under_1000": "Under ₹1,000",
+        "1000_2500": "₹1,000 – ₹2,500",
+        "2500_5000": "₹2,500 – ₹5,000",
+        "5000_10000": "₹5,000 – ₹10,000",
+        "10000_plus": "₹10,000+",
+    },
+    "amenities": {
+        "transport": "Transport",
+        "hostel": "Hostel",
+        "smart_class": "Smart Classes",
+        "library": "Library",
+        "playground": "Playground",
+    },
+}
+
+CHANGE_VERSION_KEY = "directory:change-version"
+CHANGE_ENTRY_KEY = "directory:change:{}"
+CHANGE_ENTRY_TTL = 60 * 60 * 24
+MAX_INDEX_AGE = 5 * 60  # seconds
+
+# (dimension, Organization field) — ek school ki ek hi value
+_SINGLE_SOURCES = (
+    ("city", "city"),
+    ("locality", "locality"),
+    ("pincode", "pincode"),
+    ("board", "affiliation_board"),
+    ("medium", "instruction_medium"),
+    ("gender", "gender_type"),
+    ("fee_category", "fee_category"),
+    ("org_type", "org_type"),
+)
+
+_LOAD_FIELDS = (
+    "id", "name", "slug", "org_type", "affiliation_board", "logo", "city",
+    "locality", "pincode", "instruction_medium", "gender_type", "fee_category",
+    "monthly_fees_min", "is_verified",
+) + tuple(AMENITY_FIELDS.values())
+
+
+def normalize_value(value):
+    """'  Agra ' / 'AGRA' / 'agra' sab ek hi facet value."""
+    if value is None:
+        return ""
+    return _normalize(str(value))
+
+
+# City/board jaisi values hazaaron baar repeat hoti hain — build time mostly yahi tha
+@lru_cache(maxsize=65536)
+def _normalize(text):
+    return " ".join(text.split()).casefold()
+
+
+@lru_cache(maxsize=65536)
+def _label(text):
+    return " ".join(text.split())
+
+
+def fee_band_for(amount):
+    if amount is None:
+        return ""
+    for band, low, high in FEE_BANDS:
+        if amount >= low and (high is None or amount < high):
+            return band
+    return ""
+
+
+def iter_bits(mask):
+    """Set bits ke positions (ascending). Byte-wise, taaki 50k bits pe bhi fast rahe."""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8 or 1, "little")
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index * 8
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+_BYTE_BITS = tuple(tuple(i for i in range(8) if b >> i & 1) for b in range(256))
+
+
+def _bits_from_slots(slots, size):
+    buffer = bytearray((size + 7) // 8)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class DirectoryIndex:
+    # Itne se zyada out-of-order (incremental) slots ho jaayein toh agli sync pe rebuild
+    MAX_DIRTY_RATIO = 0.05
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0
+        self._seen_version = 0
+        self._reset()
+
+    def _reset(self):
+        self.slot_of = {}            # org id -> slot
+        self.cards = []              # slot -> card dict (None = free)
+        self.sort_keys = []          # slot -> (not verified, name)
+        self.values_of = []          # slot -> {dim: tuple(keys)}
+        self.single = {dim: [] for dim in DIMENSIONS if dim not in AND_DIMENSIONS}  # slot -> key
+        self.free_slots = []
+        self.alive = 0
+        self.bitsets = {dim: defaultdict(int) for dim in DIMENSIONS}
+        self.labels = {dim: {} for dim in DIMENSIONS}
+        # Rebuild slots ko sort order mein deta hai; baad mein add hue slots "dirty"
+        # hain (order se bahar) aur page banate waqt alag se merge hote hain.
+        self.dirty = set()
+        self._full_facets = {}       # dim -> (counts, ranked) bina filter ke
+
+    # ── Building ──────────────────────────────────────────────────────
+    @staticmethod
+    def _queryset():
+        from organizations.models import Organization
+        return Organization.objects.filter(is_active=True).order_by().values(*_LOAD_FIELDS)
+
+    @staticmethod
+    def _facet_values(row):
+        """
+        ({dim: tuple(keys)}, [(dim, key, raw_label)]). Build ka hot path hai,
+        isliye seedha-seedha likha hai (sets/dicts kam).
+        """
+        values, labels = {}, []
+        for dim, field in _SINGLE_SOURCES:
+            item = row[field]
+            key = _normalize(item) if item else ""
+            if key:
+                values[dim] = (key,)
+                labels.append((dim, key, item))
+            else:
+                values[dim] = ()
+        band = fee_band_for(row["monthly_fees_min"])
+        values["fee_band"] = (band,) if band else ()
+        values["amenities"] = tuple(name for name, field in AMENITY_FIELDS.items() if row[field])
+        return values, labels
+
+    @staticmethod
+    def _card(row):
+        logo = row["logo"]
+        return {
+            "id": str(row["id"]),
+            "name": row["name"],
+            "slug": row["slug"],
+            "org_type": row["org_type"],
+            "board": row["affiliation_board"],
+            "city": row["city"],
+            "locality": row["locality"],
+            "pincode": row["pincode"],
+            "instruction_medium": row["instruction_medium"],
+            "gender_type": row["gender_type"],
+            "fee_category": row["fee_category"],
+            "monthly_fees_min": row["monthly_fees_min"],
+            "amenities": [name for name, field in AMENITY_FIELDS.items() if row[field]],
+            "is_verified": row["is_verified"],
+            "logo": default_storage.url(logo) if logo else None,
+        }
+
+    @staticmethod
+    def _sort_key(row):
+        # Verified schools pehle, phir naam se
+        return (not row["is_verified"], normalize_value(row["name"]))
+
+    def _store(self, slot, row, values, labels):
+        for dim, key, item in labels:
+            dim_labels = self.labels[dim]
+            if key not in dim_labels:
+                dim_labels[key] = _label(item)
+        for dim, column in self.single.items():
+            column[slot] = next(iter(values[dim]), None)
+        self.slot_of[row["id"]] = slot
+        self.cards[slot] = self._card(row)
+        self.sort_keys[slot] = self._sort_key(row)
+        self.values_of[slot] = values
+
+    def _add(self, row):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.cards)
+            self.cards.append(None)
+            self.sort_keys.append(None)
+            self.values_of.append(None)
+            for column in self.single.values():
+                column.append(None)
+
+        values, labels = self._facet_values(row)
+        bit = 1 << slot
+        for dim, keys in values.items():
+            bitsets = self.bitsets[dim]
+            for key in keys:
+                bitsets[key] |= bit
+        self._store(slot, row, values, labels)
+        self.alive |= bit
+        self.dirty.add(slot)
+        self._full_facets.clear()
+
+    def _remove(self, org_id):
+        slot = self.slot_of.pop(org_id, None)
+        if slot is None:
+            return
+        bit = 1 << slot
+        for dim, keys in self.values_of[slot].items():
+            bitsets = self.bitsets[dim]
+            for key in keys:
+                remaining = bitsets[key] & ~bit
+                if remaining:
+                    bitsets[key] = remaining
+                else:
+                    bitsets.pop(key, None)
+                    self.labels[dim].pop(key, None)
+        for column in self.single.values():
+            column[slot] = None
+        self.cards[slot] = None
+        self.sort_keys[slot] = None
+        self.values_of[slot] = None
+        self.alive &= ~bit
+        self.dirty.discard(slot)
+        self.free_slots.append(slot)
+        self._full_facets.clear()
+
+    def rebuild(self):
+        """
+        Full build, slots sort order mein. Bitsets ko bit-by-bit `|=` se nahi
+        banate (har baar poora int copy hota hai) — pehle har value ke slots
+        jama, phir ek bytearray se int.
+        """
+        with self._lock:
+            version = _current_version()
+            rows = sorted(self._queryset().iterator(chunk_size=5000), key=self._sort_key)
+            size = len(rows)
+
+            self._reset()
+            self.cards = [None] * size
+            self.sort_keys = [None] * size
+            self.values_of = [None] * size
+            for dim in self.single:
+                self.single[dim] = [None] * size
+
+            members = {dim: defaultdict(list) for dim in DIMENSIONS}
+            for slot, row in enumerate(rows):
+                values, labels = self._facet_values(row)
+                for dim, keys in values.items():
+                    for key in keys:
+                        members[dim][key].append(slot)
+                self._store(slot, row, values, labels)
+
+            self.alive = (1 << size) - 1
+            for dim, by_key in members.items():
+                for key, slots in by_key.items():
+                    self.bitsets[dim][key] = _bits_from_slots(slots, size)
+            self._seen_version = version
+            self._built_at = time.monotonic()
+            self._built = True
+
+    def apply_changes(self, org_ids):
+        """Sirf in schools ko DB se dobara padho (inactive/deleted = hata do)."""
+        org_ids = set(org_ids)
+        if not org_ids:
+            return
+        with self._lock:
+            rows = {row["id"]: row for row in self._queryset().filter(id__in=org_ids)}
+            for org_id in org_ids:
+                self._remove(org_id)
+                if org_id in rows:
+                    self._add(rows[org_id])
+
+    def _stale(self):
+        return not self._built or time.monotonic() - self._built_at >= MAX_INDEX_AGE
+
+    def sync(self):
+        """Shared change-log se catch up. Har query se pehle chalta hai (ek cache.get)."""
+        if self._stale():
+            with self._lock:
+                if self._stale():  # Dusre thread ne abhi rebuild kar diya ho
+                    self.rebuild()
+            return
+        version = _current_version()
+        if version == self._seen_version:
+            return
+        with self._lock:
+            if version == self._seen_version:
+                return
+            if version < self._seen_version:
+                # Cache flush hua — counter reset ho gaya
+                self.rebuild()
+                return
+            keys = [CHANGE_ENTRY_KEY.format(v) for v in range(self._seen_version + 1, version + 1)]
+            entries = shared_cache.get_many(keys)
+            if len(entries) != len(keys):
+                self.rebuild()
+                return
+            self.apply_changes(entries.values())
+            self._seen_version = version
+            if len(self.dirty) > self.MAX_DIRTY_RATIO * max(len(self.slot_of), 1):
+                self.rebuild()
+
+    # ── Querying ──────────────────────────────────────────────────────
+    def _dimension_mask(self, dim, selected):
+        bitsets = self.bitsets[dim]
+        if dim in AND_DIMENSIONS:
+            mask = -1
+            for key in selected:
+                mask &= bitsets.get(key, 0)
+            return mask
+        mask = 0
+        for key in selected:
+            mask |= bitsets.get(key, 0)
+        return mask
+
+    @staticmethod
+    def _rank(counts):
+        return sorted(((count, key) for key, count in counts.items() if count), key=lambda item: (-item[0], item[1]))
+
+    def _facet(self, dim, base):
+        """
+        (counts, ranked) — jo raasta sasta ho:
+        - base == alive (is dim ke bahar koi filter nahi) -> cached
+        - base mein kam schools, dim mein zyada values (pincode/locality) ->
+          base ke slots pe loop
+        - warna har value ke bitset se AND + bit_count
+        """
+        bitsets = self.bitsets[dim]
+        if base == self.alive:
+            cached = self._full_facets.get(dim)
+            if cached is None:
+                counts = {key: bits.bit_count() for key, bits in bitsets.items()}
+                cached = self._full_facets[dim] = (counts, self._rank(counts))
+            return cached
+
+        if base.bit_count() < len(bitsets):
+            if dim in self.single:
+                counts = Counter(map(self.single[dim].__getitem__, iter_bits(base)))
+                counts.pop(None, None)
+            else:
+                counts = Counter()
+                values_of = self.values_of
+                for slot in iter_bits(base):
+                    counts.update(values_of[slot][dim])
+        else:
+            counts = {key: (base & bits).bit_count() for key, bits in bitsets.items()}
+        return counts, self._rank(counts)
+
+    def _page(self, result, offset, limit):
+        """
+        Sorted page bina poora result sort kiye: in-order slots ascending bits se
+        aate hain (generator wahi ruk jata hai), dirty slots alag se merge.
+        """
+        wanted = offset + limit
+        dirty = [slot for slot in self.dirty if result >> slot & 1] if self.dirty else []
+        ordered = []
+        for slot in iter_bits(result):
+            if slot in self.dirty:
+                continue
+            ordered.append(slot)
+            if len(ordered) >= wanted:
+                break
+        if dirty:
+            ordered = sorted(ordered + dirty, key=self.sort_keys.__getitem__)
+        return [self.cards[slot] for slot in ordered[offset:wanted]]
+
+    def search(self, filters, offset=0, limit=20, facet_limit=50):
+        """
+        filters: {dim: [values]} — dims ke beech AND, ek dim ke andar OR
+        (amenities mein AND). Facets har dim ke liye us dim ka apna filter
+        chhod ke gine jaate hain, taaki "Agra" select karne ke baad bhi baaki
+        cities ke counts dikhein.
+        """
+        self.sync()
+        with self._lock:
+            selected = {
+                dim: {normalize_value(v) for v in values if normalize_value(v)}
+                for dim, values in filters.items()
+                if dim in self.bitsets
+            }
+            selected = {dim: keys for dim, keys in selected.items() if keys}
+            masks = {dim: self._dimension_mask(dim, keys) for dim, keys in selected.items()}
+
+            result = self.alive
+            for mask in masks.values():
+                result &= mask
+
+            facets = {}
+            for dim in DIMENSIONS:
+                base = self.alive
+                for other, mask in masks.items():
+                    if other != dim:
+                        base &= mask
+                counts, ranked = self._facet(dim, base)
+                chosen = selected.get(dim, set())
+                top = ranked[:facet_limit]
+                # Selected values hamesha dikhni chahiye, chahe count 0 ho ya top-N se bahar
+                shown = {key for _, key in top}
+                top += [(counts.get(key, 0), key) for key in sorted(chosen - shown)]
+                facets[dim] = [
+                    {
+                        "value": key,
+                        "label": self.labels[dim].get(key) or STATIC_LABELS.get(dim, {}).get(key, key),
+                        "count": count,
+                        "selected": key in chosen,
+                    }
+                    for count, key in top
+                ]
+
+            page = self._page(result, offset, limit)
+            total = result.bit_count()
+
+        return {"count": total, "results": page, "facets": facets}
+
+
+def _current_version():
+    return shared_cache.get(CHANGE_VERSION_KEY, 0)
+
+
+def record_change(org_id):
+    """Signal handler yahan aata hai (on_commit). Log entry + version bump."""
+    shared_cache.add(CHANGE_VERSION_KEY, 0, timeout=None)
+    try:
+        version = shared_cache.incr(CHANGE_VERSION_KEY)
+    except ValueError:
+        shared_cache.set(CHANGE_VERSION_KEY, 1, timeout=None)
+        version = 1
+    shared_cache.set(CHANGE_ENTRY_KEY.format(version), org_id, CHANGE_ENTRY_TTL)
+
+
+directory_index = DirectoryIndex()
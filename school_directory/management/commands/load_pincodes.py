@@ -0,0 +1,94 @@
+import csv
+from collections import defaultdict
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from school_directory.geo import bump_geo_version
+from school_directory.models import PincodeLocation
+
+BUNDLED_FILE = Path(__file__).resolve().parents[2] / "data" / "pincodes.csv"
+
+# India Post / data.gov.in files mein column naam alag-alag hote hain
+COLUMN_ALIASES = {
+    "pincode": ("pincode", "pin_code", "pin"),
+    "latitude": ("latitude", "lat"),
+    "longitude": ("longitude", "long", "lon", "lng"),
+    "office_name": ("officename", "office_name", "office"),
+    "district": ("district", "districtname", "district_name", "city"),
+    "state": ("statename", "state", "state_name"),
+}
+
+
+class Command(BaseCommand):
+    help = 'Offline pincode -> lat/long table load karta hai (default: bundled CSV)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', type=str, help='India Post pincode directory CSV ka path')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def _columns(self, header):
+        normalized = {name.strip().lower(): index for index, name in enumerate(header)}
+        columns = {}
+        for target, aliases in COLUMN_ALIASES.items():
+            columns[target] = next((normalized[a] for a in aliases if a in normalized), None)
+        missing = [c for c in ("pincode", "latitude", "longitude") if columns[c] is None]
+        if missing:
+            raise CommandError(f"Bhai, CSV mein ye columns nahi mile: {', '.join(missing)}")
+        return columns
+
+    def handle(self, *args, **options):
+        path = Path(options['file']) if options['file'] else BUNDLED_FILE
+        if not path.exists():
+            raise CommandError(f"File nahi mili: {path}")
+
+        # Ek pincode ke kai post offices hote hain -> coordinates ka average
+        points = defaultdict(list)
+        meta = {}
+        skipped = 0
+        with path.open(newline='', encoding='utf-8-sig') as handle:
+            rows = csv.reader(line for line in handle if not line.startswith('#'))
+            columns = self._columns(next(rows))
+            for row in rows:
+                def cell(name):
+                    index = columns[name]
+                    return row[index].strip() if index is not None and index < len(row) else ''
+
+                pincode = cell('pincode')
+                try:
+                    lat, lon = float(cell('latitude')), float(cell('longitude'))
+                except ValueError:
+                    skipped += 1
+                    continue
+                if len(pincode) != 6 or not pincode.isdigit() or not (6 <= lat <= 38 and 68 <= lon <= 98):
+                    skipped += 1
+                    continue
+                points[pincode].append((lat, lon))
+                meta.setdefault(pincode, (cell('office_name'), cell('district').title(), cell('state').title()))
+
+        objs = []
+        for pincode, coords in points.items():
+            office, district, state = meta[pincode]
+            objs.append(PincodeLocation(
+                pincode=pincode,
+                latitude=sum(c[0] for c in coords) / len(coords),
+                longitude=sum(c[1] for c in coords) / len(coords),
+                office_name=office[:150],
+                district=district[:100],
+                state=state[:100],
+            ))
+
+        with transaction.atomic():
+            PincodeLocation.objects.bulk_create(
+                objs,
+                batch_size=options['batch_size'],
+                update_conflicts=True,
+                unique_fields=['pincode'],
+                update_fields=['latitude', 'longitude', 'office_name', 'district', 'state'],
+            )
+
+        bump_geo_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Done! {len(objs)} pincodes load/update hue ({skipped} rows skip kiye — coordinates missing/galat).'
+        ))
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-19 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PincodeLocation',
+            fields=[
+                ('pincode', models.CharField(max_length=6, primary_key=True, serialize=False, verbose_name='Pincode')),
+                ('latitude', models.FloatField(verbose_name='Latitude')),
+                ('longitude', models.FloatField(verbose_name='Longitude')),
+                ('office_name', models.CharField(blank=True, max_length=150, verbose_name='Post Office / Area')),
+                ('district', models.CharField(blank=True, db_index=True, max_length=100, verbose_name='District / City')),
+                ('state', models.CharField(blank=True, max_length=100, verbose_name='State')),
+            ],
+            options={
+                'verbose_name': 'Pincode Location',
+                'verbose_name_plural': 'Pincode Locations',
+                'ordering': ['pincode'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-19 11:05
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # settings.CACHES ke DatabaseCache aliases ("shared") ki table — Redis pe kuch nahi.
+    # Idempotent — table pehle se ho toh skip.
+    call_command("createcachetable", database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school_directory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,25 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
 # Create your models here.
+
+
+class PincodeLocation(models.Model):
+    """
+    Offline pincode -> lat/long table. `load_pincodes` command se bharti hai
+    (bundled CSV ya India Post ki poori directory). Koi external geocoding nahi.
+    """
+    pincode = models.CharField(max_length=6, primary_key=True, verbose_name=_("Pincode"))
+    latitude = models.FloatField(verbose_name=_("Latitude"))
+    longitude = models.FloatField(verbose_name=_("Longitude"))
+    office_name = models.CharField(max_length=150, blank=True, verbose_name=_("Post Office / Area"))
+    district = models.CharField(max_length=100, blank=True, db_index=True, verbose_name=_("District / City"))
+    state = models.CharField(max_length=100, blank=True, verbose_name=_("State"))
+
+    class Meta:
+        verbose_name = _("Pincode Location")
+        verbose_name_plural = _("Pincode Locations")
+        ordering = ["pincode"]
+
+    def __str__(self):
+        return f"{self.pincode} • {self.district or self.office_name}"
@@ -0,0 +1,16 @@
+from django.db import transaction
+
+from .geo import bump_geo_version
+from .index import record_change
+
+
+def organization_changed(sender, instance, **kwargs):
+    # Commit ke baad hi log karo — warna dusra process purana row padh lega
+    org_id = instance.pk
+    transaction.on_commit(lambda: record_change(org_id))
+    transaction.on_commit(bump_geo_version)
+
+
+def tutor_changed(sender, instance, **kwargs):
+    # Service areas / mode / active badla toh "near me" grid dobara banega
+    transaction.on_commit(bump_geo_version)
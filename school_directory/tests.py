@@ -1,3 +1,101 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from normal_user.cache import shared_cache
+from organizations.models import Organization
+
+from .geo import KIND_SCHOOL, GeoIndex
+from .index import DirectoryIndex
+from .models import PincodeLocation
+
+User = get_user_model()
+
+
+class DirectoryIndexRefreshTests(TestCase):
+    """Har process ka apna in-memory index — refresh shared cache / max-age se."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.agra = Organization.objects.create(name="Agra Public School", city="Agra", admin=cls.admin)
+        Organization.objects.create(name="Taj Convent", city="Agra", admin=cls.admin)
+        Organization.objects.create(name="Mathura Vidyalaya", city="Mathura", admin=cls.admin)
+
+    def setUp(self):
+        shared_cache.clear()
+
+    def count(self, index, city):
+        return index.search({"city": [city]}, limit=1)["count"]
+
+    def test_cache_backend_is_shared(self):
+        self.assertNotIn("locmem", settings.CACHES["shared"]["BACKEND"].lower())
+
+    def test_change_log_reaches_other_process(self):
+        # Do workers, ek hi cache
+        worker_a, worker_b = DirectoryIndex(), DirectoryIndex()
+        self.assertEqual(self.count(worker_a, "mathura"), 1)
+        self.assertEqual(self.count(worker_b, "mathura"), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.agra.city = "Mathura"
+            self.agra.save()
+
+        self.assertEqual(self.count(worker_b, "mathura"), 2)
+        self.assertEqual(self.count(worker_b, "agra"), 1)
+        self.assertEqual(self.count(worker_a, "mathura"), 2)
+
+    def test_unlogged_change_is_picked_up_after_max_age(self):
+        index = DirectoryIndex()
+        self.assertEqual(self.count(index, "mathura"), 1)
+
+        # queryset.update — koi signal / change-log entry nahi
+        Organization.objects.filter(pk=self.agra.pk).update(city="Mathura")
+        self.assertEqual(self.count(index, "mathura"), 1)
+
+        with mock.patch("school_directory.index.MAX_INDEX_AGE", 0):
+            self.assertEqual(self.count(index, "mathura"), 2)
+
+
+class GeoIndexRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        PincodeLocation.objects.create(pincode="282001", latitude=27.18, longitude=78.01, district="Agra")
+        PincodeLocation.objects.create(pincode="282005", latitude=27.20, longitude=78.00, district="Agra")
+        Organization.objects.create(name="Agra Public School", pincode="282001", city="Agra", admin=cls.admin)
+
+    def setUp(self):
+        shared_cache.clear()
+
+    def schools(self, index):
+        return [ref for _, ref, _, _ in index.nearby(27.18, 78.01, 10, kinds=(KIND_SCHOOL,))]
+
+    def test_version_bump_reaches_other_process(self):
+        worker_a, worker_b = GeoIndex(), GeoIndex()
+        self.assertEqual(len(self.schools(worker_a)), 1)
+        self.assertEqual(len(self.schools(worker_b)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Organization.objects.create(name="Taj Convent", pincode="282005", city="Agra", admin=self.admin)
+
+        with mock.patch("school_directory.geo.MIN_REBUILD_INTERVAL", 0):
+            self.assertEqual(len(self.schools(worker_b)), 2)
+
+    def test_unsignalled_change_is_picked_up_after_max_age(self):
+        index = GeoIndex()
+        self.assertEqual(len(self.schools(index)), 1)
+
+        Organization.objects.bulk_create([
+            Organization(name="Taj Convent", slug="taj-convent", pincode="282005", city="Agra", admin=self.admin),
+        ])
+        self.assertEqual(len(self.schools(index)), 1)
+
+        with mock.patch("school_directory.geo.MAX_INDEX_AGE", 0):
+            self.assertEqual(len(self.schools(index)), 2)
@@ -0,0 +1,17 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import DirectorySearchViewSet, NearbySearchViewSet
+
+app_name = 'school_directory'
+
+router = DefaultRouter()
+
+# URL: /api/v1/directory/schools/
+router.register(r'schools', DirectorySearchViewSet, basename='directory-school')
+
+# URL: /api/v1/directory/nearby/
+router.register(r'nearby', NearbySearchViewSet, basename='directory-nearby')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
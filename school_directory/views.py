@@ -1,3 +1,156 @@
-from django.shortcuts import render
+from rest_framework import permissions, status, viewsets
+from rest_framework.response import Response
+
+from .geo import KIND_SCHOOL, KIND_TUTOR, KINDS, MAX_RADIUS_KM, geo_index
+from .index import DIMENSIONS, directory_index
+
+# ────────────────────────────────────────────────
+# Parent-facing school directory
+# ────────────────────────────────────────────────
+
+class DirectorySearchViewSet(viewsets.ViewSet):
+    """
+    GET /api/v1/directory/schools/?city=Agra&board=CBSE&amenities=transport,library
+
+    Har filter comma-separated ya repeat ho sakta hai (?city=Agra&city=Mathura).
+    Ek filter ke andar OR, filters ke beech AND; amenities mein sab chahiye.
+    Response mein har dimension ke facet counts aate hain — DB hit nahi hota,
+    sab in-memory bitmap index (school_directory/index.py) se.
+    """
+    permission_classes = [permissions.AllowAny]
+    page_size = 20
+    max_page_size = 100
+
+    def _int_param(self, name, default):
+        try:
+            return int(self.request.query_params.get(name, default))
+        except (TypeError, ValueError):
+            return None
+
+    def list(self, request):
+        filters = {}
+        for dim in DIMENSIONS:
+            values = []
+            for raw in request.query_params.getlist(dim):
+                values.extend(part for part in raw.split(",") if part.strip())
+            if values:
+                filters[dim] = values
+
+        page = self._int_param("page", 1)
+        page_size = self._int_param("page_size", self.page_size)
+        if not page or page < 1 or not page_size or page_size < 1:
+            return Response(
+                {"error": "Bhai, page aur page_size positive numbers hone chahiye."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        page_size = min(page_size, self.max_page_size)
+
+        result = directory_index.search(filters, offset=(page - 1) * page_size, limit=page_size)
+        return Response({
+            "count": result["count"],
+            "page": page,
+            "page_size": page_size,
+            "results": result["results"],
+            "facets": result["facets"],
+        })
+
+
+# ────────────────────────────────────────────────
+# "Near me" — pincode proximity search
+# ────────────────────────────────────────────────
+
+class NearbySearchViewSet(viewsets.ViewSet):
+    """
+    GET /api/v1/directory/nearby/?pincode=282001&radius_km=10&type=school|tutor|all&limit=20
+
+    Pincode ke centroid se radius ke andar schools aur offline/hybrid tutors,
+    doori ke order mein. Koi external geocoding API nahi — sab PincodeLocation
+    table + in-memory grid (school_directory/geo.py) se.
+    `precision`: "pincode" = exact pincode match, "city" = sirf city ka centroid.
+    """
+    permission_classes = [permissions.AllowAny]
+    default_radius_km = 10
+    default_limit = 20
+    max_limit = 100
+
+    def _bad_request(self, message):
+        return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
+
+    def list(self, request):
+        params = request.query_params
+        pincode = (params.get("pincode") or "").strip()
+        if not (pincode.isdigit() and len(pincode) == 6):
+            return self._bad_request("Bhai, 6 digit ka pincode bhejo.")
+
+        try:
+            radius_km = float(params.get("radius_km", self.default_radius_km))
+            limit = int(params.get("limit", self.default_limit))
+        except (TypeError, ValueError):
+            return self._bad_request("Bhai, radius_km aur limit numbers hone chahiye.")
+        if not 0 < radius_km <= MAX_RADIUS_KM or limit < 1:
+            return self._bad_request(f"Bhai, radius_km 0 se {MAX_RADIUS_KM} ke beech aur limit positive honi chahiye.")
+        limit = min(limit, self.max_limit)
+
+        kind = params.get("type", "all")
+        if kind not in KINDS + ("all",):
+            return self._bad_request("Bhai, type 'school', 'tutor' ya 'all' hona chahiye.")
+        kinds = KINDS if kind == "all" else (kind,)
+
+        origin = geo_index.locate(pincode)
+        if origin is None:
+            return Response(
+                {"error": "Yeh pincode hamare directory mein nahi mila."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        hits = geo_index.nearby(origin[0], origin[1], radius_km, kinds=kinds, limit=limit)
+        cards = self._load_cards(hits)
+        results = []
+        for hit_kind, ref, distance_km, precision in hits:
+            card = cards.get((hit_kind, ref))
+            if card is None:  # index rebuild se pehle delete/deactivate hua
+                continue
+            results.append({**card, "distance_km": distance_km, "precision": precision})
+
+        return Response({
+            "origin": {"pincode": pincode, "latitude": origin[0], "longitude": origin[1]},
+            "radius_km": radius_km,
+            "count": len(results),
+            "results": results,
+        })
+
+    @staticmethod
+    def _load_cards(hits):
+        """Har type ke liye ek query — hits ke ids se cards."""
+        from organizations.models import Organization
+        from teachers.models import Teacher
+
+        school_ids = [ref for kind, ref, _, _ in hits if kind == KIND_SCHOOL]
+        tutor_ids = [ref for kind, ref, _, _ in hits if kind == KIND_TUTOR]
+        cards = {}
+
+        if school_ids:
+            schools = Organization.objects.filter(id__in=school_ids, is_active=True).values(
+                "id", "name", "slug", "city", "locality", "pincode",
+                "affiliation_board", "is_verified",
+            )
+            for row in schools:
+                cards[(KIND_SCHOOL, row["id"])] = {"type": KIND_SCHOOL, **row}
+
+        if tutor_ids:
+            tutors = Teacher.objects.filter(
+                id__in=tutor_ids, is_active_teacher=True,
+            ).select_related("user")
+            for teacher in tutors:
+                cards[(KIND_TUTOR, teacher.id)] = {
+                    "type": KIND_TUTOR,
+                    "id": teacher.id,
+                    "name": teacher.user.get_full_name() or teacher.user.username,
+                    "subjects": teacher.get_expertise_summary(),
+                    "hourly_rate": teacher.hourly_rate,
+                    "preferred_mode": teacher.preferred_mode,
+                    "service_areas": teacher.service_areas,
+                    "is_verified": teacher.is_verified,
+                }
+        return cards
 
-# Create your views here.
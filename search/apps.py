@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'search'
+
+    def ready(self):
+        from .signals import connect_signals
+
+        # Organization / Student / Teacher (aur unke User) save/delete -> FTS index sync
+        connect_signals()
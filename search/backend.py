@@ -0,0 +1,190 @@
+"""
+SQLite FTS5 search backend.
+
+- Write path: `index_objects` / `remove_objects` — SearchDocument se rowid,
+  phir FTS row delete + insert (FTS5 mein UPDATE bhi andar se yahi karta hai).
+- Read path: `filter_queryset` — caller ke (already filtered) queryset pe
+  `pk IN (MATCH ...)`; rank order ke liye `search_ids` MATCH ko usi queryset
+  tak seemit karke top `limit` nikalta hai. Candidates index se aate hain,
+  table kitni bhi badi ho, icontains jaisa full scan nahi.
+- Query syntax user se nahi liya jata: har word quote karke prefix (`"ravi"*`)
+  banta hai, saare words AND. Isliye "rav sha" -> Ravi Sharma mil jata hai aur
+  user ka `"`/`*`/`NEAR` kuch tod nahi sakta.
+
+Postgres/MySQL pe (ya FTS5 ke bina SQLite pe) `is_available()` False deta hai
+aur callers purane icontains search pe fall back karte hain.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.expressions import RawSQL
+
+from .indexes import get_index
+from .models import SearchDocument
+
+MAX_QUERY_TERMS = 8
+DEFAULT_MATCH_LIMIT = 500
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_available = set()
+
+
+def is_available(using="default"):
+    """FTS tables is DB mein hain? True result cache hota hai (False nahi — migrate ke baad aa sakte hain)."""
+    if using in _available:
+        return True
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_fts_organization'"
+        )
+        found = cursor.fetchone() is not None
+    if found:
+        _available.add(using)
+    return found
+
+
+def build_match_query(text):
+    """User ka text -> safe FTS5 prefix query, ya None agar koi word hi nahi."""
+    terms = _TOKEN_RE.findall((text or "").lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+# ── Write path ────────────────────────────────────────────────────────
+
+def _document_ids(index, object_ids, create=False):
+    object_ids = [str(pk) for pk in object_ids]
+    existing = dict(
+        SearchDocument.objects.filter(index=index.name, object_id__in=object_ids)
+        .values_list("object_id", "id")
+    )
+    if create:
+        missing = [pk for pk in object_ids if pk not in existing]
+        if missing:
+            SearchDocument.objects.bulk_create(
+                [SearchDocument(index=index.name, object_id=pk) for pk in missing],
+                ignore_conflicts=True,
+            )
+            existing.update(
+                SearchDocument.objects.filter(index=index.name, object_id__in=missing)
+                .values_list("object_id", "id")
+            )
+    return existing
+
+
+def index_objects(index_name, objs, using="default"):
+    """objs ke documents (re)write karta hai. objs pe index.select_related already hona chahiye."""
+    objs = list(objs)
+    if not objs or not is_available(using):
+        return 0
+    index = get_index(index_name)
+    doc_ids = _document_ids(index, [obj.pk for obj in objs], create=True)
+
+    rows = [(doc_ids[str(obj.pk)], *index.get_document(obj)) for obj in objs]
+    placeholders = ", ".join(["%s"] * (len(index.columns) + 1))
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {index.table} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {index.table} (rowid, {', '.join(index.columns)}) VALUES ({placeholders})",
+            rows,
+        )
+    return len(rows)
+
+
+def remove_objects(index_name, object_ids, using="default"):
+    if not is_available(using):
+        return 0
+    index = get_index(index_name)
+    doc_ids = list(_document_ids(index, object_ids).values())
+    if not doc_ids:
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {index.table} WHERE rowid = %s", [(pk,) for pk in doc_ids])
+    SearchDocument.objects.filter(id__in=doc_ids).delete()
+    return len(doc_ids)
+
+
+def reindex_pks(index_name, pks, using="default"):
+    """pks ko DB se fresh padh ke index karo; jo row ab nahi hai use index se hatao."""
+    index = get_index(index_name)
+    objs = list(index.get_queryset().using(using).filter(pk__in=pks))
+    index_objects(index_name, objs, using=using)
+    gone = {str(pk) for pk in pks} - {str(obj.pk) for obj in objs}
+    if gone:
+        remove_objects(index_name, gone, using=using)
+
+
+# ── Read path ─────────────────────────────────────────────────────────
+
+def _object_key(index, using):
+    """`d.object_id` (str(pk)) -> model ke pk column jaisi value, taaki SQL mein pk se milaya ja sake."""
+    pk = index.get_model()._meta.pk
+    if pk.get_internal_type() == "UUIDField" and not connections[using].features.has_native_uuid_field:
+        return "REPLACE(d.object_id, '-', '')"  # SQLite UUID ko bina dash ke hex mein rakhta hai
+    if pk.get_internal_type() in ("AutoField", "BigAutoField", "SmallAutoField", "IntegerField", "BigIntegerField"):
+        return "CAST(d.object_id AS INTEGER)"
+    return "d.object_id"
+
+
+def _match_from(index):
+    return (
+        f"FROM {index.table} JOIN {SearchDocument._meta.db_table} d ON d.id = {index.table}.rowid "
+        f"WHERE {index.table} MATCH %s"
+    )
+
+
+def search_ids(index_name, text, limit=DEFAULT_MATCH_LIMIT, using="default", within=None):
+    """
+    bm25 ke hisaab se best-first object ids (strings), top `limit`.
+    `within` (queryset) ho toh MATCH sirf usi ke rows mein — LIMIT filter ke
+    BAAD lagta hai, isliye chhote school ke matches bade school ke neeche nahi dabte.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return []
+    index = get_index(index_name)
+    weights = ", ".join(str(weight) for weight in index.weights)
+    sql, params = f"SELECT d.object_id {_match_from(index)}", [match]
+    if within is not None:
+        within_sql, within_params = within.order_by().values("pk").query.get_compiler(using=using).as_sql()
+        sql += f" AND {_object_key(index, using)} IN ({within_sql})"
+        params += list(within_params)
+    sql += f" ORDER BY bm25({index.table}, {weights}) LIMIT %s"
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [*params, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def filter_queryset(queryset, index_name, text, ordered=True, limit=DEFAULT_MATCH_LIMIT, also=None):
+    """
+    queryset ko FTS matches tak seemit karta hai — SAARE matches, koi cap nahi.
+    `ordered` ho toh queryset ke andar ke top `limit` matches bm25 rank order
+    mein pehle, baaki matches unke baad pk order mein.
+    `also` (Q) wale rows bhi shaamil hote hain — rank wale hits ke baad (e.g.
+    phonetic name matches). FTS available na ho toh None — caller apna icontains fallback chalaye.
+    """
+    if not is_available(queryset.db):
+        return None
+    match = build_match_query(text)
+    if match is None:
+        return queryset.filter(also).order_by("pk") if also is not None else queryset.none()
+
+    index = get_index(index_name)
+    matches = Q(pk__in=RawSQL(f"SELECT {_object_key(index, queryset.db)} {_match_from(index)}", [match]))
+    ids = search_ids(index_name, text, limit=limit, using=queryset.db, within=queryset) if ordered else []
+    queryset = queryset.filter(matches | also) if also is not None else queryset.filter(matches)
+    if ordered:
+        if not ids:
+            return queryset.order_by("pk")
+        rank = Case(
+            *(When(pk=pk, then=position) for position, pk in enumerate(ids)),
+            default=len(ids),
+            output_field=IntegerField(),
+        )
+        queryset = queryset.order_by(rank, "pk")
+    return queryset
@@ -0,0 +1,31 @@
+from rest_framework import filters
+
+from . import backend
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter ka drop-in replacement jo `?search=` ko FTS5 index se chalata hai.
+
+        filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+        search_index = "teacher"
+        search_fields = [...]   # fallback: FTS na ho toh purana icontains search
+
+    Ise OrderingFilter ke BAAD rakho — `?ordering=` na aaye toh results bm25
+    rank order mein aate hain, view ka default `ordering` rank ko override nahi karta.
+    """
+
+    ordering_param = "ordering"
+
+    def filter_queryset(self, request, queryset, view):
+        index_name = getattr(view, "search_index", None)
+        text = " ".join(self.get_search_terms(request))
+        if not index_name or not text:
+            return super().filter_queryset(request, queryset, view)
+
+        ordered = not request.query_params.get(self.ordering_param)
+        limit = getattr(view, "search_match_limit", backend.DEFAULT_MATCH_LIMIT)
+        ranked = backend.filter_queryset(queryset, index_name, text, ordered=ordered, limit=limit)
+        if ranked is None:
+            return super().filter_queryset(request, queryset, view)
+        return ranked
@@ -0,0 +1,107 @@
+"""
+Search index definitions.
+
+Har index ke columns yahan hain; `search_fts_<name>` virtual table ke columns
+(migrations/0002_fts_tables.py) isi order mein hone chahiye. `weights` bm25 ko
+jaate hain — naam mein match, bio mein match se zyada upar aata hai.
+"""
+from django.apps import apps
+
+
+def _join(*parts):
+    return " ".join(str(part) for part in parts if part)
+
+
+def _flatten(value):
+    """JSON (dict/list/str) ke saare leaf strings — subject_expertise jaise fields ke liye."""
+    if isinstance(value, dict):
+        return _join(*(_flatten(v) for v in value.values()))
+    if isinstance(value, (list, tuple)):
+        return _join(*(_flatten(v) for v in value))
+    return str(value) if value not in (None, "") else ""
+
+
+class SearchIndex:
+    name = None
+    model = None              # "app_label.ModelName"
+    columns = ()
+    weights = ()
+    select_related = ()
+    # Related model jiske save pe hamare documents badalte hain:
+    # {"app.Model": (lookup_to_related_pk, fields_that_matter)}
+    related = {}
+
+    @property
+    def table(self):
+        return f"search_fts_{self.name}"
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    def get_queryset(self):
+        return self.get_model()._default_manager.select_related(*self.select_related)
+
+    def get_document(self, obj):
+        raise NotImplementedError
+
+
+class OrganizationIndex(SearchIndex):
+    name = "organization"
+    model = "organizations.Organization"
+    columns = ("name", "codes", "place")
+    weights = (10.0, 5.0, 2.0)
+
+    def get_document(self, org):
+        return (
+            org.name,
+            _join(org.org_id, org.registration_number),
+            _join(org.city, org.locality, org.pincode),
+        )
+
+
+class StudentIndex(SearchIndex):
+    name = "student"
+    model = "students.StudentProfile"
+    columns = ("name", "student_id", "mobile")
+    weights = (10.0, 8.0, 4.0)
+    select_related = ("user",)
+    related = {
+        "normal_user.NormalUser": ("user_id", {"first_name", "last_name", "mobile"}),
+    }
+
+    def get_document(self, student):
+        user = student.user
+        return (
+            _join(user.first_name, user.last_name),
+            student.student_unique_id,
+            user.mobile,
+        )
+
+
+class TeacherIndex(SearchIndex):
+    name = "teacher"
+    model = "teachers.Teacher"
+    columns = ("name", "subjects", "bio")
+    weights = (10.0, 5.0, 1.0)
+    select_related = ("user",)
+    related = {
+        "normal_user.NormalUser": ("user_id", {"first_name", "last_name"}),
+    }
+
+    def get_document(self, teacher):
+        user = teacher.user
+        return (
+            _join(user.first_name, user.last_name),
+            _flatten(teacher.subject_expertise),
+            teacher.bio,
+        )
+
+
+INDEXES = {index.name: index for index in (OrganizationIndex(), StudentIndex(), TeacherIndex())}
+
+
+def get_index(name):
+    try:
+        return INDEXES[name]
+    except KeyError:
+        raise LookupError(f"Bhai, '{name}' naam ka search index nahi hai.")
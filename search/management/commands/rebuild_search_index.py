@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from search import backend
+from search.indexes import INDEXES
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = 'FTS5 search index (organizations / students / teachers) shuru se dobara banata hai'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--index', choices=sorted(INDEXES), action='append',
+                            help='Sirf yeh index (repeat kar sakte ho). Default: sab.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not backend.is_available():
+            raise CommandError('Bhai, FTS5 tables nahi mile — SQLite + `migrate search` chahiye.')
+
+        batch_size = options['batch_size']
+        for name in options['index'] or sorted(INDEXES):
+            index = INDEXES[name]
+            with transaction.atomic():
+                with connections['default'].cursor() as cursor:
+                    cursor.execute(f"DELETE FROM {index.table}")
+                SearchDocument.objects.filter(index=name).delete()
+
+                total, batch = 0, []
+                for obj in index.get_queryset().order_by().iterator(chunk_size=batch_size):
+                    batch.append(obj)
+                    if len(batch) >= batch_size:
+                        total += backend.index_objects(name, batch)
+                        batch = []
+                total += backend.index_objects(name, batch)
+
+            # Bulk load ke baad segments merge — query time pe kam b-trees
+            with connections['default'].cursor() as cursor:
+                cursor.execute(f"INSERT INTO {index.table} ({index.table}) VALUES ('optimize')")
+            self.stdout.write(self.style.SUCCESS(f'{name}: {total} documents index hue.'))
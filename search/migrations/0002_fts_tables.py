@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Columns search/indexes.py ke order mein hi hone chahiye.
+# prefix='2 3' -> chhote prefix queries ("ra"*, "ram"*) ke liye alag prefix index.
+FTS_TABLES = {
+    "search_fts_organization": ("name", "codes", "place"),
+    "search_fts_student": ("name", "student_id", "mobile"),
+    "search_fts_teacher": ("name", "subjects", "bio"),
+}
+
+
+def create_fts_tables(apps, schema_editor):
+    # FTS5 sirf SQLite pe; baaki DBs pe search purane icontains pe chalta hai
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FTS_TABLES.items():
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"{', '.join(columns)}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table in FTS_TABLES:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        # Existing rows ke liye: `python manage.py rebuild_search_index`
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    FTS5 table ki rowid integer honi chahiye, par Organization/Teacher ke pk UUID
+    hain. Yeh table (index, object_id) ko ek stable integer id deti hai — wahi id
+    `search_fts_<index>` mein rowid banti hai.
+    """
+    index = models.CharField(max_length=32)
+    object_id = models.CharField(max_length=64)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["index", "object_id"], name="unique_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.index}:{self.object_id}"
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import backend
+from .indexes import INDEXES
+
+
+def _on_commit(func, *args):
+    # Commit ke baad hi — rollback hua toh index mein bhoot document nahi bachega
+    transaction.on_commit(lambda: func(*args))
+
+
+def _index_saved(index_name):
+    def handler(sender, instance, **kwargs):
+        _on_commit(backend.reindex_pks, index_name, [instance.pk])
+    return handler
+
+
+def _index_deleted(index_name):
+    def handler(sender, instance, **kwargs):
+        _on_commit(backend.remove_objects, index_name, [instance.pk])
+    return handler
+
+
+def _related_saved(index_name, lookup, fields):
+    def handler(sender, instance, update_fields=None, created=False, **kwargs):
+        # Login pe sirf last_login save hota hai — uske liye reindex nahi
+        if created or (update_fields is not None and not fields & set(update_fields)):
+            return
+        index = INDEXES[index_name]
+
+        def reindex():
+            pks = list(index.get_model()._default_manager.filter(**{lookup: instance.pk}).values_list("pk", flat=True))
+            if pks:
+                backend.reindex_pks(index_name, pks)
+        transaction.on_commit(reindex)
+    return handler
+
+
+def connect_signals():
+    for index in INDEXES.values():
+        post_save.connect(_index_saved(index.name), sender=index.model, weak=False,
+                          dispatch_uid=f"search.{index.name}_saved")
+        post_delete.connect(_index_deleted(index.name), sender=index.model, weak=False,
+                            dispatch_uid=f"search.{index.name}_deleted")
+        for related_model, (lookup, fields) in index.related.items():
+            post_save.connect(_related_saved(index.name, lookup, set(fields)), sender=related_model,
+                              weak=False, dispatch_uid=f"search.{index.name}_{related_model}_saved")
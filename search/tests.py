@@ -0,0 +1,84 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from organizations.models import Organization
+from students.models import StudentProfile
+
+from . import backend
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 index sirf SQLite pe")
+class TenantScopedSearchTests(TestCase):
+    """
+    MATCH caller ke filtered queryset ke andar chalna chahiye — bade school ke
+    sau-sau matches chhote school ke match ko LIMIT ke bahar na dhakel dein.
+    """
+
+    BIG_SCHOOL_SIZE = backend.DEFAULT_MATCH_LIMIT + 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            username="staff", email="staff@example.com", password="x", mobile="9000000000", is_staff=True,
+        )
+        cls.school_a = Organization.objects.create(name="Big School", admin=cls.staff)
+        cls.school_b = Organization.objects.create(name="Small School", admin=cls.staff)
+
+        # "Ravi Rana" mein "ra"/"r" do baar — bm25 mein ye sab "Ravi Verma" se upar
+        users = User.objects.bulk_create([
+            User(username=f"ravi{i}", email=f"ravi{i}@example.com", mobile=f"91{i:08d}",
+                 first_name="Ravi", last_name="Rana")
+            for i in range(cls.BIG_SCHOOL_SIZE)
+        ])
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, organization=cls.school_a, student_unique_id=f"A-{i}")
+            for i, user in enumerate(users)
+        ])
+        verma = User.objects.create_user(
+            username="verma", email="verma@example.com", password="x", mobile="9200000000",
+            first_name="Ravi", last_name="Verma",
+        )
+        cls.verma = StudentProfile.objects.create(user=verma, organization=cls.school_b, student_unique_id="B-1")
+
+        backend.index_objects("student", StudentProfile.objects.select_related("user"))
+        backend.index_objects("organization", Organization.objects.all())
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def explore(self, **params):
+        response = self.client.get("/api/v1/students/explore/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_small_school_match_is_not_crowded_out(self):
+        for q in ("ra", "r", "ravi", "verma"):
+            with self.subTest(q=q):
+                data = self.explore(organization_id=str(self.school_b.pk), q=q)
+                self.assertEqual(data["count"], 1)
+                self.assertEqual(data["results"][0]["id"], self.verma.pk)
+
+    def test_matches_are_not_capped(self):
+        data = self.explore(organization_id=str(self.school_a.pk), q="ravi rana")
+        self.assertEqual(data["count"], self.BIG_SCHOOL_SIZE)
+
+    def test_rank_window_is_scoped_to_queryset(self):
+        ids = backend.search_ids(
+            "student", "ra", limit=5, within=StudentProfile.objects.filter(organization=self.school_b),
+        )
+        self.assertEqual(ids, [str(self.verma.pk)])
+
+    def test_uuid_pk_index(self):
+        # Organization ka pk UUID hai — SQLite mein bina dash ke hex
+        only_b = Organization.objects.filter(pk=self.school_b.pk)
+        self.assertEqual(list(backend.filter_queryset(only_b, "organization", "school")), [self.school_b])
+        self.assertEqual(list(backend.filter_queryset(only_b, "organization", "big")), [])
+        ranked = backend.filter_queryset(Organization.objects.all(), "organization", "small school")
+        self.assertEqual(list(ranked), [self.school_b])
@@ -0,0 +1,172 @@
+"""
+Teacher -> students access index.
+
+Profile read / IsTeacherOfStudent pe har request ek `StudentSession ... exists()`
+chalta tha. Yahan har teacher ke accessible student ids ka ek set banta hai —
+teen sources se, ek hi query mein:
+
+  1. StudentSession (teacher = user)
+  2. Class teacher: Standard.class_teacher ke active students
+  3. ClassroomSession.teacher ke active enrollments
+
+Set local cache mein (per teacher, versioned key) aur request ke dauraan
+user object pe memo — authorization sirf `student_id in set`.
+
+Version shared cache mein (normal_user.cache) — saare workers ek hi version
+dekhte hain. Version ek random token hai, counter nahi: shared cache clear /
+evict ho jaaye toh naya token banta hai, 1 se dobara shuru hoke kisi worker
+ka purana local set galti se match nahi hota.
+
+Maintenance: kisi source ka row badla toh affected teacher(s) ka version
+bump (on_commit) — model signals se, aur signal-less bulk paths (rollover,
+admin actions) `invalidate_class_teachers` se. Set agli read pe dobara banta
+hai, isliye access hatna commit ke baad agli request se lagta hai. Koi naya
+raw `queryset.update()` jo in sources ko chhuta hai, use bhi invalidate karna
+hoga — warna ACCESS_CACHE_TTL tak purana set chal sakta hai.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from normal_user.cache import shared_cache
+
+ACCESS_CACHE_TTL = 10 * 60
+_VERSION_KEY = "students:access:v:{}"
+_SET_KEY = "students:access:{}:{}"
+
+
+def _version(user_id):
+    key = _VERSION_KEY.format(user_id)
+    version = shared_cache.get(key)
+    if version is None:
+        shared_cache.add(key, uuid.uuid4().hex, None)
+        version = shared_cache.get(key)
+    return version
+
+
+def invalidate_teacher(user_id):
+    """Is teacher (user id) ka set purana — commit ke baad naya version token."""
+    if not user_id:
+        return
+    transaction.on_commit(lambda: shared_cache.set(_VERSION_KEY.format(user_id), uuid.uuid4().hex, None))
+
+
+def invalidate_class_teachers(standard_ids):
+    """
+    In standards ke class teachers invalidate — bulk `.update()` (bina signals)
+    se students ki class / is_active badalne ke baad call karo.
+    """
+    from students_classroom.models import Standard
+
+    standard_ids = {pk for pk in standard_ids if pk}
+    if not standard_ids:
+        return
+    user_ids = Standard.objects.filter(
+        pk__in=standard_ids, class_teacher__isnull=False
+    ).values_list("class_teacher__user_id", flat=True).distinct()
+    for user_id in user_ids:
+        invalidate_teacher(user_id)
+
+
+def _load_student_ids(user_id):
+    from students_classroom.models import SessionEnrollment
+    from .models import StudentProfile, StudentSession
+
+    sessions = StudentSession.objects.filter(teacher_id=user_id).values_list("student_id", flat=True)
+    class_students = StudentProfile.objects.filter(
+        current_standard__class_teacher__user_id=user_id, is_active=True
+    ).values_list("id", flat=True)
+    enrolled = SessionEnrollment.objects.filter(
+        session__teacher__user_id=user_id, is_active=True
+    ).values_list("student_id", flat=True)
+    # UNION — teeno sources ek round-trip mein, duplicates DB hi hata deta hai
+    return frozenset(sessions.order_by().union(class_students.order_by(), enrolled.order_by()))
+
+
+def accessible_student_ids(user):
+    """Teacher user ke saare accessible StudentProfile ids (frozenset)."""
+    memo = getattr(user, "_student_access", None)
+    if memo is not None:
+        return memo
+    key = _SET_KEY.format(user.pk, _version(user.pk))
+    ids = cache.get(key)
+    if ids is None:
+        ids = _load_student_ids(user.pk)
+        cache.set(key, ids, ACCESS_CACHE_TTL)
+    user._student_access = ids
+    return ids
+
+
+def teacher_can_access(user, student):
+    student_id = getattr(student, "pk", student)
+    return student_id in accessible_student_ids(user)
+
+
+# ── Signals ───────────────────────────────────────────────────────────
+# post_init pe watched fields ka snapshot — save pe purane + naye dono teachers
+# invalidate hote hain (class teacher badla, student ne class badli, ...).
+
+def _teacher_user_id(teacher_id):
+    from teachers.models import Teacher
+    return Teacher.objects.filter(pk=teacher_id).values_list("user_id", flat=True).first()
+
+
+def _session_teacher_user_id(session_id):
+    from students_classroom.models import ClassroomSession
+    return ClassroomSession.objects.filter(pk=session_id).values_list("teacher__user_id", flat=True).first()
+
+
+def _class_teacher_user_id(standard_id):
+    from students_classroom.models import Standard
+    return Standard.objects.filter(pk=standard_id).values_list("class_teacher__user_id", flat=True).first()
+
+
+# model -> (watched fields, state -> affected teacher user id)
+WATCHED_MODELS = {
+    "students.StudentSession": (("teacher_id",), lambda state: state["teacher_id"]),
+    "students.StudentProfile": (
+        ("current_standard_id", "is_active"),
+        lambda state: state["current_standard_id"] and _class_teacher_user_id(state["current_standard_id"]),
+    ),
+    "students_classroom.Standard": (
+        ("class_teacher_id",),
+        lambda state: state["class_teacher_id"] and _teacher_user_id(state["class_teacher_id"]),
+    ),
+    "students_classroom.ClassroomSession": (
+        ("teacher_id",),
+        lambda state: state["teacher_id"] and _teacher_user_id(state["teacher_id"]),
+    ),
+    "students_classroom.SessionEnrollment": (
+        ("session_id", "is_active"),
+        lambda state: state["session_id"] and _session_teacher_user_id(state["session_id"]),
+    ),
+}
+
+
+def _state(instance):
+    fields, _ = WATCHED_MODELS[instance._meta.label]
+    return {name: instance.__dict__.get(name) for name in fields}
+
+
+def remember_access_state(sender, instance, **kwargs):
+    instance._access_state = _state(instance)
+
+
+def access_source_saved(sender, instance, created=False, **kwargs):
+    _, resolve = WATCHED_MODELS[sender._meta.label]
+    before = getattr(instance, "_access_state", None)
+    after = _state(instance)
+    instance._access_state = after
+    if not created and before == after:
+        return  # Naam / notes jaisa kuch badla — access same
+    affected = {resolve(after)}
+    if before and not created:
+        affected.add(resolve(before))
+    for user_id in affected:
+        invalidate_teacher(user_id)
+
+
+def access_source_deleted(sender, instance, **kwargs):
+    _, resolve = WATCHED_MODELS[sender._meta.label]
+    invalidate_teacher(resolve(_state(instance)))
@@ -2,10 +2,15 @@ from django.contrib import admin
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import StudentProfile, StudentSession, StudentResult, StudentFee
+from normal_user.admin_mixins import StreamingCSVExportMixin
+from .access import invalidate_class_teachers
+from .models import (
+    StudentProfile, StudentSession, StudentResult, StudentFee, StudentPromotion, StudentIdSequence,
+    StudentFeeBalance, OrganizationFeeBalance, FeeCollectionDay,
+)
 
 @admin.register(StudentProfile)
-class StudentProfileAdmin(admin.ModelAdmin):
+class StudentProfileAdmin(StreamingCSVExportMixin, admin.ModelAdmin):
     # ─── List View ──────────────────────────────────────────────────────────
     list_display = (
         "full_name_link",
@@ -82,12 +87,29 @@ class StudentProfileAdmin(admin.ModelAdmin):
     @admin.action(description=_("Mark selected as active"))
     def make_active(self, request, queryset):
         queryset.update(is_active=True)
+        invalidate_class_teachers(queryset.values_list("current_standard_id", flat=True).distinct())
 
     @admin.action(description=_("Mark selected as inactive"))
     def make_inactive(self, request, queryset):
         queryset.update(is_active=False)
+        invalidate_class_teachers(queryset.values_list("current_standard_id", flat=True).distinct())
 
-    actions = ["make_active", "make_inactive"]
+    actions = ["make_active", "make_inactive", "export_as_csv", "export_as_csv_gzip"]
+
+    # ─── CSV Export ─────────────────────────────────────────────────────────
+    csv_export_filename = "students"
+    csv_export_fields = (
+        ("Student ID", "student_unique_id"),
+        ("Username", "user__username"),
+        ("Name", "user__get_full_name"),
+        ("Email", "user__email"),
+        ("Mobile", "user__mobile"),
+        ("Organization", "organization__name"),
+        ("Standard", "current_standard__name"),
+        ("Section", "current_standard__section"),
+        ("Active", "is_active"),
+        ("Created At", "created_at"),
+    )
 
 # ─── Registering Other Models ──────────────────────────────────────────────
 @admin.register(StudentSession)
@@ -103,5 +125,45 @@ class StudentResultAdmin(admin.ModelAdmin):
 
 @admin.register(StudentFee)
 class StudentFeeAdmin(admin.ModelAdmin):
-    list_display = ('student', 'amount', 'due_date', 'status')
-    list_filter = ('status', 'due_date')
\ No newline at end of file
+    list_display = ('student', 'fee_type', 'amount', 'due_date', 'status')
+    list_filter = ('status', 'fee_type', 'due_date')
+
+@admin.register(StudentPromotion)
+class StudentPromotionAdmin(admin.ModelAdmin):
+    list_display = ('student', 'from_standard', 'to_standard', 'outcome', 'academic_year', 'created_at')
+    list_filter = ('outcome', 'academic_year')
+    list_select_related = ('student__user', 'from_standard', 'to_standard')
+    raw_id_fields = ('student', 'organization', 'from_standard', 'to_standard', 'created_by')
+    readonly_fields = ('batch_id', 'created_at')
+
+
+@admin.register(StudentIdSequence)
+class StudentIdSequenceAdmin(admin.ModelAdmin):
+    # Sirf dekhne ke liye — next_value haath se kam kiya toh IDs repeat ho sakti hain
+    list_display = ("organization", "year", "next_value", "updated_at")
+    list_filter = ("year",)
+    list_select_related = ("organization",)
+    readonly_fields = ("organization", "year", "next_value", "updated_at")
+
+
+# Fee ledger — materialized tables, sirf dekhne ke liye (refresh_fee_ledger --rebuild se theek hote hain)
+@admin.register(StudentFeeBalance)
+class StudentFeeBalanceAdmin(admin.ModelAdmin):
+    list_display = ("student", "organization", "outstanding", "overdue", "paid_total", "updated_at")
+    list_select_related = ("student__user", "organization")
+    readonly_fields = [field.name for field in StudentFeeBalance._meta.fields]
+
+
+@admin.register(OrganizationFeeBalance)
+class OrganizationFeeBalanceAdmin(admin.ModelAdmin):
+    list_display = ("organization", "outstanding", "overdue", "paid_total", "aging_as_of", "updated_at")
+    list_select_related = ("organization",)
+    readonly_fields = [field.name for field in OrganizationFeeBalance._meta.fields]
+
+
+@admin.register(FeeCollectionDay)
+class FeeCollectionDayAdmin(admin.ModelAdmin):
+    list_display = ("organization", "date", "amount", "payments")
+    list_filter = ("date",)
+    list_select_related = ("organization",)
+    readonly_fields = [field.name for field in FeeCollectionDay._meta.fields]
@@ -3,3 +3,28 @@ from django.apps import AppConfig
 
 class StudentsConfig(AppConfig):
     name = 'students'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_init, post_save
+        from .access import (
+            WATCHED_MODELS, access_source_deleted, access_source_saved, remember_access_state,
+        )
+
+        # Teacher -> student access sets: source rows badle toh sirf affected teacher invalidate
+        for model in WATCHED_MODELS:
+            post_init.connect(remember_access_state, sender=model, dispatch_uid=f'students.access.init.{model}')
+            post_save.connect(access_source_saved, sender=model, dispatch_uid=f'students.access.save.{model}')
+            post_delete.connect(access_source_deleted, sender=model, dispatch_uid=f'students.access.delete.{model}')
+
+        # Fee ledger: fee save / delete pe materialized balances mein sirf fark (F() deltas)
+        from .fee_ledger import (
+            fee_deleted, fee_saved, remember_fee_state, remember_student_organization, student_saved,
+        )
+        post_init.connect(remember_fee_state, sender='students.StudentFee', dispatch_uid='students.fee_ledger.init')
+        post_save.connect(fee_saved, sender='students.StudentFee', dispatch_uid='students.fee_ledger.save')
+        post_delete.connect(fee_deleted, sender='students.StudentFee', dispatch_uid='students.fee_ledger.delete')
+        # Student ne school badla toh uska ledger bhi saath jaata hai
+        post_init.connect(remember_student_organization, sender='students.StudentProfile',
+                          dispatch_uid='students.fee_ledger.student.init')
+        post_save.connect(student_saved, sender='students.StudentProfile',
+                          dispatch_uid='students.fee_ledger.student.save')
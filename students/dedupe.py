@@ -0,0 +1,281 @@
+"""
+Duplicate student detection (record linkage).
+
+Ek hi bachcha do baar ban jata hai — join request se bhi aur seeder/manual
+entry se bhi, aksar same mobile ke saath (NormalUser.mobile unique nahi hai,
+siblings ka number same hota hai). Har pair compare karna O(n²) hai, isliye:
+
+1. Blocking: sirf unhi students ke pairs bante hain jo kisi ek key pe milte
+   hain (har key organization ke andar):
+     - mobile (last 10 digits)
+     - dob + first name phonetic key
+     - first + last name phonetic key
+   MAX_BLOCK_SIZE se bade blocks (school ka office number, "Ram Kumar") skip.
+2. Scoring (numpy ho toh vectorized): naam ke character bigrams ka hashed
+   cosine + dob / mobile / class agreement (email users mein unique hai, woh
+   signal nahi). Dob dono taraf ho aur alag ho toh penalty — siblings same
+   mobile + surname ke saath yahin alag hote hain.
+3. min_score se upar wale pairs union-find se clusters; har cluster mein sabse
+   purana profile KEEP, baaki MERGE suggestion. Kuch bhi auto-merge nahi hota.
+"""
+import math
+import zlib
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy optional hai — bina uske pure-Python scoring
+    np = None
+
+from .models import StudentProfile
+
+MAX_BLOCK_SIZE = 50
+DEFAULT_MIN_SCORE = 0.75
+NAME_DIMENSIONS = 256
+MIN_PHONETIC_KEY_LENGTH = 3
+SCORE_CHUNK = 200_000
+LOAD_CHUNK = 20_000
+
+WEIGHTS = {"name": 0.5, "dob": 0.25, "mobile": 0.2, "standard": 0.05}
+
+COLUMNS = (
+    "id", "organization_id", "student_unique_id", "created_at", "current_standard_id",
+    "user__mobile", "user__dob",
+    "user__first_name", "user__last_name", "user__first_name_key", "user__last_name_key",
+)
+
+
+def normalize_mobile(value: Optional[str]) -> str:
+    """Last 10 digits ("+91 98765-43210" -> "9876543210"); number na ho toh ""."""
+    digits = (value or "").strip().lstrip("+").replace(" ", "").replace("-", "")
+    # Soft-deleted users ka mobile "deleted_mobile_<id>_<ts>" hota hai — woh number nahi
+    if not digits.isdigit() or len(digits) < 10:
+        return ""
+    return digits[-10:]
+
+
+def load_records(organization_ids: Optional[Iterable] = None) -> Dict[str, list]:
+    """Active students column-wise lists mein (1M rows pe objects nahi, tuples)."""
+    queryset = StudentProfile.objects.filter(is_active=True, user__is_deleted=False).order_by()
+    if organization_ids:
+        queryset = queryset.filter(organization_id__in=list(organization_ids))
+
+    records = {column: [] for column in COLUMNS}
+    for row in queryset.values_list(*COLUMNS).iterator(chunk_size=LOAD_CHUNK):
+        for column, value in zip(COLUMNS, row):
+            records[column].append(value)
+    return records
+
+
+# ── 1. Blocking ───────────────────────────────────────────────────────
+
+def candidate_pairs(records: Dict[str, list], max_block_size: int = MAX_BLOCK_SIZE):
+    """(left, right, skipped_blocks) — left[i] < right[i], har pair ek baar."""
+    blocks = defaultdict(list)
+    orgs = records["organization_id"]
+    for index, org in enumerate(orgs):
+        mobile = normalize_mobile(records["user__mobile"][index])
+        first_key = records["user__first_name_key"][index]
+        last_key = records["user__last_name_key"][index]
+        dob = records["user__dob"][index]
+        if mobile:
+            blocks[("mobile", org, mobile)].append(index)
+        if dob and first_key:
+            blocks[("dob", org, dob, first_key)].append(index)
+        if first_key and last_key:
+            blocks[("name", org, first_key, last_key)].append(index)
+
+    seen, left, right, skipped = set(), [], [], 0
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > max_block_size:
+            skipped += 1
+            continue
+        for a, b in combinations(members, 2):
+            if (a, b) not in seen:
+                seen.add((a, b))
+                left.append(a)
+                right.append(b)
+    return left, right, skipped
+
+
+# ── 2. Scoring ────────────────────────────────────────────────────────
+
+def _full_name(records, index):
+    return f" {records['user__first_name'][index] or ''} {records['user__last_name'][index] or ''} ".lower()
+
+
+def _bigrams(text):
+    text = " ".join(text.split())
+    return Counter(text[i:i + 2] for i in range(len(text) - 1))
+
+
+def _gram_column(gram):
+    # crc32, hash() nahi — str hash har process mein alag (PYTHONHASHSEED), score badal jaata
+    return zlib.crc32(gram.encode("utf-8")) % NAME_DIMENSIONS
+
+
+def _agreement(values, left, right):
+    """1 = dono same, 0.5 = ek taraf missing, 0 = dono hain par alag."""
+    if np is not None:
+        a, b = values[left], values[right]
+        missing = (a < 0) | (b < 0)
+        return np.where(missing, 0.5, (a == b).astype(np.float32))
+    return [0.5 if values[a] < 0 or values[b] < 0 else float(values[a] == values[b]) for a, b in zip(left, right)]
+
+
+def _codes(values):
+    """Values -> integer codes (khali = -1), taaki comparison array pe ho."""
+    lookup = {}
+    codes = [lookup.setdefault(v, len(lookup)) if v else -1 for v in values]
+    return np.asarray(codes, dtype=np.int64) if np is not None else codes
+
+
+def _name_similarity(records, left, right):
+    if np is None:
+        scores = []
+        for a, b in zip(left, right):
+            x, y = _bigrams(_full_name(records, a)), _bigrams(_full_name(records, b))
+            dot = sum(count * y[gram] for gram, count in x.items())
+            norm = math.sqrt(sum(v * v for v in x.values())) * math.sqrt(sum(v * v for v in y.values()))
+            scores.append(dot / norm if norm else 0.0)
+        return scores
+
+    # Sirf un students ke vectors jo kisi pair mein hain
+    involved = np.unique(np.concatenate([left, right]))
+    position = np.full(len(records["id"]), -1, dtype=np.int64)
+    position[involved] = np.arange(len(involved))
+
+    rows, cols, counts = [], [], []
+    for row, index in enumerate(involved.tolist()):
+        for gram, count in _bigrams(_full_name(records, index)).items():
+            rows.append(row)
+            cols.append(_gram_column(gram))
+            counts.append(count)
+    vectors = np.zeros((len(involved), NAME_DIMENSIONS), dtype=np.float32)
+    np.add.at(vectors, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), counts)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1, norms)
+
+    scores = np.empty(len(left), dtype=np.float32)
+    for start in range(0, len(left), SCORE_CHUNK):
+        stop = start + SCORE_CHUNK
+        a = vectors[position[left[start:stop]]]
+        b = vectors[position[right[start:stop]]]
+        scores[start:stop] = np.einsum("ij,ij->i", a, b)
+    return scores
+
+
+def score_pairs(records: Dict[str, list], left, right):
+    """(total_score, parts) — parts mein har signal ka 0..1 score (report ke 'reasons' ke liye)."""
+    if np is not None:
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+
+    # Dono phonetic keys same ("Laxmi Iyer" / "Lakshmi Iyer") = poora naam match,
+    # chahe bigram cosine kam aaye. Chhoti keys ("rm" = Ram/Rima/Roma) ke liye nahi.
+    name = _name_similarity(records, left, right)
+    first_keys = _codes([
+        key if len(key or "") >= MIN_PHONETIC_KEY_LENGTH else "" for key in records["user__first_name_key"]
+    ])
+    last_keys = _codes(records["user__last_name_key"])
+    if np is not None:
+        sounds_same = (
+            (first_keys[left] >= 0)
+            & (first_keys[left] == first_keys[right])
+            & (last_keys[left] == last_keys[right])
+        )
+        name = np.where(sounds_same, 1.0, name)
+    else:
+        name = [
+            1.0 if first_keys[a] >= 0 and first_keys[a] == first_keys[b] and last_keys[a] == last_keys[b] else score
+            for a, b, score in zip(left, right, name)
+        ]
+
+    parts = {
+        "name": name,
+        "dob": _agreement(_codes(records["user__dob"]), left, right),
+        "mobile": _agreement(_codes([normalize_mobile(m) for m in records["user__mobile"]]), left, right),
+        "standard": _agreement(_codes(records["current_standard_id"]), left, right),
+    }
+    if np is not None:
+        total = sum(WEIGHTS[name] * np.asarray(values, dtype=np.float32) for name, values in parts.items())
+    else:
+        total = [
+            sum(WEIGHTS[name] * parts[name][i] for name in WEIGHTS)
+            for i in range(len(left))
+        ]
+    return total, parts
+
+
+# ── 3. Clusters + suggestions ─────────────────────────────────────────
+
+def _find(parent, node):
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def find_duplicates(records: Dict[str, list], min_score: float = DEFAULT_MIN_SCORE,
+                    max_block_size: int = MAX_BLOCK_SIZE) -> dict:
+    """
+    Returns {"suggestions": {org_id: [row, ...]}, "pairs": n, "skipped_blocks": n}.
+    Har row ek student hai: action KEEP/MERGE, cluster number, score, reasons.
+    """
+    left, right, skipped = candidate_pairs(records, max_block_size)
+    result = {"suggestions": {}, "pairs": len(left), "skipped_blocks": skipped}
+    if not left:
+        return result
+
+    total, parts = score_pairs(records, left, right)
+    if np is not None:
+        accepted = np.flatnonzero(np.asarray(total) >= min_score).tolist()
+        left, right = np.asarray(left).tolist(), np.asarray(right).tolist()
+        total = np.asarray(total).tolist()
+        parts = {name: np.asarray(values).tolist() for name, values in parts.items()}
+    else:
+        accepted = [i for i, score in enumerate(total) if score >= min_score]
+
+    parent = {}
+    best = {}  # student index -> (score, pair index)
+    for pair in accepted:
+        a, b = left[pair], right[pair]
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+        for index in (a, b):
+            if index not in best or total[pair] > best[index][0]:
+                best[index] = (total[pair], pair)
+
+    clusters = defaultdict(list)
+    for index in parent:
+        clusters[_find(parent, index)].append(index)
+
+    suggestions = defaultdict(list)
+    ids, created = records["id"], records["created_at"]
+    for number, members in enumerate(sorted(clusters.values(), key=lambda m: min(ids[i] for i in m)), start=1):
+        # Sabse purana profile rakho — usi pe attendance/fees history zyada hogi
+        members.sort(key=lambda i: (created[i], ids[i]))
+        for rank, index in enumerate(members):
+            score, pair = best[index]
+            reasons = [name for name in WEIGHTS if parts[name][pair] >= (0.85 if name == "name" else 1.0)]
+            suggestions[records["organization_id"][index]].append({
+                "cluster": number,
+                "action": "KEEP" if rank == 0 else "MERGE",
+                "student_id": ids[index],
+                "student_unique_id": records["student_unique_id"][index],
+                "name": " ".join(_full_name(records, index).split()).title(),
+                "mobile": records["user__mobile"][index],
+                "dob": records["user__dob"][index],
+                "created_at": created[index],
+                "score": round(score, 3),
+                "reasons": "+".join(reasons),
+            })
+    result["suggestions"] = dict(suggestions)
+    return result
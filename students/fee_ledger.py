@@ -0,0 +1,358 @@
+"""
+Fee ledger — materialized balances.
+
+Pehle PENDING -> OVERDUE sirf tab hota tha jab koi row edit kare, aur har
+summary ke liye saari StudentFee rows scan karni padti thi. Ab:
+
+- StudentFeeBalance (per student) + OrganizationFeeBalance (per school):
+  outstanding / overdue / paid totals aur counts. StudentFee save / delete pe
+  signals sirf fark (F() deltas) lagate hain — payment = ek-do UPDATE.
+- FeeCollectionDay: din-wise collection (paid_at ki local date), payment pe +,
+  reversal pe -.
+- Attribution hamesha student ka current school: StudentProfile.organization
+  badla toh `move_student` balance row + totals + collections naye school pe
+  le jaata hai (rebuild bhi yahi karta hai).
+- Nightly `refresh_fee_ledger`: ek set-based UPDATE se PENDING -> OVERDUE
+  ((status, due_date) index), affected students ke balances SQL mein resync,
+  phir org roll-up aur aging buckets (1-30 / 31-60 / 61-90 / 90+ din).
+
+Dashboards sirf in tables ko padhte hain. Bulk writes (queryset.update /
+bulk_create) signals nahi bhejte — `refresh_fee_ledger --rebuild` sab kuch
+fees se dobara banata hai.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+UNPAID = ("PENDING", "OVERDUE")
+BALANCE_FIELDS = ("outstanding", "overdue", "paid_total", "pending_count", "overdue_count")
+AGING_BUCKETS = (  # (field, din past due: from, to) — to None = usse zyada
+    ("aging_1_30", 1, 30),
+    ("aging_31_60", 31, 60),
+    ("aging_61_90", 61, 90),
+    ("aging_90_plus", 91, None),
+)
+SQL_BATCH = 500
+DEFAULT_DASHBOARD_DAYS = 30
+MAX_DASHBOARD_DAYS = 366
+TOP_DEFAULTERS = 10
+
+
+# ── Incremental (signals) ─────────────────────────────────────────────
+
+def _state(instance):
+    data = instance.__dict__
+    return (data.get("student_id"), data.get("amount"), data.get("status"), data.get("paid_at"))
+
+
+def _contribution(state):
+    _, amount, status, _ = state
+    amount = Decimal(str(amount or 0))
+    return {
+        "outstanding": amount if status in UNPAID else Decimal(0),
+        "overdue": amount if status == "OVERDUE" else Decimal(0),
+        "paid_total": amount if status == "PAID" else Decimal(0),
+        "pending_count": 1 if status == "PENDING" else 0,
+        "overdue_count": 1 if status == "OVERDUE" else 0,
+    }
+
+
+def _collection_day(state):
+    _, _, status, paid_at = state
+    if status != "PAID" or not paid_at:
+        return None
+    return timezone.localdate(paid_at) if timezone.is_aware(paid_at) else paid_at.date()
+
+
+def _bump(model, lookup, changes, create_defaults=None):
+    """Row pe F() deltas; row na ho aur create_defaults diye hain toh pehle bana do."""
+    changes = {field: F(field) + value for field, value in changes.items() if value}
+    if not changes:
+        return
+    if "updated_at" in {f.name for f in model._meta.concrete_fields}:
+        changes["updated_at"] = timezone.now()
+    if model.objects.filter(**lookup).update(**changes) or create_defaults is None:
+        return
+    model.objects.get_or_create(**lookup, defaults=create_defaults)
+    model.objects.filter(**lookup).update(**changes)
+
+
+def _apply(before, after, create):
+    """
+    Purane (before) state ka contribution hatao, naye (after) ka lagao.
+    create=False (delete path): missing rows nahi banate — cascade delete mein
+    student / balance row ja chuki ho sakti hai.
+    """
+    from .models import FeeCollectionDay, OrganizationFeeBalance, StudentFeeBalance, StudentProfile
+
+    students = defaultdict(lambda: dict.fromkeys(BALANCE_FIELDS, 0))
+    collections = defaultdict(lambda: [Decimal(0), 0])
+    for state, sign in ((before, -1), (after, +1)):
+        if not state or not state[0]:
+            continue
+        for field, value in _contribution(state).items():
+            students[state[0]][field] += sign * value
+        day = _collection_day(state)
+        if day is not None:
+            collections[(state[0], day)][0] += sign * _contribution(state)["paid_total"]
+            collections[(state[0], day)][1] += sign
+
+    organization_of = dict(StudentProfile.objects.filter(pk__in=list(students)).values_list("id", "organization_id"))
+    organizations = defaultdict(lambda: dict.fromkeys(BALANCE_FIELDS, 0))
+    with transaction.atomic():
+        for student_id, changes in students.items():
+            organization_id = organization_of.get(student_id)
+            if organization_id is None:
+                continue
+            _bump(StudentFeeBalance, {"student_id": student_id}, changes,
+                  {"organization_id": organization_id} if create else None)
+            for field, value in changes.items():
+                organizations[organization_id][field] += value
+        for organization_id, changes in organizations.items():
+            _bump(OrganizationFeeBalance, {"organization_id": organization_id}, changes, {} if create else None)
+        for (student_id, day), (amount, payments) in collections.items():
+            organization_id = organization_of.get(student_id)
+            if organization_id is not None:
+                _bump(FeeCollectionDay, {"organization_id": organization_id, "date": day},
+                      {"amount": amount, "payments": payments}, {} if create else None)
+
+        if after and after[0] and after[2] == "PAID" and after[3]:
+            StudentFeeBalance.objects.filter(student_id=after[0]).filter(
+                Q(last_paid_at__isnull=True) | Q(last_paid_at__lt=after[3])
+            ).update(last_paid_at=after[3])
+
+
+def remember_fee_state(sender, instance, **kwargs):
+    instance._ledger_state = _state(instance)
+
+
+def fee_saved(sender, instance, created=False, **kwargs):
+    before = None if created else getattr(instance, "_ledger_state", None)
+    after = _state(instance)
+    instance._ledger_state = after
+    if before == after:
+        return  # transaction_id / fee_type jaisa kuch badla
+    _apply(before, after, create=True)
+
+
+def fee_deleted(sender, instance, **kwargs):
+    _apply(getattr(instance, "_ledger_state", None) or _state(instance), None, create=False)
+
+
+def move_student(student_id, organization_id):
+    """
+    Student ne school badla — balance row, school totals aur daily collections
+    naye school pe. rebuild() bhi student ka current organization hi leta hai,
+    isliye dono raaste ek hi jawab dete hain.
+    """
+    from .models import FeeCollectionDay, OrganizationFeeBalance, StudentFee, StudentFeeBalance
+
+    with transaction.atomic():
+        balance = StudentFeeBalance.objects.select_for_update().filter(student_id=student_id).first()
+        if balance is None or balance.organization_id == organization_id:
+            return  # Koi fee hi nahi / pehle se wahi school
+        previous = balance.organization_id
+        totals = {field: getattr(balance, field) for field in BALANCE_FIELDS}
+        balance.organization_id = organization_id
+        balance.save(update_fields=["organization", "updated_at"])
+        _bump(OrganizationFeeBalance, {"organization_id": previous}, {f: -v for f, v in totals.items()})
+        _bump(OrganizationFeeBalance, {"organization_id": organization_id}, totals, {})
+
+        collections = defaultdict(lambda: [Decimal(0), 0])
+        paid = StudentFee.objects.filter(student_id=student_id, status="PAID", paid_at__isnull=False)
+        for state in paid.values_list("student_id", "amount", "status", "paid_at"):
+            day = collections[_collection_day(state)]
+            day[0] += state[1]
+            day[1] += 1
+        for day, (amount, payments) in collections.items():
+            _bump(FeeCollectionDay, {"organization_id": previous, "date": day},
+                  {"amount": -amount, "payments": -payments})
+            _bump(FeeCollectionDay, {"organization_id": organization_id, "date": day},
+                  {"amount": amount, "payments": payments}, {})
+
+
+def remember_student_organization(sender, instance, **kwargs):
+    instance._ledger_organization_id = instance.__dict__.get("organization_id")
+
+
+def student_saved(sender, instance, created=False, **kwargs):
+    previous = getattr(instance, "_ledger_organization_id", None)
+    instance._ledger_organization_id = instance.organization_id
+    if not created and previous is not None and previous != instance.organization_id:
+        move_student(instance.pk, instance.organization_id)
+
+
+# ── Set-based (nightly / rebuild) ─────────────────────────────────────
+
+def _fees_of_student():
+    from .models import StudentFee
+    return StudentFee.objects.filter(student=OuterRef("student")).order_by().values("student")
+
+
+def _total(queryset, field="amount", integer=False, **filters):
+    return Coalesce(
+        Subquery(queryset.filter(**filters).annotate(value=Sum(field)).values("value")),
+        Value(0 if integer else Decimal(0)),
+        output_field=IntegerField() if integer else DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def _count(queryset, **filters):
+    return Coalesce(
+        Subquery(queryset.filter(**filters).annotate(value=Count("pk")).values("value")),
+        Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def resync_students(student_ids=None):
+    """StudentFeeBalance rows fees se dobara (SQL mein, correlated subqueries). None = saare."""
+    from .models import StudentFeeBalance
+
+    fees = _fees_of_student()
+    values = {
+        "outstanding": _total(fees, status__in=UNPAID),
+        "overdue": _total(fees, status="OVERDUE"),
+        "paid_total": _total(fees, status="PAID"),
+        "pending_count": _count(fees, status="PENDING"),
+        "overdue_count": _count(fees, status="OVERDUE"),
+        "last_paid_at": Subquery(fees.filter(status="PAID").annotate(value=Max("paid_at")).values("value")),
+        "updated_at": timezone.now(),
+    }
+    if student_ids is None:
+        return StudentFeeBalance.objects.update(**values)
+    student_ids = list(student_ids)
+    updated = 0
+    for start in range(0, len(student_ids), SQL_BATCH):
+        updated += StudentFeeBalance.objects.filter(student_id__in=student_ids[start:start + SQL_BATCH]).update(**values)
+    return updated
+
+
+def resync_organizations(organization_ids=None):
+    """OrganizationFeeBalance = student balances ka roll-up (fees table nahi chhoota)."""
+    from .models import OrganizationFeeBalance, StudentFeeBalance
+
+    balances = StudentFeeBalance.objects.filter(organization=OuterRef("organization")).order_by().values("organization")
+    values = {field: _total(balances, field, integer=field.endswith("_count")) for field in BALANCE_FIELDS}
+    queryset = OrganizationFeeBalance.objects.all()
+    if organization_ids is not None:
+        queryset = queryset.filter(organization_id__in=list(organization_ids))
+    return queryset.update(**values, updated_at=timezone.now())
+
+
+def mark_overdue(today=None):
+    """PENDING + due_date nikal gayi -> OVERDUE, ek UPDATE mein. Returns (fees flipped, students)."""
+    from .models import StudentFee, StudentFeeBalance
+
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        due = StudentFee.objects.filter(status="PENDING", due_date__lt=today)
+        student_ids = list(due.values_list("student_id", flat=True).distinct())
+        if not student_ids:
+            return 0, 0
+        flipped = due.update(status="OVERDUE")
+        resync_students(student_ids)
+        organization_ids = set()
+        for start in range(0, len(student_ids), SQL_BATCH):
+            organization_ids.update(StudentFeeBalance.objects.filter(
+                student_id__in=student_ids[start:start + SQL_BATCH]
+            ).values_list("organization_id", flat=True))
+        resync_organizations(organization_ids)
+    return flipped, len(student_ids)
+
+
+def refresh_aging(today=None):
+    """Overdue amount ko due date se umar ke buckets mein — ek GROUP BY (sirf OVERDUE rows)."""
+    from .models import OrganizationFeeBalance, StudentFee
+
+    today = today or timezone.localdate()
+    buckets = {}
+    for field, start, end in AGING_BUCKETS:
+        condition = Q(due_date__lte=today - timedelta(days=start))
+        if end is not None:
+            condition &= Q(due_date__gte=today - timedelta(days=end))
+        buckets[field] = Coalesce(Sum("amount", filter=condition), Value(Decimal(0)),
+                                  output_field=DecimalField(max_digits=14, decimal_places=2))
+    rows = StudentFee.objects.filter(status="OVERDUE").values(
+        organization_id=F("student__organization_id")
+    ).annotate(**buckets).order_by()
+
+    with transaction.atomic():
+        OrganizationFeeBalance.objects.update(aging_as_of=today, **{field: 0 for field, _, _ in AGING_BUCKETS})
+        for row in rows:
+            organization_id = row.pop("organization_id")
+            OrganizationFeeBalance.objects.get_or_create(organization_id=organization_id)
+            OrganizationFeeBalance.objects.filter(organization_id=organization_id).update(aging_as_of=today, **row)
+    return len(rows)
+
+
+def rebuild():
+    """Poora ledger fees se dobara — backfill / bulk import ke baad."""
+    from .models import FeeCollectionDay, OrganizationFeeBalance, StudentFee, StudentFeeBalance, StudentProfile
+
+    with transaction.atomic():
+        pairs = StudentFee.objects.values_list("student_id", "student__organization_id").distinct().order_by()
+        StudentFeeBalance.objects.bulk_create(
+            [StudentFeeBalance(student_id=s, organization_id=o) for s, o in pairs.iterator()],
+            ignore_conflicts=True, batch_size=1000,
+        )
+        # Purane rows bhi student ke current school pe (school queryset.update se badla ho toh)
+        StudentFeeBalance.objects.update(organization_id=Subquery(
+            StudentProfile.objects.filter(pk=OuterRef("student_id")).values("organization_id")[:1]
+        ))
+        organization_ids = StudentFeeBalance.objects.values_list("organization_id", flat=True).distinct().order_by()
+        OrganizationFeeBalance.objects.bulk_create(
+            [OrganizationFeeBalance(organization_id=o) for o in organization_ids], ignore_conflicts=True,
+        )
+        resync_students()
+        resync_organizations()
+
+        FeeCollectionDay.objects.all().delete()
+        days = StudentFee.objects.filter(status="PAID", paid_at__isnull=False).values(
+            organization_id=F("student__organization_id"), date=TruncDate("paid_at")
+        ).annotate(amount=Sum("amount"), payments=Count("pk")).order_by()
+        FeeCollectionDay.objects.bulk_create([FeeCollectionDay(**row) for row in days], batch_size=1000)
+
+
+# ── Reads ─────────────────────────────────────────────────────────────
+
+def organization_dashboard(organization, days=DEFAULT_DASHBOARD_DAYS):
+    """Collection dashboard — sirf materialized tables se."""
+    from .models import FeeCollectionDay, OrganizationFeeBalance, StudentFeeBalance
+
+    days = max(1, min(days, MAX_DASHBOARD_DAYS))
+    since = timezone.localdate() - timedelta(days=days - 1)
+    balance = OrganizationFeeBalance.objects.filter(organization=organization).first()
+    daily = list(FeeCollectionDay.objects.filter(organization=organization, date__gte=since)
+                 .order_by("date").values("date", "amount", "payments"))
+    defaulters = (StudentFeeBalance.objects.filter(organization=organization, overdue__gt=0)
+                  .select_related("student__user").order_by("-overdue")[:TOP_DEFAULTERS])
+
+    zero = Decimal("0.00")
+    return {
+        "outstanding": balance.outstanding if balance else zero,
+        "overdue": balance.overdue if balance else zero,
+        "collected_total": balance.paid_total if balance else zero,
+        "pending_count": balance.pending_count if balance else 0,
+        "overdue_count": balance.overdue_count if balance else 0,
+        "aging": {field.replace("aging_", ""): getattr(balance, field) if balance else zero
+                  for field, _, _ in AGING_BUCKETS},
+        "aging_as_of": balance.aging_as_of if balance else None,
+        "collections": {
+            "days": days,
+            "total": sum((row["amount"] for row in daily), zero),
+            "daily": daily,
+        },
+        "top_defaulters": [{
+            "student_id": item.student_id,
+            "student_unique_id": item.student.student_unique_id,
+            "student_name": item.student.user.get_full_name(),
+            "overdue": item.overdue,
+            "overdue_count": item.overdue_count,
+        } for item in defaulters],
+    }
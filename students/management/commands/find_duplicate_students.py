@@ -0,0 +1,61 @@
+import csv
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from organizations.models import Organization
+from students.dedupe import DEFAULT_MIN_SCORE, MAX_BLOCK_SIZE, find_duplicates, load_records
+
+REPORT_COLUMNS = (
+    "cluster", "action", "student_id", "student_unique_id", "name",
+    "mobile", "dob", "created_at", "score", "reasons",
+)
+
+
+class Command(BaseCommand):
+    help = 'Duplicate students dhoondh ke har organization ki merge-suggestion CSV report banata hai (kuch merge nahi karta)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organization', action='append', dest='organizations',
+                            help='Sirf is organization ke students (UUID, repeat kar sakte ho)')
+        parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                            help=f'Pair kitna milna chahiye (0-1, default {DEFAULT_MIN_SCORE})')
+        parser.add_argument('--max-block-size', type=int, default=MAX_BLOCK_SIZE,
+                            help='Isse bade blocking groups skip (e.g. school ka common number)')
+        parser.add_argument('--output', default='duplicate_reports',
+                            help='Reports ka folder — har organization ki ek CSV')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        records = load_records(options['organizations'])
+        loaded = time.monotonic()
+        self.stdout.write(f"{len(records['id'])} students load hue ({loaded - started:.1f}s).")
+
+        result = find_duplicates(records, options['min_score'], options['max_block_size'])
+        self.stdout.write(
+            f"{result['pairs']} candidate pairs score kiye, {result['skipped_blocks']} bade blocks skip "
+            f"({time.monotonic() - loaded:.1f}s)."
+        )
+
+        suggestions = result['suggestions']
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS('Koi duplicate nahi mila.'))
+            return
+
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        names = dict(Organization.objects.filter(id__in=list(suggestions)).values_list('id', 'name'))
+
+        for org_id, rows in sorted(suggestions.items(), key=lambda item: -len(item[1])):
+            path = output / f"duplicates_{org_id}.csv"
+            with path.open('w', newline='', encoding='utf-8') as handle:
+                writer = csv.DictWriter(handle, fieldnames=REPORT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
+            merges = sum(1 for row in rows if row['action'] == 'MERGE')
+            self.stdout.write(f"  {names.get(org_id, org_id)}: {merges} merge suggestions -> {path}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! {len(suggestions)} organizations ki reports {output}/ mein ({time.monotonic() - started:.1f}s)."
+        ))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from students import fee_ledger
+
+
+class Command(BaseCommand):
+    help = 'Nightly fee ledger: PENDING -> OVERDUE (set-based), balances resync, aging buckets refresh'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Is date (YYYY-MM-DD) ke hisaab se chalao; default: aaj (local)')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Pehle saare balances + daily collections fees se dobara banao (backfill)')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            today = parse_date(options['date'])
+            if today is None:
+                raise CommandError('Bhai, --date YYYY-MM-DD format mein do.')
+
+        started = time.monotonic()
+        if options['rebuild']:
+            fee_ledger.rebuild()
+            self.stdout.write('Ledger fees se dobara ban gaya.')
+        flipped, students = fee_ledger.mark_overdue(today)
+        organizations = fee_ledger.refresh_aging(today)
+        self.stdout.write(self.style.SUCCESS(
+            f'{flipped} fees OVERDUE ({students} students), {organizations} schools ka aging refresh — '
+            f'{time.monotonic() - started:.1f}s.'
+        ))
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-19 10:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0004_alter_organization_admin_alter_organization_pincode_and_more'),
+        ('students', '0003_studentfee_paid_at_and_more'),
+        ('students_classroom', '0009_session_waitlist'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentPromotion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False)),
+                ('outcome', models.CharField(choices=[('PROMOTED', 'Promoted'), ('DETAINED', 'Detained'), ('LEFT', 'Left School')], default='PROMOTED', max_length=10)),
+                ('academic_year', models.CharField(blank=True, help_text='e.g. 2025-26', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('from_standard', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='students_classroom.standard')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_promotions', to='organizations.organization')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promotions', to='students.studentprofile')),
+                ('to_standard', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='students_classroom.standard')),
+            ],
+            options={
+                'verbose_name': 'Student Promotion',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['organization', 'academic_year'], name='students_st_organiz_76dfbb_idx'), models.Index(fields=['student', 'created_at'], name='students_st_student_28e371_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 10:46
+
+import normal_user.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_studentpromotion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=normal_user.storage.blob_storage, upload_to='students/profiles/'),
+        ),
+    ]
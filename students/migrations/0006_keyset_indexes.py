@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 10:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_keyset_indexes'),
+        ('students', '0005_profile_picture_blob_storage'),
+        ('students_classroom', '0010_join_request_inbox_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='students_st_is_acti_5a194b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['organization', 'is_active', '-created_at', '-id'], name='students_st_organiz_5b92b9_idx'),
+        ),
+    ]
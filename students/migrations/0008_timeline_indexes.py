@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-19 10:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_student_id_sequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(fields=['student', '-due_date', '-id'], name='students_st_student_5bd23d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentresult',
+            index=models.Index(fields=['student', '-exam_date', '-id'], name='students_st_student_5d3c09_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsession',
+            index=models.Index(fields=['student', '-session_date', '-id'], name='students_st_student_0e4b33_idx'),
+        ),
+    ]
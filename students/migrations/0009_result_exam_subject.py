@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 10:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_report_card'),
+        ('students', '0008_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentresult',
+            name='exam_subject',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='results', to='exams.examsubject'),
+        ),
+        migrations.AddField(
+            model_name='studentresult',
+            name='remarks',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
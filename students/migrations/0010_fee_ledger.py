@@ -0,0 +1,101 @@
+# Generated by Django 6.0 on 2026-10-19 11:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_keyset_indexes'),
+        ('students', '0009_result_exam_subject'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeCollectionDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payments', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Fee Collection Day',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrganizationFeeBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('outstanding', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('overdue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('overdue_count', models.IntegerField(default=0)),
+                ('aging_1_30', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('aging_31_60', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('aging_61_90', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('aging_90_plus', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('aging_as_of', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Organization Fee Balance',
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentFeeBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('outstanding', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('overdue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('paid_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('overdue_count', models.IntegerField(default=0)),
+                ('last_paid_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Student Fee Balance',
+            },
+        ),
+        migrations.AddField(
+            model_name='studentfee',
+            name='fee_type',
+            field=models.CharField(choices=[('TUITION', 'Tuition Fee'), ('ADMISSION', 'Admission Fee'), ('EXAM', 'Exam Fee'), ('TRANSPORT', 'Transport Fee'), ('HOSTEL', 'Hostel Fee'), ('OTHER', 'Other')], default='TUITION', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(fields=['status', 'due_date'], name='students_st_status_af22fd_idx'),
+        ),
+        migrations.AddField(
+            model_name='feecollectionday',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fee_collection_days', to='organizations.organization'),
+        ),
+        migrations.AddField(
+            model_name='organizationfeebalance',
+            name='organization',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fee_balance', to='organizations.organization'),
+        ),
+        migrations.AddField(
+            model_name='studentfeebalance',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_fee_balances', to='organizations.organization'),
+        ),
+        migrations.AddField(
+            model_name='studentfeebalance',
+            name='student',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fee_balance', to='students.studentprofile'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='feecollectionday',
+            unique_together={('organization', 'date')},
+        ),
+        migrations.AddIndex(
+            model_name='studentfeebalance',
+            index=models.Index(fields=['organization', '-overdue'], name='students_st_organiz_005300_idx'),
+        ),
+    ]
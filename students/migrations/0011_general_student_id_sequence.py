@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 12:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_keyset_indexes'),
+        ('students', '0010_fee_ledger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentidsequence',
+            name='organization',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='student_id_sequences', to='organizations.organization'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentidsequence',
+            constraint=models.UniqueConstraint(condition=models.Q(('organization__isnull', True)), fields=('year',), name='unique_general_student_id_sequence'),
+        ),
+    ]
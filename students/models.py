@@ -3,6 +3,7 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
+from normal_user.storage import blob_storage
 
 # ────────────────────────────────────────────────
 # 1. Student Profile Model
@@ -38,7 +39,7 @@ class StudentProfile(models.Model):
 
     # Metadata for 'explore' action
     bio = models.TextField(blank=True, null=True)
-    profile_picture = models.ImageField(upload_to='students/profiles/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='students/profiles/', storage=blob_storage, blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -47,6 +48,11 @@ class StudentProfile(models.Model):
         verbose_name = "Student Profile"
         ordering = ['-created_at']
         unique_together = ('organization', 'student_unique_id')
+        indexes = [
+            # explore keyset pagination (?pagination=cursor) — (created_at, id) DESC
+            models.Index(fields=['is_active', '-created_at', '-id']),
+            models.Index(fields=['organization', 'is_active', '-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} ({self.student_unique_id})"
@@ -78,6 +84,12 @@ class StudentSession(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Timeline stream: (student) pe (session_date, id) DESC keyset
+            models.Index(fields=['student', '-session_date', '-id']),
+        ]
+
     def __str__(self):
         return f"{self.subject} - {self.student.user.first_name}"
 
@@ -95,11 +107,23 @@ class StudentResult(models.Model):
     total_marks = models.DecimalField(max_digits=5, decimal_places=2)
     exam_date = models.DateField(db_index=True)
     grade = models.CharField(max_length=5, blank=True)
+    # Exam timetable ka subject — report card (exams.report_cards) isi se term + subject jodta hai
+    exam_subject = models.ForeignKey(
+        'exams.ExamSubject',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='results'
+    )
+    remarks = models.CharField(max_length=255, blank=True)
 
     class Meta:
         # 'views.py' uses order_by("-exam__date"), so we need either a ForeignKey to Exam 
         # or we use exam_date here. Let's keep it simple for now.
         ordering = ['-exam_date']
+        indexes = [
+            models.Index(fields=['student', '-exam_date', '-id']),  # timeline stream
+        ]
 
 # ────────────────────────────────────────────────
 # 4. Student Fee (Financial Tracking)
@@ -113,7 +137,16 @@ class StudentFee(models.Model):
         ('PENDING', 'Pending'),
         ('OVERDUE', 'Overdue'),
     )
+    FEE_TYPE_CHOICES = (
+        ('TUITION', 'Tuition Fee'),
+        ('ADMISSION', 'Admission Fee'),
+        ('EXAM', 'Exam Fee'),
+        ('TRANSPORT', 'Transport Fee'),
+        ('HOSTEL', 'Hostel Fee'),
+        ('OTHER', 'Other'),
+    )
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='fees')
+    fee_type = models.CharField(max_length=20, choices=FEE_TYPE_CHOICES, default='TUITION')
     amount = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     due_date = models.DateField(db_index=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
@@ -124,6 +157,199 @@ class StudentFee(models.Model):
         db_index=True,
         help_text="Jis din asliyat mein payment received hui"
     )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', '-due_date', '-id']),  # timeline stream
+            models.Index(fields=['status', 'due_date']),  # nightly PENDING -> OVERDUE flip (fee_ledger)
+        ]
     
     def __str__(self):
-        return f"{self.student.student_unique_id} - {self.amount} ({self.status})"
\ No newline at end of file
+        return f"{self.student.student_unique_id} - {self.amount} ({self.status})"
+
+    def mark_paid(self, transaction_id=None, paid_at=None):
+        """Payment record karo — balances / daily collection signals se update hote hain (fee_ledger)."""
+        from django.utils import timezone
+
+        self.status = 'PAID'
+        self.paid_at = paid_at or timezone.now()
+        if transaction_id:
+            self.transaction_id = transaction_id
+        self.save(update_fields=['status', 'paid_at', 'transaction_id'])
+
+
+# ────────────────────────────────────────────────
+# 5. Student Promotion History (Year-end Rollover)
+# ────────────────────────────────────────────────
+class StudentPromotion(models.Model):
+    """
+    Har rollover run mein har student ka ek row: kahan se kahan gaya (ya detain / left).
+    Ek run ke saare rows same `batch_id` share karte hain.
+    """
+    class Outcome(models.TextChoices):
+        PROMOTED = 'PROMOTED', _('Promoted')
+        DETAINED = 'DETAINED', _('Detained')
+        LEFT = 'LEFT', _('Left School')
+
+    batch_id = models.UUIDField(default=uuid.uuid4, db_index=True, editable=False)
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='student_promotions'
+    )
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='promotions')
+    from_standard = models.ForeignKey(
+        'students_classroom.Standard',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    to_standard = models.ForeignKey(
+        'students_classroom.Standard',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    outcome = models.CharField(max_length=10, choices=Outcome.choices, default=Outcome.PROMOTED)
+    academic_year = models.CharField(max_length=20, blank=True, help_text="e.g. 2025-26")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Student Promotion"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['organization', 'academic_year']),
+            models.Index(fields=['student', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id}: {self.from_standard_id} -> {self.to_standard_id} ({self.outcome})"
+
+
+# ────────────────────────────────────────────────
+# 6. Student ID Sequence (per organization, per year)
+# ────────────────────────────────────────────────
+class StudentIdSequence(models.Model):
+    """
+    `student_unique_id` ka counter. Workers isme se blocks reserve karte hain
+    (students.sequences) — random number + unique index pe retry ki zarurat nahi.
+    next_value = agla block yahin se shuru hoga; beech ke gaps allowed hain.
+    organization NULL = bina school wale sessions ka "GEN" sequence.
+    """
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='student_id_sequences'
+    )
+    year = models.PositiveSmallIntegerField()
+    next_value = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Student ID Sequence"
+        unique_together = ('organization', 'year')
+        constraints = [
+            # NULL unique_together mein distinct hota hai — GEN ka ek hi row per year
+            models.UniqueConstraint(
+                fields=['year'],
+                condition=models.Q(organization__isnull=True),
+                name='unique_general_student_id_sequence',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.organization_id} / {self.year}: next {self.next_value}"
+
+
+# ────────────────────────────────────────────────
+# 7. Fee Ledger (materialized balances — students.fee_ledger)
+# ────────────────────────────────────────────────
+class StudentFeeBalance(models.Model):
+    """
+    Ek student ka fee summary. StudentFee save / delete pe signals F() deltas
+    lagate hain; nightly `refresh_fee_ledger` set-based resync karta hai.
+    outstanding = PENDING + OVERDUE.
+    """
+    student = models.OneToOneField(StudentProfile, on_delete=models.CASCADE, related_name='fee_balance')
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='student_fee_balances'
+    )
+    outstanding = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overdue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    pending_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
+    last_paid_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Student Fee Balance"
+        indexes = [
+            models.Index(fields=['organization', '-overdue']),  # dashboard: top defaulters
+        ]
+
+    def __str__(self):
+        return f"{self.student_id}: {self.outstanding} outstanding ({self.overdue} overdue)"
+
+
+class OrganizationFeeBalance(models.Model):
+    """
+    School-level fee totals (student balances ka roll-up) + aging buckets.
+    Aging (overdue amount, due date se kitne din) nightly job banata hai — `aging_as_of`.
+    """
+    organization = models.OneToOneField(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='fee_balance'
+    )
+    outstanding = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    overdue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pending_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
+    aging_1_30 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    aging_31_60 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    aging_61_90 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    aging_90_plus = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    aging_as_of = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Organization Fee Balance"
+
+    def __str__(self):
+        return f"{self.organization_id}: {self.outstanding} outstanding"
+
+
+class FeeCollectionDay(models.Model):
+    """Din-wise collection (paid_at ki local date) — dashboard ka daily totals chart."""
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='fee_collection_days'
+    )
+    date = models.DateField()
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payments = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Fee Collection Day"
+        unique_together = ('organization', 'date')
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.organization_id} {self.date}: {self.amount} ({self.payments})"
+
@@ -23,12 +23,10 @@ class IsTeacherOfStudent(permissions.BasePermission):
         if not hasattr(request.user, 'teacher_profile'):
             return False
             
-        # Check: Kya ye teacher is student ke kisi bhi session se juda hai?
-        from .models import StudentSession
-        return StudentSession.objects.filter(
-            student=obj, 
-            teacher=request.user.teacher_profile
-        ).exists()
+        # Check: Kya ye teacher is student ke kisi bhi session / class / enrollment se juda hai?
+        # Precomputed set (students.access) — har request pe query nahi
+        from .access import teacher_can_access
+        return teacher_can_access(request.user, obj)
 
 class CanApproveParentRequest(permissions.BasePermission):
     """
@@ -0,0 +1,163 @@
+"""
+Academic year rollover / class promotion engine.
+
+Input ek mapping hai (Class 5-A -> Class 6-A, ...) plus detained aur left students.
+- Students ek SELECT mein snapshot hote hain (history ke liye ids chahiye) —
+  transaction ke andar, `select_for_update()` ke saath, taaki history aur
+  UPDATE dono same rows dekhein.
+- Har mapping ke liye ek set-based UPDATE chalta hai, sirf snapshot ki ids pe
+  (`WHERE id IN (...)`), upar wali classes pehle taaki 5-A ke bacche 6-A
+  mein jaake dobara 7-A mein na khisak jaayein.
+- History `StudentPromotion` mein bulk_create hoti hai.
+- dry_run=True sirf counts batata hai, kuch likhta nahi.
+"""
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.utils import timezone
+
+from students_classroom.models import Standard
+from .access import invalidate_class_teachers
+from .models import StudentProfile, StudentPromotion
+
+HISTORY_BATCH_SIZE = 1000
+
+
+class RolloverError(ValueError):
+    pass
+
+
+def _ordered_moves(mapping: Dict[int, int]) -> List[tuple]:
+    """
+    Moves ko aise order karo ki koi class tab tak target na bane jab tak uske
+    apne bacche aage shift na ho jaayein (12 -> pehle, 5 -> baad mein).
+    """
+    pending = dict(mapping)
+    ordered = []
+    while pending:
+        ready = [src for src, dst in pending.items() if dst not in pending or dst == src]
+        if not ready:
+            raise RolloverError("Mapping mein cycle hai (e.g. A -> B aur B -> A). Ek hi run mein ye possible nahi.")
+        for src in ready:
+            ordered.append((src, pending.pop(src)))
+    return ordered
+
+
+@transaction.atomic
+def run_rollover(
+    organization_id,
+    mapping: Dict[int, int],
+    detained: Iterable[int] = (),
+    left: Iterable[int] = (),
+    academic_year: str = "",
+    dry_run: bool = False,
+    user=None,
+) -> dict:
+    mapping = {int(src): int(dst) for src, dst in mapping.items()}
+    detained = {int(pk) for pk in detained}
+    left = {int(pk) for pk in left}
+
+    if detained & left:
+        raise RolloverError("Ek hi student detained aur left dono nahi ho sakta.")
+
+    # 1. Saari classes isi school ki honi chahiye (1 query)
+    standard_ids = set(mapping) | set(mapping.values())
+    found = set(
+        Standard.objects.filter(organization_id=organization_id, id__in=standard_ids)
+        .values_list("id", flat=True)
+    )
+    if found != standard_ids:
+        raise RolloverError(f"Ye classes is school ki nahi hain: {sorted(standard_ids - found)}")
+
+    moves = _ordered_moves(mapping)
+
+    # 2. Students ka snapshot (1 query): mapped classes + detained/left wale.
+    #    Rows lock karo — beech mein koi admission / transfer snapshot ke bahar na rahe
+    students = StudentProfile.objects.filter(organization_id=organization_id)
+    if not dry_run:
+        students = students.select_for_update()
+    rows = list(
+        students.filter(is_active=True, current_standard_id__in=set(mapping))
+        .values_list("id", "current_standard_id")
+    )
+    held = detained | left
+    extra_ids = held - {pk for pk, _ in rows}
+    if extra_ids:
+        rows += list(students.filter(id__in=extra_ids).values_list("id", "current_standard_id"))
+    current = dict(rows)
+
+    unknown = held - set(current)
+    if unknown:
+        raise RolloverError(f"Ye students is school mein nahi mile: {sorted(unknown)}")
+
+    per_source = Counter(std for pk, std in rows if pk not in held)
+    report = {
+        "dry_run": dry_run,
+        "academic_year": academic_year,
+        "moves": [
+            {"from_standard": src, "to_standard": dst, "students": per_source.get(src, 0)}
+            for src, dst in moves
+        ],
+        "promoted": sum(per_source.get(src, 0) for src, _ in moves),
+        "detained": len(detained),
+        "left": len(left),
+        "batch_id": None,
+    }
+    if dry_run:
+        return report
+
+    batch_id = uuid.uuid4()
+    now = timezone.now()
+    history = [
+        StudentPromotion(
+            batch_id=batch_id, organization_id=organization_id, student_id=pk,
+            from_standard_id=std, to_standard_id=mapping[std],
+            outcome=StudentPromotion.Outcome.PROMOTED,
+            academic_year=academic_year, created_by=user,
+        )
+        for pk, std in rows if pk not in held and std in mapping
+    ]
+    history += [
+        StudentPromotion(
+            batch_id=batch_id, organization_id=organization_id, student_id=pk,
+            from_standard_id=current[pk], to_standard_id=current[pk],
+            outcome=StudentPromotion.Outcome.DETAINED,
+            academic_year=academic_year, created_by=user,
+        )
+        for pk in detained
+    ]
+    history += [
+        StudentPromotion(
+            batch_id=batch_id, organization_id=organization_id, student_id=pk,
+            from_standard_id=current[pk], to_standard_id=None,
+            outcome=StudentPromotion.Outcome.LEFT,
+            academic_year=academic_year, created_by=user,
+        )
+        for pk in left
+    ]
+
+    # 3. Har mapping ka ek UPDATE (top classes pehle), sirf snapshot wali ids pe
+    by_source = {}
+    for pk, std in rows:
+        if pk not in held:
+            by_source.setdefault(std, []).append(pk)
+    for src, dst in moves:
+        if src != dst and by_source.get(src):
+            StudentProfile.objects.filter(id__in=by_source[src]).update(current_standard_id=dst, updated_at=now)
+
+    if left:
+        StudentProfile.objects.filter(id__in=left).update(
+            is_active=False, current_standard=None, updated_at=now
+        )
+
+    StudentPromotion.objects.bulk_create(history, batch_size=HISTORY_BATCH_SIZE)
+
+    # .update() signals nahi bhejta — purani + nayi classes ke class teachers ke access sets
+    touched = {standard for src, dst in moves if src != dst for standard in (src, dst)}
+    touched.update(current[pk] for pk in left)
+    invalidate_class_teachers(touched)
+
+    report["batch_id"] = str(batch_id)
+    return report
@@ -0,0 +1,94 @@
+"""
+Student ID allocator: `{year}-{ORG}-{number}` (e.g. "2026-DPS-0042").
+
+Pehle number random tha (1000-9999) — school mein kuch hazaar students ke baad
+(organization, student_unique_id) unique index pe collision, failed transaction
+aur retry. Ab StudentIdSequence (organization, year) se numbers aate hain:
+
+- Har worker process ek baar mein BLOCK_SIZE numbers reserve karta hai (ek
+  chhota row-lock + UPDATE), phir block khatam hone tak DB ko touch hi nahi karta.
+- Block ka bacha hissa sirf commit ke baad cache hota hai — caller ka
+  transaction rollback hua toh counter bhi wapas, cache mein kuch nahi.
+- Process restart / unused block = gaps. Numbers strictly continuous nahi hain,
+  bas unique hain.
+- Pehli baar (org, year) ka row bante waqt purane random IDs ka max dekh ke
+  uske baad se shuru hota hai, taaki legacy IDs se takraav na ho.
+"""
+import datetime
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import StudentIdSequence, StudentProfile
+
+BLOCK_SIZE = getattr(settings, "STUDENT_ID_BLOCK_SIZE", 20)
+
+_blocks = {}  # (organization_id, year) -> [next, stop)
+_lock = threading.Lock()
+
+
+def org_prefix(organization):
+    return organization.name[:3].upper() if organization and organization.name else "GEN"
+
+
+def format_student_id(organization, year, number):
+    return f"{year}-{org_prefix(organization)}-{number:04d}"
+
+
+def _legacy_start(organization, year):
+    """Is (org, year) ke existing `{year}-{ORG}-<digits>` IDs ka max + 1."""
+    prefix = f"{year}-{org_prefix(organization)}-"
+    existing = StudentProfile.objects.filter(
+        organization=organization, student_unique_id__startswith=prefix
+    ).values_list("student_unique_id", flat=True)
+    numbers = [int(value[len(prefix):]) for value in existing if value[len(prefix):].isdigit()]
+    return max(numbers, default=0) + 1
+
+
+def _reserve_block(organization, year, size):
+    with transaction.atomic():
+        sequence = StudentIdSequence.objects.select_for_update().filter(
+            organization=organization, year=year
+        ).first()
+        if sequence is None:
+            sequence, _ = StudentIdSequence.objects.select_for_update().get_or_create(
+                organization=organization, year=year,
+                defaults={"next_value": _legacy_start(organization, year)},
+            )
+        start = sequence.next_value
+        sequence.next_value = start + size
+        sequence.save(update_fields=["next_value", "updated_at"])
+    return start, start + size
+
+
+def _keep_block(key, block):
+    with _lock:
+        current = _blocks.get(key)
+        if current is None or current[0] >= current[1]:
+            _blocks[key] = block
+
+
+def next_student_id(organization, year=None):
+    """Agla `student_unique_id` is organization ke liye (kabhi collide nahi karega)."""
+    year = year or datetime.date.today().year
+    # Session ka organization NULL ho sakta hai — tab "GEN" wala sequence
+    key = (organization.pk if organization else None, year)
+    with _lock:
+        block = _blocks.get(key)
+        if block and block[0] < block[1]:
+            number = block[0]
+            block[0] += 1
+            return format_student_id(organization, year, number)
+
+    start, stop = _reserve_block(organization, year, BLOCK_SIZE)
+    if start + 1 < stop:
+        rest = [start + 1, stop]
+        transaction.on_commit(lambda: _keep_block(key, rest))
+    return format_student_id(organization, year, start)
+
+
+def reset_cached_blocks():
+    """Tests / fork ke baad — process ke cached blocks bhool jao (sirf gaps banenge)."""
+    with _lock:
+        _blocks.clear()
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import StudentProfile, StudentSession, StudentResult, StudentFee
+from .models import StudentProfile, StudentSession, StudentResult, StudentFee, StudentFeeBalance
 from django.contrib.auth import get_user_model
+from normal_user.images import ImageVariantsField
 
 User = get_user_model()
 
@@ -41,12 +42,14 @@ class StudentProfileSerializer(serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
     mobile = serializers.CharField(source='user.mobile', read_only=True)
     email = serializers.EmailField(source='user.email', read_only=True)
+    profile_picture_variants = ImageVariantsField(source='profile_picture')
 
     class Meta:
         model = StudentProfile
         fields = [
             "id", "student_unique_id", "full_name", "mobile", "email",
-            "organization", "current_standard", "is_active", "created_at"
+            "organization", "current_standard", "is_active", "created_at",
+            "profile_picture_variants",
         ]
         read_only_fields = ["student_unique_id", "created_at"]
 
@@ -76,16 +79,21 @@ class StudentSessionSerializer(serializers.ModelSerializer):
 # 4. Academic & Finance Serializers (Point #4)
 # ────────────────────────────────────────────────
 class StudentResultSerializer(serializers.ModelSerializer):
-    subject_name = serializers.CharField(source='subject.name', read_only=True)
-    exam_name = serializers.CharField(source='exam.title', read_only=True)
+    subject_name = serializers.CharField(source='exam_subject.subject_name', read_only=True, default=None)
 
     class Meta:
         model = StudentResult
-        fields = ["id", "exam_name", "subject_name", "marks_obtained", "total_marks", "grade", "remarks"]
+        fields = ["id", "exam_name", "subject_name", "exam_date", "marks_obtained", "total_marks", "grade", "remarks"]
 
 class StudentFeeSerializer(serializers.ModelSerializer):
-    fee_type_display = serializers.CharField(source='fee_type.name', read_only=True)
+    fee_type_display = serializers.CharField(source='get_fee_type_display', read_only=True)
 
     class Meta:
         model = StudentFee
-        fields = ["id", "fee_type_display", "amount", "due_date", "status", "paid_at"]
\ No newline at end of file
+        fields = ["id", "fee_type", "fee_type_display", "amount", "due_date", "status", "paid_at", "transaction_id"]
+
+
+class StudentFeeBalanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StudentFeeBalance
+        fields = ["outstanding", "overdue", "paid_total", "pending_count", "overdue_count", "last_paid_at", "updated_at"]
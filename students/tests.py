@@ -1,3 +1,523 @@
-from django.test import TestCase
+import os
+import subprocess
+import sys
+from datetime import date, timedelta
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attendance.models import Attendance
+from normal_user.cache import shared_cache
+from organizations.models import Organization
+from students_classroom.models import Standard
+from teachers.models import Teacher
+
+from . import access, dedupe, fee_ledger, sequences, timeline
+from .admin import StudentProfileAdmin
+from .models import (
+    FeeCollectionDay, OrganizationFeeBalance, StudentFee, StudentFeeBalance, StudentIdSequence, StudentProfile,
+    StudentPromotion, StudentResult,
+)
+from .rollover import RolloverError, _ordered_moves, run_rollover
+
+User = get_user_model()
+
+
+# ────────────────────────────────────────────────
+# Duplicate detection
+# ────────────────────────────────────────────────
+
+NAME_SCORE_SCRIPT = """
+import django
+import numpy as np
+django.setup()
+from students.dedupe import _name_similarity
+records = {
+    "id": [1, 2, 3],
+    "user__first_name": ["Lakshmi", "Laxmi", "Ravi"],
+    "user__last_name": ["Iyer", "Iyer", "Verma"],
+}
+scores = _name_similarity(records, np.array([0, 0, 1]), np.array([1, 2, 2]))
+print([round(float(score), 6) for score in scores])
+"""
+
+
+@skipIf(dedupe.np is None, "hashed bigram vectors sirf numpy path pe")
+class DedupeScoreStabilityTests(SimpleTestCase):
+    """Duplicate report har run mein same aani chahiye — scores process ke hash seed pe nirbhar nahi."""
+
+    def name_scores(self, hash_seed):
+        env = {**os.environ, "PYTHONHASHSEED": str(hash_seed)}
+        output = subprocess.run(
+            [sys.executable, "-c", NAME_SCORE_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        return output.strip()
+
+    def test_name_scores_do_not_depend_on_hash_seed(self):
+        self.assertEqual(self.name_scores(1), self.name_scores(2))
+
+
+# ────────────────────────────────────────────────
+# Keyset pagination (explore)
+# ────────────────────────────────────────────────
+
+class ExploreCursorPaginationTests(TestCase):
+    """Cursor pages: (created_at, id) order, ties pe bhi na koi row chhute na repeat ho."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            username="staff", email="staff@example.com", password="x", mobile="9000000000", is_staff=True,
+        )
+        cls.school = Organization.objects.create(name="Agra Public School", admin=cls.staff)
+        users = User.objects.bulk_create([
+            User(username=f"student{i}", email=f"student{i}@example.com", mobile=f"91{i:08d}")
+            for i in range(13)
+        ])
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, organization=cls.school, student_unique_id=f"S-{i}")
+            for i, user in enumerate(users)
+        ])
+        # Aadhe rows ka same created_at — tie-breaker id pe
+        same_time = timezone.now() - timedelta(days=1)
+        StudentProfile.objects.filter(pk__in=StudentProfile.objects.order_by("pk").values("pk")[:7]).update(
+            created_at=same_time,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pages_cover_every_row_once(self):
+        expected = list(StudentProfile.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        seen = []
+        data = self.get("/api/v1/students/explore/", pagination="cursor", page_size=4)
+        self.assertNotIn("count", data)
+        while True:
+            seen += [row["id"] for row in data["results"]]
+            if not data["next"]:
+                self.assertFalse(data["has_more"])
+                break
+            self.assertTrue(data["has_more"])
+            data = self.get(data["next"])
+        self.assertEqual(seen, expected)
+
+    def test_default_mode_is_page_number(self):
+        data = self.get("/api/v1/students/explore/", page_size=4)
+        self.assertEqual(data["count"], 13)
+        self.assertNotIn("has_more", data)
+
+    def test_bad_cursor(self):
+        response = self.client.get("/api/v1/students/explore/", {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+
+# ────────────────────────────────────────────────
+# Student ID sequence
+# ────────────────────────────────────────────────
+
+class StudentIdSequenceTests(TestCase):
+    YEAR = 2026
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.school = Organization.objects.create(name="Agra Public School", admin=cls.admin)
+
+    def setUp(self):
+        sequences.reset_cached_blocks()
+        self.addCleanup(sequences.reset_cached_blocks)
+
+    def allocate(self, organization, count):
+        ids = []
+        for _ in range(count):
+            with self.captureOnCommitCallbacks(execute=True):
+                ids.append(sequences.next_student_id(organization, self.YEAR))
+        return ids
+
+    def number(self, student_id):
+        return int(student_id.rsplit("-", 1)[1])
+
+    @mock.patch("students.sequences.BLOCK_SIZE", 3)
+    def test_ids_are_unique_and_increasing_across_blocks(self):
+        ids = self.allocate(self.school, 10)
+        self.assertTrue(all(value.startswith(f"{self.YEAR}-AGR-") for value in ids))
+        numbers = [self.number(value) for value in ids]
+        self.assertEqual(numbers, sorted(set(numbers)))
+        self.assertEqual(StudentIdSequence.objects.get(organization=self.school).next_value, 13)
+
+    def test_starts_after_legacy_ids(self):
+        user = User.objects.create_user(username="old", email="old@example.com", password="x", mobile="9100000000")
+        StudentProfile.objects.create(user=user, organization=self.school, student_unique_id=f"{self.YEAR}-AGR-4821")
+        self.assertEqual(self.allocate(self.school, 1), [f"{self.YEAR}-AGR-4822"])
+
+    def test_rolled_back_block_is_not_cached(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            first = sequences.next_student_id(self.school, self.YEAR)
+            raise RuntimeError
+        self.assertEqual(sequences._blocks, {})
+        # Counter bhi wapas — wahi number dobara milna theek hai (pehla kabhi save nahi hua)
+        self.assertEqual(self.allocate(self.school, 1), [first])
+
+    def test_session_without_organization(self):
+        ids = self.allocate(None, 3)
+        self.assertEqual(ids, [f"{self.YEAR}-GEN-0001", f"{self.YEAR}-GEN-0002", f"{self.YEAR}-GEN-0003"])
+        self.assertEqual(StudentIdSequence.objects.filter(organization=None).count(), 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            StudentIdSequence.objects.create(organization=None, year=self.YEAR)
+
+
+# ────────────────────────────────────────────────
+# Teacher -> student access sets
+# ────────────────────────────────────────────────
+
+class TeacherAccessInvalidationTests(TestCase):
+    """Bulk `.update()` paths (rollover, admin actions) bhi access sets invalidate karein."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.school = Organization.objects.create(name="Agra Public School", admin=cls.admin)
+        cls.teacher_5, cls.teacher_6 = [
+            Teacher.objects.create(user=User.objects.create_user(
+                username=f"teacher{grade}", email=f"teacher{grade}@example.com", password="x", mobile=f"930000000{grade}",
+            ), organization=cls.school)
+            for grade in (5, 6)
+        ]
+        cls.class_5 = Standard.objects.create(organization=cls.school, name="Class 5", section="A", class_teacher=cls.teacher_5)
+        cls.class_6 = Standard.objects.create(organization=cls.school, name="Class 6", section="A", class_teacher=cls.teacher_6)
+        cls.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}", email=f"student{i}@example.com", password="x", mobile=f"940000000{i}",
+                ),
+                organization=cls.school, student_unique_id=f"S-{i}", current_standard=cls.class_5,
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        shared_cache.clear()
+
+    def ids(self, teacher):
+        # Naya user object — request memo nahi, cache se padhta hai
+        return access.accessible_student_ids(User.objects.get(pk=teacher.user_id))
+
+    def test_rollover_moves_access_to_new_class_teacher(self):
+        student_ids = {student.pk for student in self.students}
+        self.assertEqual(self.ids(self.teacher_5), student_ids)
+        self.assertEqual(self.ids(self.teacher_6), frozenset())
+
+        leaver = self.students[0].pk
+        with self.captureOnCommitCallbacks(execute=True):
+            run_rollover(self.school.pk, {self.class_5.pk: self.class_6.pk}, left=[leaver], academic_year="2026-27")
+
+        self.assertEqual(self.ids(self.teacher_5), frozenset())
+        self.assertEqual(self.ids(self.teacher_6), student_ids - {leaver})
+
+    def test_admin_actions_revoke_and_restore(self):
+        model_admin = StudentProfileAdmin(StudentProfile, admin.site)
+        student = self.students[0]
+        self.assertIn(student.pk, self.ids(self.teacher_5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.make_inactive(None, StudentProfile.objects.filter(pk=student.pk))
+        self.assertNotIn(student.pk, self.ids(self.teacher_5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.make_active(None, StudentProfile.objects.filter(pk=student.pk))
+        self.assertIn(student.pk, self.ids(self.teacher_5))
+
+    def test_version_survives_shared_cache_reset(self):
+        # Counter hota toh clear ke baad wapas 1 — purana local set phir se match kar jaata
+        before = access._version(self.teacher_5.user_id)
+        shared_cache.clear()
+        self.assertNotEqual(access._version(self.teacher_5.user_id), before)
+
+
+# ────────────────────────────────────────────────
+# Student timeline
+# ────────────────────────────────────────────────
+
+class StudentTimelineTests(TestCase):
+    """Merged cursor pages = saare streams ka ek sorted list — na gap, na repeat."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000", is_staff=True,
+        )
+        school = Organization.objects.create(name="Agra Public School", admin=cls.admin)
+        standard = Standard.objects.create(organization=school, name="Class 5", section="A")
+        cls.student = StudentProfile.objects.create(
+            user=User.objects.create_user(username="student", email="student@example.com", password="x", mobile="9400000000"),
+            organization=school, student_unique_id="S-1", current_standard=standard,
+        )
+        start = date(2026, 4, 1)
+        # Ek hi din pe kai rows (ties) aur streams ke beech same dates
+        for day in (0, 0, 0, 3, 7, 7):
+            StudentResult.objects.create(
+                student=cls.student, exam_name=f"Test {day}", marks_obtained=40, total_marks=50,
+                exam_date=start + timedelta(days=day),
+            )
+        for day in (0, 3, 3, 10):
+            StudentFee.objects.create(student=cls.student, amount=1000, due_date=start + timedelta(days=day))
+        for day in (0, 1, 3, 7):
+            Attendance.objects.create(
+                student=cls.student, standard=standard, date=start + timedelta(days=day), status="PRESENT",
+            )
+
+    def expected(self, kinds=None):
+        items = [
+            (timeline._as_datetime(getattr(row, stream.time_field)), rank, row.pk, stream.kind)
+            for rank, stream in enumerate(timeline.STREAMS)
+            if not kinds or stream.kind in kinds
+            for row in stream.get_queryset(self.student)
+        ]
+        return [(kind, pk) for *_, pk, kind in sorted(items, reverse=True)]
+
+    def walk(self, page_size, kinds=None):
+        streams = sum(1 for stream in timeline.STREAMS if not kinds or stream.kind in kinds)
+        seen, cursor = [], None
+        while True:
+            # Har page pe har stream ki ek hi query, history kitni bhi ho
+            with self.assertNumQueries(streams):
+                page = timeline.student_timeline(self.student, cursor=cursor, page_size=page_size, kinds=kinds)
+            self.assertLessEqual(len(page["results"]), page_size)
+            seen += [(item["kind"], item["id"]) for item in page["results"]]
+            if not page["has_more"]:
+                self.assertIsNone(page["next_cursor"])
+                return seen
+            cursor = page["next_cursor"]
+
+    def test_pages_match_full_sort(self):
+        expected = self.expected()
+        self.assertEqual(len(expected), 14)
+        for page_size in (1, 3, 5, 14, 50):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.walk(page_size), expected)
+
+    def test_kinds_filter(self):
+        self.assertEqual(self.walk(2, kinds=["fee", "attendance"]), self.expected(kinds=["fee", "attendance"]))
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get(f"/api/v1/students/{self.student.pk}/timeline/", {"page_size": 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(row["kind"], row["id"]) for row in response.data["results"]], self.expected()[:4])
+        self.assertEqual(client.get(f"/api/v1/students/{self.student.pk}/timeline/", {"cursor": "x"}).status_code, 404)
+
+
+# ────────────────────────────────────────────────
+# Fee ledger
+# ────────────────────────────────────────────────
+
+class FeeLedgerTests(TestCase):
+    """Signals wala incremental ledger aur rebuild() hamesha same tables banayein."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.school_a = Organization.objects.create(name="Agra Public School", admin=cls.admin)
+        cls.school_b = Organization.objects.create(name="Mathura Vidyalaya", admin=cls.admin)
+        cls.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}", email=f"student{i}@example.com", password="x", mobile=f"940000000{i}",
+                ),
+                organization=cls.school_a, student_unique_id=f"S-{i}",
+            )
+            for i in range(3)
+        ]
+
+    def fee(self, student, amount, days_ago, status="PENDING"):
+        return StudentFee.objects.create(
+            student=student, amount=amount, status=status, due_date=timezone.localdate() - timedelta(days=days_ago),
+        )
+
+    def snapshot(self):
+        return (
+            set(StudentFeeBalance.objects.values_list("student_id", "organization_id", *fee_ledger.BALANCE_FIELDS)),
+            set(OrganizationFeeBalance.objects.values_list("organization_id", *fee_ledger.BALANCE_FIELDS)),
+            set(FeeCollectionDay.objects.exclude(payments=0).values_list("organization_id", "date", "amount", "payments")),
+        )
+
+    def assert_matches_rebuild(self):
+        incremental = self.snapshot()
+        fee_ledger.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_payments_and_deletes(self):
+        mover, other, _ = self.students
+        fees = [self.fee(mover, 1000, 5), self.fee(mover, 500, 40, "OVERDUE"), self.fee(other, 750, 1)]
+        fees[0].mark_paid(paid_at=timezone.now() - timedelta(days=2))
+        fees[2].mark_paid()
+        fees[1].amount = 600
+        fees[1].save()
+        fees[2].delete()
+        self.assert_matches_rebuild()
+
+    def test_student_changes_school(self):
+        mover, other, _ = self.students
+        paid = self.fee(mover, 1000, 5)
+        paid.mark_paid(paid_at=timezone.now() - timedelta(days=3))
+        self.fee(mover, 500, 40, "OVERDUE")
+        self.fee(other, 750, 1)
+
+        mover.organization = self.school_b
+        mover.save()
+        self.assertEqual(StudentFeeBalance.objects.get(student=mover).organization_id, self.school_b.pk)
+        self.assertEqual(OrganizationFeeBalance.objects.get(organization=self.school_b).paid_total, 1000)
+        self.assertEqual(OrganizationFeeBalance.objects.get(organization=self.school_a).outstanding, 750)
+        self.assert_matches_rebuild()
+
+        # Naye school mein aage ke payments bhi wahin judte hain
+        self.fee(mover, 300, 0).mark_paid()
+        self.assert_matches_rebuild()
+
+    def test_rebuild_fixes_unsignalled_school_change(self):
+        mover = self.students[0]
+        self.fee(mover, 1000, 5)
+        StudentProfile.objects.filter(pk=mover.pk).update(organization=self.school_b)
+        fee_ledger.rebuild()
+        self.assertEqual(StudentFeeBalance.objects.get(student=mover).organization_id, self.school_b.pk)
+        self.assertEqual(OrganizationFeeBalance.objects.get(organization=self.school_a).outstanding, 0)
+        self.assertEqual(OrganizationFeeBalance.objects.get(organization=self.school_b).outstanding, 1000)
+
+
+# ────────────────────────────────────────────────
+# Academic year rollover
+# ────────────────────────────────────────────────
+
+class RolloverTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.school = Organization.objects.create(name="Rollover School", admin=cls.admin)
+        cls.other_school = Organization.objects.create(name="Other School", admin=cls.admin)
+        cls.class_5, cls.class_6, cls.class_7, cls.class_9 = (
+            Standard.objects.create(organization=cls.school, name=name, section="A")
+            for name in ("Class 5", "Class 6", "Class 7", "Class 9")
+        )
+        cls.foreign_class = Standard.objects.create(organization=cls.other_school, name="Class 6", section="A")
+
+        counter = iter(range(100))
+
+        def student(standard):
+            i = next(counter)
+            return StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}", email=f"student{i}@example.com", password="x", mobile=f"95000000{i:02d}",
+                ),
+                organization=cls.school, student_unique_id=f"R-{i}", current_standard=standard,
+            )
+
+        cls.fifth = [student(cls.class_5) for _ in range(3)]
+        cls.sixth = [student(cls.class_6) for _ in range(2)]
+        cls.ninth = student(cls.class_9)
+
+    def standard_of(self, student):
+        return StudentProfile.objects.values_list("current_standard_id", flat=True).get(pk=student.pk)
+
+    def test_moves_run_top_class_first(self):
+        self.assertEqual(_ordered_moves({5: 6, 6: 7}), [(6, 7), (5, 6)])
+        self.assertEqual(_ordered_moves({4: 5, 5: 6, 6: 7}), [(6, 7), (5, 6), (4, 5)])
+        # Self-map = "class wahi rahe" -> cycle nahi
+        self.assertEqual(_ordered_moves({5: 5}), [(5, 5)])
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaises(RolloverError):
+            _ordered_moves({5: 6, 6: 5})
+        with self.assertRaises(RolloverError):
+            run_rollover(self.school.pk, {self.class_5.pk: self.class_6.pk, self.class_6.pk: self.class_5.pk})
+        self.assertEqual(self.standard_of(self.fifth[0]), self.class_5.pk)
+
+    def test_promotes_each_class_exactly_one_step(self):
+        mapping = {self.class_5.pk: self.class_6.pk, self.class_6.pk: self.class_7.pk}
+        report = run_rollover(self.school.pk, mapping, academic_year="2026-27")
+
+        self.assertEqual(report["promoted"], 5)
+        self.assertEqual(
+            [(move["from_standard"], move["students"]) for move in report["moves"]],
+            [(self.class_6.pk, 2), (self.class_5.pk, 3)],
+        )
+        # 5 wale 6 mein rukne chahiye, 7 tak nahi
+        self.assertEqual({self.standard_of(s) for s in self.fifth}, {self.class_6.pk})
+        self.assertEqual({self.standard_of(s) for s in self.sixth}, {self.class_7.pk})
+        self.assertEqual(self.standard_of(self.ninth), self.class_9.pk)
+        self.assertEqual(
+            StudentPromotion.objects.filter(batch_id=report["batch_id"], outcome=StudentPromotion.Outcome.PROMOTED).count(), 5,
+        )
+
+    def test_detained_and_left_students(self):
+        detained, leaver = self.fifth[0], self.fifth[1]
+        report = run_rollover(
+            self.school.pk, {self.class_5.pk: self.class_6.pk},
+            detained=[detained.pk], left=[str(leaver.pk)], academic_year="2026-27",
+        )
+        self.assertEqual((report["promoted"], report["detained"], report["left"]), (1, 1, 1))
+
+        self.assertEqual(self.standard_of(detained), self.class_5.pk)
+        leaver.refresh_from_db()
+        self.assertFalse(leaver.is_active)
+        self.assertIsNone(leaver.current_standard_id)
+        self.assertEqual(self.standard_of(self.fifth[2]), self.class_6.pk)
+
+        history = {
+            row.student_id: (row.outcome, row.from_standard_id, row.to_standard_id)
+            for row in StudentPromotion.objects.filter(batch_id=report["batch_id"])
+        }
+        self.assertEqual(history, {
+            detained.pk: (StudentPromotion.Outcome.DETAINED, self.class_5.pk, self.class_5.pk),
+            leaver.pk: (StudentPromotion.Outcome.LEFT, self.class_5.pk, None),
+            self.fifth[2].pk: (StudentPromotion.Outcome.PROMOTED, self.class_5.pk, self.class_6.pk),
+        })
+
+    def test_held_student_outside_mapping_can_leave(self):
+        # Class 9 mapped nahi hai, phir bhi left list se nikal sakta hai
+        report = run_rollover(self.school.pk, {self.class_5.pk: self.class_6.pk}, left=[self.ninth.pk])
+        self.assertEqual(report["left"], 1)
+        self.assertFalse(StudentProfile.objects.get(pk=self.ninth.pk).is_active)
+
+    def test_dry_run_counts_without_writing(self):
+        mapping = {self.class_5.pk: self.class_6.pk, self.class_6.pk: self.class_7.pk}
+        report = run_rollover(self.school.pk, mapping, detained=[self.sixth[0].pk], dry_run=True)
+
+        self.assertTrue(report["dry_run"])
+        self.assertIsNone(report["batch_id"])
+        self.assertEqual((report["promoted"], report["detained"]), (4, 1))
+        self.assertEqual({self.standard_of(s) for s in self.fifth}, {self.class_5.pk})
+        self.assertFalse(StudentPromotion.objects.exists())
+
+    def test_invalid_input_is_rejected(self):
+        with self.assertRaises(RolloverError):
+            run_rollover(self.school.pk, {self.class_5.pk: self.foreign_class.pk})
+        with self.assertRaises(RolloverError):
+            run_rollover(self.school.pk, {self.class_5.pk: self.class_6.pk}, detained=[self.fifth[0].pk], left=[self.fifth[0].pk])
+        with self.assertRaises(RolloverError):
+            run_rollover(self.school.pk, {self.class_5.pk: self.class_6.pk}, left=[999999])
+        self.assertFalse(StudentPromotion.objects.exists())
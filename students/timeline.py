@@ -0,0 +1,191 @@
+"""
+Student timeline — sessions, results, fees, attendance, enrollments aur parent
+links ek hi newest-first feed mein.
+
+Har source ek alag keyset stream hai: `(time_field, id) DESC` order, chunks
+mein padha jaata hai aur `heapq.merge` unhe lazily jodta hai. Page ke liye har
+stream se zyada se zyada `page_size + 1` rows aati hain, chahe student ki
+saalon ki history ho.
+
+Cursor (opaque base64 JSON) mein har stream ki aakhri consumed position hoti
+hai; agla page har stream ko wahin se resume karta hai.
+"""
+import base64
+import datetime
+import heapq
+import json
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+INVALID_CURSOR_MESSAGE = "Bhai, timeline cursor galat hai ya expire ho gaya."
+
+
+@dataclass(frozen=True)
+class Stream:
+    kind: str
+    get_queryset: Callable        # student -> queryset
+    time_field: str
+    describe: Callable            # row -> event dict ("title" + details)
+
+
+def _sessions(student):
+    from .models import StudentSession
+    return StudentSession.objects.filter(student=student).select_related("teacher")
+
+
+def _results(student):
+    from .models import StudentResult
+    return StudentResult.objects.filter(student=student)
+
+
+def _fees(student):
+    from .models import StudentFee
+    return StudentFee.objects.filter(student=student)
+
+
+def _attendance(student):
+    from attendance.models import Attendance
+    return Attendance.objects.filter(student=student)
+
+
+def _enrollments(student):
+    from students_classroom.models import SessionEnrollment
+    return SessionEnrollment.objects.filter(student=student).select_related("session__target_standard")
+
+
+def _parent_links(student):
+    from parents.models import ParentStudentLink
+    return ParentStudentLink.objects.filter(student=student).select_related("parent__user")
+
+
+STREAMS = (
+    Stream("session", _sessions, "session_date", lambda row: {
+        "title": f"{row.subject} session",
+        "topic": row.topic,
+        "teacher": row.teacher.get_full_name() if row.teacher_id else None,
+    }),
+    Stream("result", _results, "exam_date", lambda row: {
+        "title": row.exam_name,
+        "marks_obtained": str(row.marks_obtained),
+        "total_marks": str(row.total_marks),
+        "grade": row.grade,
+    }),
+    Stream("fee", _fees, "due_date", lambda row: {
+        "title": f"Fee {row.get_status_display()}",
+        "amount": str(row.amount),
+        "status": row.status,
+        "paid_at": row.paid_at,
+    }),
+    Stream("attendance", _attendance, "date", lambda row: {
+        "title": row.get_status_display(),
+        "status": row.status,
+    }),
+    Stream("enrollment", _enrollments, "enrolled_at", lambda row: {
+        "title": f"Joined {row.session.target_standard or row.session.session_code}",
+        "session_code": row.session.session_code,
+        "is_active": row.is_active,
+    }),
+    Stream("parent_link", _parent_links, "created_at", lambda row: {
+        "title": f"Parent link {row.get_status_display()}",
+        "parent": row.parent.user.get_full_name() if row.parent.user_id else None,
+        "status": row.status,
+    }),
+)
+STREAMS_BY_KIND = {stream.kind: stream for stream in STREAMS}
+_KIND_RANK = {stream.kind: rank for rank, stream in enumerate(STREAMS)}
+
+
+# ── Cursor ────────────────────────────────────────────────────────────
+
+def _as_datetime(value):
+    """Date aur datetime dono streams ek hi scale pe compare hon."""
+    if isinstance(value, datetime.datetime):
+        return value if timezone.is_aware(value) else timezone.make_aware(value)
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def encode_cursor(positions):
+    data = {kind: [value.isoformat(), pk] for kind, (value, pk) in positions.items()}
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(encoded):
+    """{kind: (value, pk)}; kind missing = stream shuru se."""
+    if not encoded:
+        return {}
+    try:
+        padded = encoded + "=" * (-len(encoded) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {}
+        for kind, (value, pk) in data.items():
+            stream = STREAMS_BY_KIND[kind]
+            parsed = parse_datetime(value) if "T" in value else parse_date(value)
+            if parsed is None or not isinstance(pk, int):
+                raise ValueError
+            positions[stream.kind] = (parsed, pk)
+        return positions
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise NotFound(INVALID_CURSOR_MESSAGE)
+
+
+# ── Streams + merge ───────────────────────────────────────────────────
+
+def _iter_stream(stream, student, position, chunk_size):
+    """(sort_key, kind, row) newest first; chunk khatam hua toh agla chunk seek se."""
+    queryset = stream.get_queryset(student).order_by(f"-{stream.time_field}", "-id")
+    rank = _KIND_RANK[stream.kind]
+    while True:
+        page = queryset
+        if position is not None:
+            value, pk = position
+            page = page.filter(
+                Q(**{f"{stream.time_field}__lt": value})
+                | Q(**{stream.time_field: value, "id__lt": pk})
+            )
+        rows = list(page[:chunk_size])
+        for row in rows:
+            value = getattr(row, stream.time_field)
+            yield (_as_datetime(value), rank, row.pk), stream.kind, row
+        if len(rows) < chunk_size:
+            return
+        position = (getattr(rows[-1], stream.time_field), rows[-1].pk)
+
+
+def student_timeline(student, cursor=None, page_size=DEFAULT_PAGE_SIZE, kinds=None):
+    """
+    Returns {"results": [...], "next_cursor": str|None, "has_more": bool}.
+    `kinds` = sirf ye streams (e.g. ["result", "fee"]).
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    positions = decode_cursor(cursor)
+    streams = [s for s in STREAMS if not kinds or s.kind in kinds]
+
+    merged = heapq.merge(
+        *(_iter_stream(s, student, positions.get(s.kind), page_size + 1) for s in streams),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+
+    results = []
+    for _key, kind, row in merged:
+        if len(results) == page_size:
+            # Ek extra item mila — agla page hai (COUNT nahi)
+            return {"results": results, "next_cursor": encode_cursor(positions), "has_more": True}
+        stream = STREAMS_BY_KIND[kind]
+        value = getattr(row, stream.time_field)
+        positions[kind] = (value, row.pk)
+        results.append({
+            "kind": kind,
+            "id": row.pk,
+            "at": value,
+            **stream.describe(row),
+        })
+    return {"results": results, "next_cursor": None, "has_more": False}
@@ -8,18 +8,24 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from rest_framework.pagination import PageNumberPagination
+from normal_user.pagination import OptionalKeysetPagination
 from rest_framework.throttling import UserRateThrottle
 from django.db.models import Q
 from django.contrib.auth import get_user_model
 User = get_user_model()
-from .models import StudentProfile, StudentSession, StudentResult, StudentFee
+from .models import StudentProfile, StudentResult, StudentFee, StudentFeeBalance
+from .access import teacher_can_access
+from . import timeline as timeline_feed
 from parents.models import ParentProfile, ParentStudentLink
+from normal_user.phonetic import phonetic_name_q
+from search import backend as search_backend
 from .serializers import (
     StudentProfileSerializer,
     StudentMinimalSerializer,
     StudentSessionSerializer,
     StudentResultSerializer,
     StudentFeeSerializer,
+    StudentFeeBalanceSerializer,
 )
 
 # Standard DRF Permissions
@@ -44,6 +50,12 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class ExplorePagination(OptionalKeysetPagination):
+    # ?pagination=cursor -> (created_at, id) keyset, bina COUNT/OFFSET
+    page_number_class = StandardResultsSetPagination
+    deferred_join = True  # select_related wali rows sirf us page ke pks ke liye
+
+
 # ────────────────────────────────────────────────
 # Permissions
 # ────────────────────────────────────────────────
@@ -73,7 +85,7 @@ class StudentViewSet(viewsets.GenericViewSet):
     queryset = StudentProfile.objects.all()
     serializer_class = StudentProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsStudentOrTeacherOrAdmin]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ExplorePagination
     throttle_classes = [UserRateThrottle]
 
     # ────────────────────────────────────────────────
@@ -100,12 +112,21 @@ class StudentViewSet(viewsets.GenericViewSet):
         if org_id:
             qs = qs.filter(organization_id=org_id)
         if q:
-            qs = qs.filter(
-                Q(user__first_name__icontains=q) |
-                Q(user__last_name__icontains=q) |
-                Q(user__mobile__icontains=q) |
-                Q(student_unique_id__icontains=q)
-            )
+            # FTS5 index (naam / student id / mobile, prefix match) — rank order mein,
+            # uske baad phonetic name matches ("Sivam" -> Shivam), indexed key lookup se.
+            # Index na ho (non-SQLite DB) toh purana icontains search.
+            sounds_like = phonetic_name_q(q, prefix="user__")
+            ranked = search_backend.filter_queryset(qs, "student", q, also=sounds_like)
+            if ranked is not None:
+                qs = ranked
+            else:
+                text_match = (
+                    Q(user__first_name__icontains=q) |
+                    Q(user__last_name__icontains=q) |
+                    Q(user__mobile__icontains=q) |
+                    Q(student_unique_id__icontains=q)
+                )
+                qs = qs.filter(text_match | sounds_like if sounds_like is not None else text_match)
 
         # Pagination Magic
         page = self.paginate_queryset(qs)
@@ -129,7 +150,7 @@ class StudentViewSet(viewsets.GenericViewSet):
         # Ownership check
         if not user.is_staff and hasattr(user, 'teacher_profile'):
             # Teacher: must be assigned to class/session
-            if not StudentSession.objects.filter(student=student, teacher=user.teacher_profile).exists():
+            if not teacher_can_access(user, student):
                 raise PermissionDenied("You do not have access to this student's profile.")
 
         serializer = StudentProfileSerializer(student)
@@ -186,7 +207,11 @@ class StudentViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["GET"], url_path="results")
     def results(self, request, pk=None):
         student = self.get_student(pk)
-        results_qs = StudentResult.objects.filter(student=student).order_by("-exam__date")
+        results_qs = (
+            StudentResult.objects.filter(student=student)
+            .select_related("exam_subject")
+            .order_by("-exam_date", "-id")
+        )
         serializer = StudentResultSerializer(results_qs, many=True)
         return Response(serializer.data)
 
@@ -195,10 +220,67 @@ class StudentViewSet(viewsets.GenericViewSet):
     # ────────────────────────────────────────────────
     @action(detail=True, methods=["GET"], url_path="fees")
     def fees(self, request, pk=None):
+        """Fees + materialized balance (students.fee_ledger) — summary ke liye rows scan nahi."""
         student = self.get_student(pk)
-        fees_qs = StudentFee.objects.filter(student=student).order_by("-due_date")
-        serializer = StudentFeeSerializer(fees_qs, many=True)
-        return Response(serializer.data)
+        fees_qs = StudentFee.objects.filter(student=student).order_by("-due_date", "-id")
+        balance = StudentFeeBalance.objects.filter(student=student).first() or StudentFeeBalance(student=student)
+        return Response({
+            "balance": StudentFeeBalanceSerializer(balance).data,
+            "results": StudentFeeSerializer(fees_qs, many=True).data,
+        })
+
+    @action(detail=True, methods=["POST"], url_path=r"fees/(?P<fee_id>[0-9]+)/pay")
+    @transaction.atomic
+    def pay_fee(self, request, pk=None, fee_id=None):
+        """School admin / staff payment record karta hai. Body: transaction_id (optional)."""
+        student = self.get_student(pk)
+        user = request.user
+        if not (user.is_staff or user.school_admin_profile.filter(
+                organization_id=student.organization_id, is_active=True).exists()):
+            raise PermissionDenied("Only school admin or staff can record fee payments.")
+
+        fee = get_object_or_404(StudentFee.objects.select_for_update(), id=fee_id, student=student)
+        if fee.status == "PAID":
+            raise ValidationError({"detail": "Bhai, ye fee pehle hi paid hai."})
+        fee.mark_paid(transaction_id=request.data.get("transaction_id"))
+        logger.info(f"Fee {fee.id} of Student {student.id} marked paid by user {user.id}")
+        return Response(StudentFeeSerializer(fee).data, status=status.HTTP_200_OK)
+
+    # ────────────────────────────────────────────────
+    # 7. Unified Timeline (sessions, results, fees, attendance, enrollments, parent links)
+    # ────────────────────────────────────────────────
+    @action(detail=True, methods=["GET"], url_path="timeline")
+    def timeline(self, request, pk=None):
+        """
+        Newest-first feed. ?cursor= (pichhle response ka next_cursor), ?page_size=,
+        ?kinds=result,fee (sirf ye streams).
+        """
+        student = self.get_student(pk)
+        user = request.user
+        allowed = (
+            user.is_staff
+            or student.user_id == user.id
+            or (hasattr(user, "teacher_profile") and teacher_can_access(user, student))
+            or ParentStudentLink.objects.filter(
+                student=student, parent__user=user, status=ParentStudentLink.Status.APPROVED
+            ).exists()
+        )
+        if not allowed:
+            raise PermissionDenied("You do not have access to this student's timeline.")
+
+        try:
+            page_size = int(request.query_params.get("page_size", timeline_feed.DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "Must be a number."})
+        kinds = [k for k in request.query_params.get("kinds", "").split(",") if k]
+        unknown = set(kinds) - set(timeline_feed.STREAMS_BY_KIND)
+        if unknown:
+            raise ValidationError({"kinds": f"Unknown: {', '.join(sorted(unknown))}"})
+
+        data = timeline_feed.student_timeline(
+            student, cursor=request.query_params.get("cursor"), page_size=page_size, kinds=kinds,
+        )
+        return Response(data)
     
     def get_permissions(self):
         """
@@ -2,18 +2,21 @@ from django.contrib import admin
 
 # Register your models here.
 
-import csv
 from django.contrib import admin, messages
-from django.db.models import Count
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
-from django.http import HttpResponse
 from django.urls import reverse
 
+from normal_user.admin_mixins import ChangelistPerformanceMixin, StreamingCSVExportMixin
+
 from .models import (
     Standard,
     ClassroomSession,
     # Student,
     JoinRequest,
+    SessionEnrollment,
+    SessionWaitlistEntry,
 )
 
 # =================================================
@@ -57,7 +60,7 @@ class JoinRequestInline(admin.TabularInline):
 # 3. ClassroomSession Admin
 # =================================================
 @admin.register(ClassroomSession)
-class ClassroomSessionAdmin(admin.ModelAdmin):
+class ClassroomSessionAdmin(ChangelistPerformanceMixin, StreamingCSVExportMixin, admin.ModelAdmin):
     list_display = (
         'session_code',
         'teacher_name',
@@ -76,16 +79,47 @@ class ClassroomSessionAdmin(admin.ModelAdmin):
     inlines = (JoinRequestInline,)
     ordering = ('-created_at',)
     
-    actions = ('force_close_sessions', 'sync_session_statuses', 'export_as_csv')
+    actions = ('force_close_sessions', 'sync_session_statuses', 'export_as_csv', 'export_as_csv_gzip')
+
+    # Seat usage ek correlated COUNT se — har row pe alag query nahi
+    changelist_annotations = {
+        'active_enrollment_count': Coalesce(
+            Subquery(
+                SessionEnrollment.objects
+                .filter(session=OuterRef('pk'), is_active=True)
+                .order_by()
+                .values('session')
+                .annotate(c=Count('pk'))
+                .values('c')[:1],
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    }
+
+    # CSV columns -> select_related('target_standard', 'teacher__user') khud ban jata hai
+    csv_export_filename = 'sessions'
+    csv_export_fields = (
+        ('Code', 'session_code'),
+        ('Standard', 'target_standard__name'),
+        ('Teacher', 'teacher__user__username'),
+        ('Status', 'status'),
+        ('Expires', 'expires_at'),
+    )
 
     # Custom Columns
-    @admin.display(description="Teacher")
+    @admin.display(description="Teacher", ordering="teacher__user__first_name")
     def teacher_name(self, obj):
+        if obj.teacher is None:
+            return "-"
         return obj.teacher.user.get_full_name() or obj.teacher.user.username
 
-    @admin.display(description="Seats (Used/Total)")
+    @admin.display(description="Seats (Used/Total)", ordering="active_enrollment_count")
     def seat_usage(self, obj):
-        return f"{obj.current_student_count} / {obj.student_limit}"
+        used = getattr(obj, "active_enrollment_count", None)
+        if used is None:
+            used = obj.current_student_count
+        return f"{used} / {obj.student_limit}"
 
     @admin.display(description="Status")
     def status_badge(self, obj):
@@ -115,17 +149,6 @@ class ClassroomSessionAdmin(admin.ModelAdmin):
             session.sync_status() # Tumhare model ka sync_status()
         self.message_user(request, "Statuses refreshed successfully.", messages.INFO)
 
-    @admin.action(description="Export to CSV")
-    def export_as_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="sessions.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['Code', 'Standard', 'Teacher', 'Status', 'Expires'])
-        for s in queryset:
-            writer.writerow([s.session_code, s.target_standard.name, s.teacher.user.username, s.status, s.expires_at])
-        return response
-
-
 # =================================================
 # 4. Student Admin
 # =================================================
@@ -141,16 +164,42 @@ class ClassroomSessionAdmin(admin.ModelAdmin):
 # 5. JoinRequest Admin
 # =================================================
 @admin.register(JoinRequest)
-class JoinRequestAdmin(admin.ModelAdmin):
+class JoinRequestAdmin(ChangelistPerformanceMixin, StreamingCSVExportMixin, admin.ModelAdmin):
     list_display = ('user', 'session_code', 'status_colored', 'created_at')
     list_filter = ('status',)
     search_fields = ('user__username', 'session__session_code')
+    actions = ('export_as_csv', 'export_as_csv_gzip')
+
+    csv_export_filename = 'join_requests'
+    csv_export_fields = (
+        ('ID', 'id'),
+        ('Session Code', 'session__session_code'),
+        ('Username', 'user__username'),
+        ('Applicant Name', 'user__get_full_name'),
+        ('Status', 'status'),
+        ('Requested At', 'created_at'),
+        ('Reviewed At', 'reviewed_at'),
+        ('Reviewed By', 'reviewed_by__user__username'),
+    )
 
-    @admin.display(description="Session Code")
+    @admin.display(description="Session Code", ordering="session__session_code")
     def session_code(self, obj):
         return obj.session.session_code
 
     @admin.display(description="Status")
     def status_colored(self, obj):
         colors = {'PENDING': 'orange', 'ACCEPTED': 'green', 'REJECTED': 'red'}
-        return format_html('<b style="color: {};">{}</b>', colors.get(obj.status, 'black'), obj.status)
\ No newline at end of file
+        return format_html('<b style="color: {};">{}</b>', colors.get(obj.status, 'black'), obj.status)
+
+
+# =================================================
+# 6. Waitlist Admin
+# =================================================
+@admin.register(SessionWaitlistEntry)
+class SessionWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('session', 'user', 'position', 'status', 'created_at', 'promoted_at')
+    list_filter = ('status',)
+    list_select_related = ('session', 'user')
+    search_fields = ('user__username', 'session__session_code')
+    raw_id_fields = ('session', 'user', 'join_request')
+    readonly_fields = ('position', 'created_at', 'promoted_at')
@@ -0,0 +1,163 @@
+"""
+Hot session-code directory.
+
+Join endpoints har request pe `ClassroomSession` ko `session_code` se dhoondte hain.
+Ek code 300 bacchon ke batch mein share hota hai toh same lookup baar-baar hota hai.
+Yahan ek read-through cache hai jo code -> chhota sa snapshot map karta hai.
+
+- Snapshot shared cache mein (normal_user.cache) — ek worker ka invalidate
+  saare workers tak pahunchta hai.
+- Short TTL (SESSION_CACHE_TTL) taaki stale data zyada der na tike.
+- Status / enrollment change hone par `invalidate_session_code()` (on_commit).
+- Single-flight loading: ek process mein ek code ka sirf ek DB read chalta hai,
+  baaki threads usi result ka wait karte hain.
+- Snapshot sirf "request lo ya nahi" ke liye hai; seat / waitlist ka faisla
+  `JoinRequestCreateSerializer.create` locked row pe dobara karta hai.
+"""
+import threading
+from typing import Optional
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from normal_user.cache import shared_cache
+
+SESSION_CACHE_TTL = 30           # seconds
+SESSION_MISS_TTL = 5             # invalid codes ko bhi thodi der yaad rakho
+SESSION_CACHE_PREFIX = "classroom:session-code:"
+
+# Negative cache marker (None ko cache.get "miss" samajhta hai)
+_MISSING = "__missing__"
+
+_inflight_guard = threading.Lock()
+_inflight_locks = {}  # key -> [lock, kitne threads hold / wait kar rahe hain]
+
+
+class SessionSnapshot:
+    """Compact, picklable view of a ClassroomSession for the join flow."""
+
+    __slots__ = (
+        "id", "session_code", "organization_id", "purpose",
+        "student_limit", "current_student_count", "expires_at", "status",
+    )
+
+    def __init__(self, id, session_code, organization_id, purpose,
+                 student_limit, current_student_count, expires_at, status):
+        self.id = id
+        self.session_code = session_code
+        self.organization_id = organization_id
+        self.purpose = purpose
+        self.student_limit = student_limit
+        self.current_student_count = current_student_count
+        self.expires_at = expires_at
+        self.status = status
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def __repr__(self):
+        return f"<SessionSnapshot {self.session_code} ({self.status})>"
+
+    @property
+    def seats_remaining(self) -> int:
+        return self.student_limit - self.current_student_count
+
+    @property
+    def is_full(self) -> bool:
+        return self.current_student_count >= self.student_limit
+
+    @property
+    def is_joinable(self) -> bool:
+        # Same rules as ClassroomSession.is_joinable
+        from .models import SessionStatus
+        return (
+            self.status == SessionStatus.ACTIVE
+            and timezone.now() < self.expires_at
+            and not self.is_full
+        )
+
+
+def normalize_session_code(code: str) -> str:
+    return (code or "").strip().upper()
+
+
+def _cache_key(code: str) -> str:
+    return f"{SESSION_CACHE_PREFIX}{code}"
+
+
+def _load_snapshot(code: str) -> Optional[SessionSnapshot]:
+    """One query: session row + active enrollment count."""
+    from .models import ClassroomSession
+
+    row = (
+        ClassroomSession.objects
+        .filter(session_code=code)
+        .annotate(active_count=Count("enrollments", filter=Q(enrollments__is_active=True)))
+        .values_list(
+            "id", "session_code", "organization_id", "purpose",
+            "student_limit", "active_count", "expires_at", "status",
+        )
+        .first()
+    )
+    return SessionSnapshot(*row) if row else None
+
+
+def _acquire_inflight(key: str) -> list:
+    with _inflight_guard:
+        slot = _inflight_locks.get(key)
+        if slot is None:
+            slot = _inflight_locks[key] = [threading.Lock(), 0]
+        slot[1] += 1
+        return slot
+
+
+def _release_inflight(key: str, slot: list) -> None:
+    # Lock tabhi hatao jab koi bhi thread use hold / wait nahi kar raha —
+    # warna naya thread naya lock le leta aur dusra DB load chal jaata
+    with _inflight_guard:
+        slot[1] -= 1
+        if slot[1] == 0 and _inflight_locks.get(key) is slot:
+            del _inflight_locks[key]
+
+
+def get_session_snapshot(code: str) -> Optional[SessionSnapshot]:
+    """
+    Read-through lookup. Returns None for unknown codes.
+    Burst mein pehla thread DB hit karta hai, baaki lock pe rukte hain aur
+    cache se hi result uthate hain.
+    """
+    code = normalize_session_code(code)
+    if not code:
+        return None
+
+    key = _cache_key(code)
+    cached = shared_cache.get(key)
+    if cached is not None:
+        return None if cached == _MISSING else cached
+
+    slot = _acquire_inflight(key)
+    try:
+        with slot[0]:
+            # Double-check: jab tak hum ruke the, kisi aur ne load kar diya hoga
+            cached = shared_cache.get(key)
+            if cached is not None:
+                return None if cached == _MISSING else cached
+
+            snapshot = _load_snapshot(code)
+            if snapshot is None:
+                shared_cache.set(key, _MISSING, SESSION_MISS_TTL)
+            else:
+                shared_cache.set(key, snapshot, SESSION_CACHE_TTL)
+            return snapshot
+    finally:
+        _release_inflight(key, slot)
+
+
+def invalidate_session_code(code: str) -> None:
+    code = normalize_session_code(code)
+    if code:
+        shared_cache.delete(_cache_key(code))
@@ -22,4 +22,24 @@ class JoinRequestStatus:
         (PENDING, _("Pending")),
         (ACCEPTED, _("Accepted")),
         (REJECTED, _("Rejected")),
-    )
\ No newline at end of file
+    )
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Class/section provisioning templates (StandardViewSet.provision)
+# ─────────────────────────────────────────────────────────────────────────────
+
+DEFAULT_TEMPLATE_SECTIONS = ("A", "B", "C", "D")
+
+_PRE_PRIMARY = ("Nursery", "LKG", "UKG")
+_CLASSES_1_TO_12 = tuple(f"Class {i}" for i in range(1, 13))
+
+STANDARD_TEMPLATES = {
+    "CBSE_K12": _PRE_PRIMARY + _CLASSES_1_TO_12,
+    "ICSE_K12": _PRE_PRIMARY + _CLASSES_1_TO_12,
+    "STATE_K12": _PRE_PRIMARY + _CLASSES_1_TO_12,
+    "PRE_PRIMARY": _PRE_PRIMARY,
+    "PRIMARY": _CLASSES_1_TO_12[:5],
+    "MIDDLE": _CLASSES_1_TO_12[5:8],
+    "SECONDARY": _CLASSES_1_TO_12[5:10],
+    "SENIOR_SECONDARY": _CLASSES_1_TO_12[10:],
+}
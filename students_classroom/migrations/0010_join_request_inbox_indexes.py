@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-19 10:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_classroom', '0009_session_waitlist'),
+        ('teachers', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='joinrequest',
+            name='students_cl_session_7dbcef_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='joinrequest',
+            name='students_cl_user_id_0aca4b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['session', 'status', '-created_at', '-id'], name='students_cl_session_784398_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['user', 'status', '-created_at', '-id'], name='students_cl_user_id_42cbec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='students_cl_status_d8869e_idx'),
+        ),
+    ]
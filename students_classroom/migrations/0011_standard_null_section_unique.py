@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_keyset_indexes'),
+        ('students_classroom', '0010_join_request_inbox_indexes'),
+        ('teachers', '0002_profile_picture_blob_storage'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='standard',
+            constraint=models.UniqueConstraint(condition=models.Q(('section__isnull', True)), fields=('organization', 'name'), name='unique_standard_without_section'),
+        ),
+    ]
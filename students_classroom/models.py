@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from .constants import SessionStatus, JoinRequestStatus
+from .cache import invalidate_session_code
 
 
 # =============================================================================
@@ -43,6 +44,17 @@ class JoinRequestStatus:
         (REJECTED, _("Rejected")),
     )
 
+class WaitlistStatus:
+    WAITING = "WAITING"
+    PROMOTED = "PROMOTED"
+    CANCELLED = "CANCELLED"
+
+    CHOICES = (
+        (WAITING, _("Waiting")),
+        (PROMOTED, _("Promoted")),
+        (CANCELLED, _("Cancelled")),
+    )
+
 class SessionPurpose:
     STUDENT_ADMISSION = "STUDENT"
     TEACHER_RECRUITMENT = "TEACHER"
@@ -52,6 +64,47 @@ class SessionPurpose:
         (TEACHER_RECRUITMENT, _("Teacher Recruitment")),
     )
 
+# =============================================================================
+# QuerySets
+# =============================================================================
+
+class StandardQuerySet(QuerySet):
+    def with_listing_stats(self):
+        """
+        List/detail ke liye saare counts ek hi query mein.
+        Correlated subqueries use kiye hain taaki students aur sessions ke
+        joins aapas mein multiply na ho (COUNT DISTINCT ki zarurat nahi).
+        """
+        from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce, Concat, Trim
+        from students.models import StudentProfile
+
+        def _count(qs):
+            return Coalesce(
+                Subquery(
+                    qs.order_by().values("_grp").annotate(c=Count("pk")).values("c")[:1],
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+
+        enrolled = StudentProfile.objects.filter(
+            current_standard=OuterRef("pk"), is_active=True
+        ).annotate(_grp=models.F("current_standard"))
+        active_sessions = ClassroomSession.objects.filter(
+            target_standard=OuterRef("pk"), status=SessionStatus.ACTIVE
+        ).annotate(_grp=models.F("target_standard"))
+
+        return self.select_related("class_teacher__user").annotate(
+            enrolled_student_count=_count(enrolled),
+            active_session_count=_count(active_sessions),
+            class_teacher_full_name=Trim(Concat(
+                "class_teacher__user__first_name", Value(" "), "class_teacher__user__last_name",
+                output_field=models.CharField(),
+            )),
+        )
+
+
 # =============================================================================
 # Models
 # =============================================================================
@@ -88,11 +141,21 @@ class Standard(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = StandardQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Standard")
         verbose_name_plural = _("Standards")
         ordering = ["name"]
         unique_together = ('organization', 'name', 'section')
+        constraints = [
+            # NULL != NULL — bina section wali class ke duplicates unique_together nahi rokta
+            models.UniqueConstraint(
+                fields=['organization', 'name'],
+                condition=Q(section__isnull=True),
+                name='unique_standard_without_section',
+            ),
+        ]
         indexes = [models.Index(fields=["is_active", "name"])]
 
     def __str__(self) -> str:
@@ -172,6 +235,12 @@ class ClassroomSession(models.Model):
         verbose_name=_("Status"),
     )
 
+    # ── Waitlist ordinals ─────────────────────────────────────────────────────
+    # tail = last position handed out, head = last position consumed (promoted/skipped).
+    # Enqueue sirf tail badhata hai, promote sirf head -> dono O(1).
+    waitlist_tail = models.PositiveIntegerField(default=0, editable=False)
+    waitlist_head = models.PositiveIntegerField(default=0, editable=False)
+
     # ── Audit fields ──────────────────────────────────────────────────────────
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -214,6 +283,17 @@ class ClassroomSession(models.Model):
             self.refresh_from_db()
             self._sync_status(save=False)
 
+        self.invalidate_cache()
+
+    def delete(self, *args, **kwargs):
+        self.invalidate_cache()
+        return super().delete(*args, **kwargs)
+
+    def invalidate_cache(self) -> None:
+        """Join-flow snapshot ko commit ke baad drop karo (cache.py)."""
+        code = self.session_code
+        transaction.on_commit(lambda: invalidate_session_code(code))
+
     # -------------------------------------------------------------------------
     # Business logic
     # -------------------------------------------------------------------------
@@ -295,8 +375,7 @@ class ClassroomSession(models.Model):
         else:
             # 🔵 STUDENT ADMISSION LOGIC (Replace sirf is part ko karein)
             from students.models import StudentProfile 
-            import datetime
-            import random
+            from students.sequences import next_student_id
             
             join_request.user.role = 'STUDENT'
             join_request.user.save(update_fields=['role'])
@@ -309,16 +388,13 @@ class ClassroomSession(models.Model):
                 msg = f"Student is already a permanent member of {session.target_standard.name}."
             else:
                 # 2. Create New Profile or Update existing one
-                year = datetime.date.today().year
-                org_prefix = session.organization.name[:3].upper() if session.organization else "GEN"
-                rand_num = random.randint(1000, 9999)
-                generated_id = f"{year}-{org_prefix}-{rand_num}"
-
                 student, created_profile = StudentProfile.objects.get_or_create(
                     user=join_request.user,
                     defaults={
                         "organization": session.organization,
-                        "student_unique_id": generated_id,
+                        # Sequence block se — random number wala collision/retry khatam
+                        # (callable: profile pehle se ho toh number consume nahi hota)
+                        "student_unique_id": lambda: next_student_id(session.organization),
                         "is_active": True,
                         "current_standard": session.target_standard,
                     },
@@ -346,11 +422,72 @@ class ClassroomSession(models.Model):
         join_request.status = JoinRequestStatus.ACCEPTED
         join_request.save(update_fields=["status", "updated_at"])
 
+        # Agar ye request waitlist mein thi toh entry bhi close kar do
+        SessionWaitlistEntry.objects.filter(
+            join_request=join_request, status=WaitlistStatus.WAITING
+        ).update(status=WaitlistStatus.PROMOTED, promoted_at=timezone.now())
+
         # After enrollment/recruitment -> update session status (like FULL)
+        # cached count enrollment se pehle ka hai, use drop karo warna FULL kabhi set nahi hoga
+        session.__dict__.pop("current_student_count", None)
         session._sync_status(save=True)
 
         return True, msg
 
+    @transaction.atomic
+    def promote_waitlist(self) -> int:
+        """
+        Free seats ke hisaab se waitlist ke aage wale requests FIFO order mein accept karo.
+        Batch mein chalta hai: ek query mein utni entries uthao jitni seats khali hain.
+        Returns number of promoted entries.
+        """
+        session = ClassroomSession.objects.select_for_update().get(pk=self.pk)
+        if session.status in SessionStatus.TERMINAL_STATES:
+            return 0
+        if timezone.now() >= session.expires_at:
+            session._sync_status(save=True)
+            self.status = session.status
+            return 0
+
+        promoted = 0
+        free_seats = session.student_limit - session.current_student_count
+        head = session.waitlist_head
+
+        while free_seats > 0:
+            batch = list(
+                session.waitlist
+                .filter(status=WaitlistStatus.WAITING, position__gt=head)
+                .select_related("join_request__user")
+                .order_by("position")[:free_seats]
+            )
+            if not batch:
+                break
+
+            for entry in batch:
+                ok, _msg = session.accept_join_request(entry.join_request)
+                if ok:
+                    promoted += 1
+                    free_seats -= 1
+                else:
+                    # Request ab pending nahi / already enrolled -> line se hatao
+                    entry.status = WaitlistStatus.CANCELLED
+                    entry.save(update_fields=["status"])
+                head = entry.position
+                if free_seats <= 0:
+                    break
+
+        if head != session.waitlist_head:
+            ClassroomSession.objects.filter(pk=session.pk).update(waitlist_head=head)
+            self.waitlist_head = head
+
+        # Queue khali ho ya seats bachi hon — FULL se wapas ACTIVE karna zaroori,
+        # warna join flow free seat hote hue bhi waitlist mein daalta rahega
+        session.__dict__.pop("current_student_count", None)
+        session._sync_status(save=True)
+        self.status = session.status
+
+        return promoted
+
 
 class SessionEnrollment(models.Model):
     student = models.ForeignKey(
@@ -379,11 +516,22 @@ class SessionEnrollment(models.Model):
     def __str__(self):
         return f"{self.student} @ {self.session.session_code}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Seat count badla -> cached snapshot purana ho gaya
+        self.session.invalidate_cache()
+
+    def delete(self, *args, **kwargs):
+        self.session.invalidate_cache()
+        return super().delete(*args, **kwargs)
+
     def deactivate(self):
         if self.is_active:
             self.is_active = False
             self.deactivated_at = timezone.now()
             self.save(update_fields=["is_active", "deactivated_at"])
+            # Seat khali hui -> waitlist se agla banda andar
+            self.session.promote_waitlist()
 
 
 class JoinRequest(models.Model):
@@ -420,8 +568,11 @@ class JoinRequest(models.Model):
         unique_together = (("session", "user"),)
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["session", "status"]),
-            models.Index(fields=["user", "status"]),
+            # Inbox keyset pagination (created_at, id) DESC — prefix (session, status)
+            # aur (user, status) wale purane lookups bhi inhi se chalte hain
+            models.Index(fields=["session", "status", "-created_at", "-id"]),
+            models.Index(fields=["user", "status", "-created_at", "-id"]),
+            models.Index(fields=["status", "-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -437,3 +588,69 @@ class JoinRequest(models.Model):
         self.reviewed_at = timezone.now()
         self.save(update_fields=["reviewed_by", "reviewed_at"])
 
+
+class SessionWaitlistEntry(models.Model):
+    """
+    FULL session ke liye line. `position` session ke `waitlist_tail` se milta hai,
+    isliye enqueue / promote / "meri position kya hai" teeno index lookups hain.
+    """
+    session = models.ForeignKey(
+        ClassroomSession,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="classroom_waitlist_entries",
+    )
+    join_request = models.OneToOneField(
+        JoinRequest,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entry",
+    )
+    position = models.PositiveIntegerField(editable=False)
+    status = models.CharField(
+        max_length=10,
+        choices=WaitlistStatus.CHOICES,
+        default=WaitlistStatus.WAITING,
+        db_index=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    promoted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Waitlist Entry")
+        verbose_name_plural = _("Waitlist Entries")
+        ordering = ["session", "position"]
+        unique_together = (("session", "user"), ("session", "position"))
+        indexes = [
+            models.Index(fields=["session", "status", "position"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} #{self.position} @ {self.session_id} ({self.status})"
+
+    @classmethod
+    @transaction.atomic
+    def enqueue(cls, session_id, join_request) -> "SessionWaitlistEntry":
+        """O(1): tail counter badhao aur wahi position le lo."""
+        ClassroomSession.objects.filter(pk=session_id).update(
+            waitlist_tail=models.F("waitlist_tail") + 1
+        )
+        position = ClassroomSession.objects.values_list("waitlist_tail", flat=True).get(pk=session_id)
+        return cls.objects.create(
+            session_id=session_id,
+            user_id=join_request.user_id,
+            join_request=join_request,
+            position=position,
+        )
+
+    def places_ahead(self, waitlist_head: int) -> int:
+        """
+        Kitne log aage hain (head se distance). Beech mein cancel hui entries
+        bhi gini jaati hain, isliye ye upper bound hai.
+        """
+        if self.status != WaitlistStatus.WAITING:
+            return 0
+        return max(self.position - waitlist_head - 1, 0)
@@ -0,0 +1,107 @@
+"""
+Bulk class/section provisioning.
+
+Naye school ka setup (15 classes x 5 sections) pehle 75+ `get_or_create` round-trips
+leta tha. Yahan poora matrix ek SELECT se diff hota hai aur missing rows ek
+`bulk_create(ignore_conflicts=True)` mein insert hoti hain, sab ek transaction mein.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from .constants import DEFAULT_TEMPLATE_SECTIONS, STANDARD_TEMPLATES
+from .models import Standard
+
+ClassSection = Tuple[str, Optional[str]]
+
+
+def _clean_section(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def build_matrix(classes=None, template: Optional[str] = None, sections=None) -> List[ClassSection]:
+    """
+    Request body -> ordered, de-duplicated (name, section) pairs.
+
+    classes  : [{"name": "Class 1", "section": ["A", "B"]}, ...]  (StandardViewSet.create wala format)
+    template : STANDARD_TEMPLATES ki key, e.g. "CBSE_K12"
+    sections : template ke har class pe lagne wale sections (default A-D)
+
+    Raises ValueError for unknown templates / missing names.
+    """
+    pairs: List[ClassSection] = []
+
+    if template:
+        key = str(template).strip().upper()
+        if key not in STANDARD_TEMPLATES:
+            raise ValueError(f"Unknown template '{template}'. Choices: {', '.join(sorted(STANDARD_TEMPLATES))}")
+        template_sections = _as_list(sections) or list(DEFAULT_TEMPLATE_SECTIONS)
+        for name in STANDARD_TEMPLATES[key]:
+            pairs.extend((name, _clean_section(sec)) for sec in template_sections)
+
+    for item in classes or []:
+        name = str(item.get("name") or "").strip()
+        if not name:
+            raise ValueError("Har class ka 'name' dena zaroori hai.")
+        item_sections = _as_list(item.get("section")) or [None]
+        pairs.extend((name, _clean_section(sec)) for sec in item_sections)
+
+    # Order same rakho, duplicates hatao
+    return list(dict.fromkeys(pairs))
+
+
+@transaction.atomic
+def provision_standards(organization_id, pairs: Iterable[ClassSection]) -> Dict[str, list]:
+    """
+    Missing (name, section) rows create karo. Returns
+    {"created": [(id, name, section), ...], "existing": [(id, name, section), ...]}.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return {"created": [], "existing": []}
+
+    names = {name for name, _ in pairs}
+    wanted = set(pairs)
+
+    # 1. Ek SELECT: jo already bani hain
+    existing = {
+        (name, section): pk
+        for pk, name, section in Standard.objects.filter(
+            organization_id=organization_id, name__in=names
+        ).values_list("id", "name", "section")
+        if (name, section) in wanted
+    }
+
+    missing = [pair for pair in pairs if pair not in existing]
+    created = {}
+    if missing:
+        # 2. Ek INSERT: (organization, name, section) unique key pe conflicts ignore
+        Standard.objects.bulk_create(
+            [Standard(organization_id=organization_id, name=name, section=section) for name, section in missing],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts ke saath PKs wapas nahi aate, isliye ids ke liye ek aur SELECT
+        missing_set = set(missing)
+        created = {
+            (name, section): pk
+            for pk, name, section in Standard.objects.filter(
+                organization_id=organization_id, name__in={name for name, _ in missing}
+            ).values_list("id", "name", "section")
+            if (name, section) in missing_set
+        }
+
+    return {
+        "created": [(created[pair], *pair) for pair in missing if pair in created],
+        "existing": [(existing[pair], *pair) for pair in pairs if pair in existing],
+    }
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.utils import timezone
-from .models import Standard, ClassroomSession, JoinRequest
+from django.db import transaction
+from .models import Standard, ClassroomSession, JoinRequest, SessionStatus, SessionWaitlistEntry
+from .cache import get_session_snapshot
 from rest_framework.validators import UniqueTogetherValidator
 
 # ✅ Correctly importing Student from the 'students' app
@@ -11,6 +13,14 @@ from students.models import StudentProfile
 # 1. Standard Serializers
 # ────────────────────────────────────────────────
 
+def _class_teacher_name(obj):
+    """Annotated naam (Standard.objects.with_listing_stats) ho toh wahi, warna user se."""
+    if obj.class_teacher_id is None:
+        return None
+    if hasattr(obj, "class_teacher_full_name"):
+        return obj.class_teacher_full_name
+    return obj.class_teacher.user.get_full_name()
+
 class StandardListSerializer(serializers.ModelSerializer):
     school_id = serializers.UUIDField(write_only=True, required=False)
     organization = serializers.HiddenField(default=None)
@@ -20,20 +30,25 @@ class StandardListSerializer(serializers.ModelSerializer):
     
     # 🎯 Change 2: teacher_name ko class_teacher_name kiya (SerializerMethodField for consistency)
     class_teacher_name = serializers.SerializerMethodField()
+    enrolled_student_count = serializers.SerializerMethodField()
 
     section = serializers.CharField(required=False, allow_null=True, allow_blank=True)
 
     class Meta:
         model = Standard
         # 🎯 Yahan bhi names update kar diye hain
-        fields = ("id", "school_id", "name", "section", "description", "organization", "class_teacher_id", "class_teacher_name")
-        read_only_fields = ("id", "class_teacher_name", "class_teacher_id")
+        fields = ("id", "school_id", "name", "section", "description", "organization", "class_teacher_id", "class_teacher_name", "enrolled_student_count")
+        read_only_fields = ("id", "class_teacher_name", "class_teacher_id", "enrolled_student_count")
 
     # 🎯 Teacher ka naam nikaalne ka logic (Wahi purana heart, bas naya naam)
     def get_class_teacher_name(self, obj):
-        if obj.class_teacher and hasattr(obj.class_teacher, 'user'):
-            return obj.class_teacher.user.get_full_name()
-        return None
+        return _class_teacher_name(obj)
+
+    def get_enrolled_student_count(self, obj):
+        # with_listing_stats() wala annotation; create response jaise cases mein fallback
+        if hasattr(obj, "enrolled_student_count"):
+            return obj.enrolled_student_count
+        return obj.enrolled_students.filter(is_active=True).count()
 
     def validate(self, attrs):
         user = self.context['request'].user
@@ -71,17 +86,28 @@ class StandardListSerializer(serializers.ModelSerializer):
 
 class StandardDetailSerializer(serializers.ModelSerializer):
     active_session_count = serializers.SerializerMethodField()
-    teacher_name = serializers.ReadOnlyField(source='class_teacher.user.get_full_name')
+    enrolled_student_count = serializers.SerializerMethodField()
+    teacher_name = serializers.SerializerMethodField()
 
     class Meta:
         model = Standard
-        fields = ("id", "name", "description", "active_session_count","class_teacher","teacher_name")
+        fields = ("id", "name", "description", "active_session_count", "enrolled_student_count", "class_teacher", "teacher_name")
         read_only_fields = fields
 
     def get_active_session_count(self, obj):
+        if hasattr(obj, "active_session_count"):
+            return obj.active_session_count
         # Accessing via related_name 'sessions' (as defined in your model)
         return obj.sessions.filter(status='ACTIVE').count()
 
+    def get_enrolled_student_count(self, obj):
+        if hasattr(obj, "enrolled_student_count"):
+            return obj.enrolled_student_count
+        return obj.enrolled_students.filter(is_active=True).count()
+
+    def get_teacher_name(self, obj):
+        return _class_teacher_name(obj)
+
 # ────────────────────────────────────────────────
 # 2. ClassroomSession Serializers
 # ────────────────────────────────────────────────
@@ -196,15 +222,14 @@ class JoinRequestCreateSerializer(serializers.ModelSerializer):
         fields = ("session_code",)
 
     def validate_session_code(self, value):
-        try:
-            # Session code check karna
-            session = ClassroomSession.objects.get(session_code=value.upper(), status='ACTIVE')
-            if session.current_student_count >= session.student_limit:
-                raise ValidationError("Bhai, ye session full ho chuka hai.")
-            self.context["session_obj"] = session
-        except ClassroomSession.DoesNotExist:
+        # DB ki jagah hot cache se snapshot (burst mein ek hi query)
+        session = get_session_snapshot(value)
+        if session is None or session.status not in (SessionStatus.ACTIVE, SessionStatus.FULL):
             raise ValidationError("Invalid or inactive session code.")
-        return value
+        if session.expires_at <= timezone.now():
+            raise ValidationError("Invalid or inactive session code.")
+        self.context["session_obj"] = session
+        return session.session_code
 
     def validate(self, attrs):
         user = self.context["request"].user
@@ -226,7 +251,7 @@ class JoinRequestCreateSerializer(serializers.ModelSerializer):
 
             # Check: Kya ye user pehle se usi school mein teacher hai?
             if hasattr(user, 'teacher_profile'):
-                if user.teacher_profile.organization == session.organization:
+                if user.teacher_profile.organization_id == session.organization_id:
                     raise ValidationError("Bhai, aap pehle se is school mein Teacher ho!")
 
         # 🎯 Case B: STUDENT Admission Session (Tera Purana Logic)
@@ -240,17 +265,30 @@ class JoinRequestCreateSerializer(serializers.ModelSerializer):
                 raise ValidationError(f"Aap pehle se hi {user.student_profile.current_standard.name} ke student ho!")
 
         # 🛑 2. Duplicate Request Check
-        if JoinRequest.objects.filter(session=session, user=user).exists():
+        if JoinRequest.objects.filter(session_id=session.id, user=user).exists():
             raise ValidationError("Aapne is session ke liye pehle hi request bhej di hai.")
 
         return attrs
 
+    @transaction.atomic
     def create(self, validated_data):
-        # Create method ab ekdum clean ho gaya
-        return JoinRequest.objects.create(
-            session=self.context["session_obj"], 
+        # Snapshot cache se tha (thoda purana ho sakta hai) — faisla locked row pe dobara.
+        # Full session -> reject nahi, waitlist mein daalo. Status column pe nahi,
+        # live count pe — status seat khali hone ke baad bhi FULL reh sakta hai
+        snapshot = self.context["session_obj"]
+        session = ClassroomSession.objects.select_for_update().get(pk=snapshot.id)
+        if session.status not in (SessionStatus.ACTIVE, SessionStatus.FULL) or session.expires_at <= timezone.now():
+            raise ValidationError({"session_code": ["Invalid or inactive session code."]})
+        waitlisted = session.current_student_count >= session.student_limit
+        self.context["waitlisted"] = waitlisted
+
+        join_request = JoinRequest.objects.create(
+            session_id=session.id,
             user=self.context["request"].user
         )
+        if waitlisted:
+            SessionWaitlistEntry.enqueue(session.id, join_request)
+        return join_request
 
 class JoinRequestListSerializer(serializers.ModelSerializer):
     session_id = serializers.ReadOnlyField(source='session.id')
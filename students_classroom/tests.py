@@ -1,3 +1,463 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from normal_user.cache import shared_cache
+from organizations.models import Organization
+from students.models import StudentProfile
+from teachers.models import Teacher
+
+from . import cache as session_cache
+from .constants import DEFAULT_TEMPLATE_SECTIONS, STANDARD_TEMPLATES
+from .models import (
+    ClassroomSession, JoinRequest, JoinRequestStatus, SessionEnrollment, SessionStatus,
+    SessionWaitlistEntry, Standard, WaitlistStatus,
+)
+from .provisioning import build_matrix, provision_standards
+
+User = get_user_model()
+
+
+class StandardListingQueryCountTests(TestCase):
+    """
+    Standard list/detail ki query count fix rehni chahiye — page mein kitni bhi
+    classes hon. Pehle har standard pe 2 extra queries lagti thi (teacher + sessions).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.org = Organization.objects.create(name="Query Count School", admin=cls.admin)
+
+        cls.standards = []
+        for i in range(12):
+            teacher_user = User.objects.create_user(
+                username=f"teacher{i}", email=f"teacher{i}@example.com", password="x",
+                mobile=f"91000000{i:02d}", first_name="Teacher", last_name=str(i),
+            )
+            teacher = Teacher.objects.create(user=teacher_user, qualifications="B.Ed", organization=cls.org)
+            standard = Standard.objects.create(
+                organization=cls.org, name=f"Class {i + 1}", section="A", class_teacher=teacher,
+            )
+            cls.standards.append(standard)
+
+            for j in range(2):
+                student_user = User.objects.create_user(
+                    username=f"student{i}_{j}", email=f"student{i}_{j}@example.com", password="x",
+                    mobile=f"92{i:02d}{j:06d}",
+                )
+                StudentProfile.objects.create(
+                    user=student_user, organization=cls.org,
+                    student_unique_id=f"STU-{i}-{j}", current_standard=standard,
+                )
+
+            ClassroomSession.objects.create(
+                organization=cls.org, teacher=teacher, target_standard=standard,
+                title=f"Admission {i}", student_limit=30,
+                expires_at=timezone.now() + timedelta(days=1), created_by=cls.admin,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_list_query_count_is_constant(self):
+        # 1 admin check + 1 pagination count + 1 annotated page
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/classroom/standards/")
+        self.assertEqual(response.status_code, 200)
+
+        rows = {row["id"]: row for row in response.data["results"]}
+        first = rows[self.standards[0].id]
+        self.assertEqual(first["enrolled_student_count"], 2)
+        self.assertEqual(first["class_teacher_name"], "Teacher 0")
+
+    def test_retrieve_query_count_is_constant(self):
+        standard = self.standards[0]
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/v1/classroom/standards/{standard.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["active_session_count"], 1)
+        self.assertEqual(response.data["enrolled_student_count"], 2)
+        self.assertEqual(response.data["teacher_name"], "Teacher 0")
+
+    def test_closed_sessions_are_not_counted(self):
+        standard = self.standards[1]
+        standard.sessions.update(status=SessionStatus.CLOSED)
+        response = self.client.get(f"/api/v1/classroom/standards/{standard.id}/")
+        self.assertEqual(response.data["active_session_count"], 0)
+
+
+# ────────────────────────────────────────────────
+# Session-code snapshot cache
+# ────────────────────────────────────────────────
+
+class SessionSnapshotCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.org = Organization.objects.create(name="Snapshot School", admin=cls.admin)
+        teacher_user = User.objects.create_user(
+            username="teacher", email="teacher@example.com", password="x", mobile="9100000000",
+        )
+        cls.teacher = Teacher.objects.create(user=teacher_user, qualifications="B.Ed", organization=cls.org)
+        cls.standard = Standard.objects.create(organization=cls.org, name="Class 5", section="A", class_teacher=cls.teacher)
+        cls.session = ClassroomSession.objects.create(
+            organization=cls.org, teacher=cls.teacher, target_standard=cls.standard,
+            title="Admission", student_limit=30,
+            expires_at=timezone.now() + timedelta(days=1), created_by=cls.admin,
+        )
+        cls.student_user = User.objects.create_user(
+            username="newkid", email="newkid@example.com", password="x", mobile="9200000000",
+        )
+
+    def setUp(self):
+        cache.clear()
+        shared_cache.clear()
+
+    def count_loads(self):
+        return mock.patch.object(session_cache, "_load_snapshot", wraps=session_cache._load_snapshot)
+
+    def test_hit_skips_the_database_load(self):
+        with self.count_loads() as load:
+            first = session_cache.get_session_snapshot(self.session.session_code)
+            second = session_cache.get_session_snapshot(f"  {self.session.session_code.lower()} ")
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(first.id, self.session.id)
+        self.assertEqual((second.id, second.status), (first.id, first.status))
+
+    def test_unknown_code_is_cached_as_a_miss(self):
+        with self.count_loads() as load:
+            self.assertIsNone(session_cache.get_session_snapshot("CLS-NOPE00"))
+            self.assertIsNone(session_cache.get_session_snapshot("CLS-NOPE00"))
+        self.assertEqual(load.call_count, 1)
+
+    def test_save_invalidates_after_commit(self):
+        code = self.session.session_code
+        self.assertEqual(session_cache.get_session_snapshot(code).status, SessionStatus.ACTIVE)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.session.status = SessionStatus.CLOSED
+            self.session.save(update_fields=["status", "updated_at"])
+
+        self.assertEqual(session_cache.get_session_snapshot(code).status, SessionStatus.CLOSED)
+
+    @override_settings(CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "single-flight"},
+    })
+    def test_concurrent_misses_load_once(self):
+        # Threads DB nahi chhoote — load fake hai, shared cache LocMem
+        snapshot = session_cache.SessionSnapshot(
+            1, "CLS-BURST1", self.org.pk, "STUDENT", 30, 0, timezone.now() + timedelta(days=1), SessionStatus.ACTIVE,
+        )
+        calls = []
+
+        def slow_load(code):
+            calls.append(code)
+            time.sleep(0.05)
+            return snapshot
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(session_cache.get_session_snapshot("CLS-BURST1"))
+
+        with mock.patch.object(session_cache, "_load_snapshot", side_effect=slow_load):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(calls, ["CLS-BURST1"])
+        self.assertEqual([result.session_code for result in results], ["CLS-BURST1"] * 8)
+        self.assertEqual(session_cache._inflight_locks, {})
+
+    def test_join_rechecks_stale_snapshot_under_lock(self):
+        code = self.session.session_code
+        session_cache.get_session_snapshot(code)
+        # .update() save() nahi chalata — cache abhi bhi ACTIVE bolega
+        ClassroomSession.objects.filter(pk=self.session.pk).update(status=SessionStatus.CLOSED)
+
+        client = APIClient()
+        client.force_authenticate(self.student_user)
+        response = client.post("/api/v1/classroom/join-requests/join/", {"session_code": code})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(JoinRequest.objects.filter(session=self.session).exists())
+
+
+# ────────────────────────────────────────────────
+# Waitlist — enqueue, FIFO promotion, seat re-open
+# ────────────────────────────────────────────────
+
+class SessionWaitlistTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.org = Organization.objects.create(name="Waitlist School", admin=cls.admin)
+        teacher_user = User.objects.create_user(
+            username="teacher", email="teacher@example.com", password="x", mobile="9100000000",
+        )
+        cls.teacher = Teacher.objects.create(user=teacher_user, qualifications="B.Ed", organization=cls.org)
+        cls.standard = Standard.objects.create(organization=cls.org, name="Class 5", section="A", class_teacher=cls.teacher)
+        cls.kids = [
+            User.objects.create_user(
+                username=f"kid{i}", email=f"kid{i}@example.com", password="x", mobile=f"920000000{i}",
+            )
+            for i in range(4)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        shared_cache.clear()
+
+    def make_session(self, limit):
+        return ClassroomSession.objects.create(
+            organization=self.org, teacher=self.teacher, target_standard=self.standard,
+            title="Admission", student_limit=limit,
+            expires_at=timezone.now() + timedelta(days=1), created_by=self.admin,
+        )
+
+    def join(self, session, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post("/api/v1/classroom/join-requests/join/", {"session_code": session.session_code})
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+    def admit(self, session, user):
+        payload = self.join(session, user)
+        self.assertFalse(payload["waitlisted"])
+        with self.captureOnCommitCallbacks(execute=True):
+            ok, msg = session.accept_join_request(JoinRequest.objects.get(pk=payload["id"]))
+        self.assertTrue(ok, msg)
+
+    def leave(self, session, user):
+        enrollment = SessionEnrollment.objects.select_related("session").get(session=session, student__user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment.deactivate()
+
+    def status(self, session):
+        return ClassroomSession.objects.values_list("status", flat=True).get(pk=session.pk)
+
+    def test_full_session_enqueues_in_order(self):
+        session = self.make_session(limit=1)
+        self.admit(session, self.kids[0])
+        self.assertEqual(self.status(session), SessionStatus.FULL)
+
+        first = self.join(session, self.kids[1])
+        second = self.join(session, self.kids[2])
+        self.assertEqual((first["waitlisted"], first["waitlist_position"]), (True, 1))
+        self.assertEqual((second["waitlisted"], second["waitlist_position"]), (True, 2))
+
+    def test_deactivate_promotes_head_of_queue(self):
+        session = self.make_session(limit=2)
+        self.admit(session, self.kids[0])
+        self.admit(session, self.kids[1])
+        self.join(session, self.kids[2])
+        self.join(session, self.kids[3])
+
+        self.leave(session, self.kids[0])
+
+        entries = dict(SessionWaitlistEntry.objects.filter(session=session).values_list("user_id", "status"))
+        self.assertEqual(entries, {
+            self.kids[2].pk: WaitlistStatus.PROMOTED,
+            self.kids[3].pk: WaitlistStatus.WAITING,
+        })
+        self.assertEqual(
+            JoinRequest.objects.get(session=session, user=self.kids[2]).status, JoinRequestStatus.ACCEPTED,
+        )
+        self.assertEqual(self.status(session), SessionStatus.FULL)
+
+        # Aage wala promote ho gaya -> ab baaki wala head pe
+        self.leave(session, self.kids[1])
+        self.assertEqual(
+            SessionWaitlistEntry.objects.get(session=session, user=self.kids[3]).status, WaitlistStatus.PROMOTED,
+        )
+
+    def test_empty_queue_reopens_session(self):
+        session = self.make_session(limit=1)
+        self.admit(session, self.kids[0])
+        self.assertEqual(self.status(session), SessionStatus.FULL)
+
+        self.leave(session, self.kids[0])
+        self.assertEqual(self.status(session), SessionStatus.ACTIVE)
+
+        # Seat khali hai -> naya banda seedha pending, waitlist nahi
+        self.assertFalse(self.join(session, self.kids[1])["waitlisted"])
+        self.assertFalse(SessionWaitlistEntry.objects.filter(session=session).exists())
+
+
+# ────────────────────────────────────────────────
+# Bulk class / section provisioning
+# ────────────────────────────────────────────────
+
+class StandardProvisioningTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.org = Organization.objects.create(name="Provision School", admin=cls.admin)
+
+    def test_build_matrix_dedupes_and_keeps_order(self):
+        pairs = build_matrix(
+            classes=[
+                {"name": " Class 1 ", "section": ["A", " A ", "B"]},
+                {"name": "Class 1", "section": "B"},
+                {"name": "Activity Room"},
+                {"name": "Activity Room", "section": ["", "  "]},
+            ],
+            template="pre_primary",
+            sections=["A"],
+        )
+        self.assertEqual(pairs, [
+            ("Nursery", "A"), ("LKG", "A"), ("UKG", "A"),
+            ("Class 1", "A"), ("Class 1", "B"),
+            ("Activity Room", None),
+        ])
+
+    def test_build_matrix_template_defaults_and_errors(self):
+        pairs = build_matrix(template="CBSE_K12")
+        self.assertEqual(len(pairs), len(STANDARD_TEMPLATES["CBSE_K12"]) * len(DEFAULT_TEMPLATE_SECTIONS))
+        with self.assertRaises(ValueError):
+            build_matrix(template="NOPE")
+        with self.assertRaises(ValueError):
+            build_matrix(classes=[{"section": "A"}])
+
+    def test_rerun_is_idempotent(self):
+        pairs = build_matrix(classes=[{"name": "Class 1", "section": ["A", "B"]}, {"name": "Library"}])
+
+        first = provision_standards(self.org.pk, pairs)
+        self.assertEqual([row[1:] for row in first["created"]], pairs)
+        self.assertEqual(first["existing"], [])
+
+        second = provision_standards(self.org.pk, pairs + [("Class 2", "A")])
+        self.assertEqual(second["existing"], first["created"])
+        self.assertEqual([row[1:] for row in second["created"]], [("Class 2", "A")])
+
+        self.assertEqual(Standard.objects.filter(organization=self.org).count(), 4)
+        self.assertEqual(Standard.objects.filter(organization=self.org, name="Library", section__isnull=True).count(), 1)
+
+    def test_null_section_is_unique_per_school(self):
+        Standard.objects.create(organization=self.org, name="Library", section=None)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Standard.objects.create(organization=self.org, name="Library", section=None)
+
+        # Conflict ignore ho — duplicate row nahi
+        Standard.objects.bulk_create([Standard(organization=self.org, name="Library", section=None)], ignore_conflicts=True)
+        self.assertEqual(Standard.objects.filter(organization=self.org, name="Library").count(), 1)
+
+
+# ────────────────────────────────────────────────
+# Join-request inbox (keyset pages + filters)
+# ────────────────────────────────────────────────
+
+class JoinRequestInboxPaginationTests(TestCase):
+    """Inbox pages: har row ek hi baar, aur filters har page pe lage rahein."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="principal", email="principal@example.com", password="x", mobile="9000000000",
+        )
+        cls.org = Organization.objects.create(name="Inbox School", admin=cls.admin)
+        other_admin = User.objects.create_user(
+            username="other", email="other@example.com", password="x", mobile="9000000001",
+        )
+        other_org = Organization.objects.create(name="Other School", admin=other_admin)
+        teacher_user = User.objects.create_user(
+            username="teacher", email="teacher@example.com", password="x", mobile="9100000000",
+        )
+        teacher = Teacher.objects.create(user=teacher_user, qualifications="B.Ed", organization=cls.org)
+        cls.class_5 = Standard.objects.create(organization=cls.org, name="Class 5", section="A")
+        cls.class_6 = Standard.objects.create(organization=cls.org, name="Class 6", section="A")
+        other_class = Standard.objects.create(organization=other_org, name="Class 5", section="A")
+
+        def session(org, standard, title):
+            return ClassroomSession.objects.create(
+                organization=org, teacher=teacher, target_standard=standard, title=title,
+                student_limit=50, expires_at=timezone.now() + timedelta(days=1), created_by=cls.admin,
+            )
+
+        cls.session_5a = session(cls.org, cls.class_5, "5 morning")
+        cls.session_5b = session(cls.org, cls.class_5, "5 evening")
+        cls.session_6 = session(cls.org, cls.class_6, "6")
+        foreign = session(other_org, other_class, "Other")
+
+        applicants = User.objects.bulk_create([
+            User(username=f"kid{i}", email=f"kid{i}@example.com", mobile=f"92{i:08d}")
+            for i in range(18)
+        ])
+        sessions = [cls.session_5a, cls.session_5b, cls.session_6]
+        statuses = [JoinRequestStatus.PENDING, JoinRequestStatus.PENDING, JoinRequestStatus.ACCEPTED, JoinRequestStatus.REJECTED]
+        JoinRequest.objects.bulk_create([
+            JoinRequest(session=sessions[i % 3], user=user, status=statuses[i % 4])
+            for i, user in enumerate(applicants)
+        ])
+        JoinRequest.objects.create(session=foreign, user=applicants[0])
+
+        # Aadhe rows ka same created_at — tie-breaker id pe
+        same_time = timezone.now() - timedelta(hours=2)
+        JoinRequest.objects.filter(pk__in=JoinRequest.objects.order_by("pk").values("pk")[:9]).update(created_at=same_time)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def walk(self, **params):
+        seen = []
+        response = self.client.get("/api/v1/classroom/join-requests/", {"page_size": 4, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                return seen
+            response = self.client.get(response.data["next"])
+
+    def expected(self, **filters):
+        return list(
+            JoinRequest.objects.filter(session__organization=self.org, **filters)
+            .order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_pages_cover_every_row_once(self):
+        seen = self.walk()
+        self.assertEqual(len(seen), 18)
+        self.assertEqual(seen, self.expected())
+
+    def test_filters_hold_across_pages(self):
+        self.assertEqual(self.walk(status="pending"), self.expected(status=JoinRequestStatus.PENDING))
+        self.assertEqual(self.walk(session=self.session_5b.pk), self.expected(session=self.session_5b))
+        self.assertEqual(self.walk(standard=self.class_5.pk), self.expected(session__target_standard=self.class_5))
+        self.assertEqual(
+            self.walk(standard=self.class_5.pk, status="PENDING"),
+            self.expected(session__target_standard=self.class_5, status=JoinRequestStatus.PENDING),
+        )
+
+    def test_bad_filter_values(self):
+        self.assertEqual(self.client.get("/api/v1/classroom/join-requests/", {"status": "MAYBE"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/classroom/join-requests/", {"session": "abc"}).status_code, 400)
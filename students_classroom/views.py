@@ -11,7 +11,10 @@ from rest_framework.throttling import UserRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 # Imports from your local files
 from .permissions import IsSessionTeacherOrAdmin, CanJoinSession
-from .models import ClassroomSession, JoinRequest, Standard, JoinRequestStatus
+from .models import ClassroomSession, JoinRequest, Standard, JoinRequestStatus, SessionWaitlistEntry
+from .cache import get_session_snapshot
+from normal_user.pagination import KeysetPagination
+from .provisioning import build_matrix, provision_standards
 from .serializers import AssignClassTeacherSerializer
 from .serializers import (
     StandardListSerializer,
@@ -49,6 +52,12 @@ class StandardPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
 
+class JoinRequestInboxPagination(KeysetPagination):
+    # (session, status, created_at, id) / (user, status, created_at, id) indexes se match karta hai
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    deferred_join = True
+
 # ────────────────────────────────────────────────
 # 3. Standard ViewSet
 # ────────────────────────────────────────────────
@@ -66,16 +75,19 @@ class StandardViewSet(viewsets.ModelViewSet):
         # 🔐 Sirf apni organization ki classes dikhao
         # 🎯 Admin Check (Multi-school Safe)
         qs = Standard.objects.all()
+        if self.action in ("list", "retrieve"):
+            # 📊 Counts + teacher naam annotation se, per-object queries nahi
+            qs = qs.with_listing_stats()
         if hasattr(user, 'school_admin_profile') and user.school_admin_profile.exists():
             # Org IDs ki list nikaalo (Safe Way)
             org_ids = user.school_admin_profile.values_list('organization_id', flat=True)
             # Filter mein 'organization_id__in' use karo
             return qs.filter(organization_id__in=org_ids)
         elif hasattr(user, 'teacher_profile'):
-            return Standard.objects.filter(organization=user.teacher_profile.organization)
+            return qs.filter(organization_id=user.teacher_profile.organization_id)
         elif hasattr(user, 'student_profile'):
-            return Standard.objects.filter(organization=user.student_profile.organization)
-        return Standard.objects.none()
+            return qs.filter(organization_id=user.student_profile.organization_id)
+        return qs.none()
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -125,41 +137,115 @@ class StandardViewSet(viewsets.ModelViewSet):
         if not school_id:
             return Response({"error": "Bhai, school_id bhejni zaroori hai!"}, status=400)
 
-        results = []
+        # 2. Poora class/section matrix ek saath provision karo (1 SELECT + 1 INSERT)
+        try:
+            pairs = build_matrix(classes=classes_data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        provision_standards(school_id, pairs)
 
-        # 2. Loop chalao
-        for item in classes_data:
-            class_name = item.get('name')
-            sections_list = item.get('section', []) # ["A", "B", "C"]
+        # 3. Response ka shape purana hi rakha hai
+        results = {}
+        for class_name, sec_name in pairs:
+            results.setdefault(class_name, []).append(sec_name if sec_name else "No Section")
 
-            # Agar koi section nahi bheja, toh kam se kam ek empty section ke saath class ban jaye
-            if not sections_list:
-                sections_list = [None]
+        return Response({
+            "status": "Success",
+            "school_id": school_id,
+            "processed_data": [
+                {"class": class_name, "sections": sections}
+                for class_name, sections in results.items()
+            ]
+        }, status=201)
 
-            created_sections = []
-            
-            # 3. Yahan 'Section' alag model nahi hai, isliye hum har section ke liye 
-            # Standard model mein hi entry karenge.
-            for sec_name in sections_list:
-                # 'Standard' model hi use hoga
-                obj, created = Standard.objects.get_or_create(
-                    organization_id=school_id, 
-                    name=class_name,
-                    section=sec_name # Yeh model ki field hai
-                )
-                created_sections.append(sec_name if sec_name else "No Section")
+    @action(detail=False, methods=['post'], url_path='provision')
+    def provision(self, request):
+        """
+        POST /standards/provision/
+        {
+          "school_id": "<uuid>",
+          "template": "CBSE_K12",            # optional
+          "sections": ["A", "B", "C", "D"],  # template ke sections (optional)
+          "classes": [{"name": "Class 1", "section": ["A", "B"]}]  # optional extra matrix
+        }
+        """
+        school_id = request.data.get('school_id')
+        if not school_id:
+            raise ValidationError({"school_id": "Bhai, school_id bhejni zaroori hai!"})
 
-            results.append({
-                "class": class_name,
-                "sections": created_sections
-            })
+        if not request.user.school_admin_profile.filter(organization_id=school_id).exists():
+            raise PermissionDenied("Aap is school ke admin nahi ho!")
+
+        try:
+            pairs = build_matrix(
+                classes=request.data.get('classes'),
+                template=request.data.get('template'),
+                sections=request.data.get('sections'),
+            )
+        except ValueError as e:
+            raise ValidationError({"error": str(e)})
+
+        if not pairs:
+            raise ValidationError({"error": "Bhai, 'template' ya 'classes' mein se kuch toh bhejo."})
+
+        outcome = provision_standards(school_id, pairs)
+
+        def _rows(rows):
+            return [{"id": pk, "name": name, "section": section} for pk, name, section in rows]
 
         return Response({
-            "status": "Success",
             "school_id": school_id,
-            "processed_data": results
-        }, status=201)
+            "created_count": len(outcome["created"]),
+            "existing_count": len(outcome["existing"]),
+            "created": _rows(outcome["created"]),
+            "existing": _rows(outcome["existing"]),
+        }, status=status.HTTP_201_CREATED if outcome["created"] else status.HTTP_200_OK)
     
+    @action(detail=False, methods=['post'], url_path='rollover')
+    def rollover(self, request):
+        """
+        POST /standards/rollover/
+        {
+          "school_id": "<uuid>",
+          "academic_year": "2025-26",
+          "mapping": [{"from": 12, "to": 15}, ...],   # Standard ids
+          "detained": [101, 102],                     # StudentProfile ids
+          "left": [230],
+          "dry_run": true
+        }
+        """
+        from students.rollover import RolloverError, run_rollover
+
+        school_id = request.data.get('school_id')
+        if not school_id:
+            raise ValidationError({"school_id": "Bhai, school_id bhejni zaroori hai!"})
+
+        if not request.user.school_admin_profile.filter(organization_id=school_id).exists():
+            raise PermissionDenied("Aap is school ke admin nahi ho!")
+
+        try:
+            mapping = {int(item['from']): int(item['to']) for item in request.data.get('mapping', [])}
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError({"mapping": "Format: [{\"from\": <standard_id>, \"to\": <standard_id>}]"})
+
+        if not mapping:
+            raise ValidationError({"mapping": "Kam se kam ek class mapping bhejo."})
+
+        try:
+            report = run_rollover(
+                school_id,
+                mapping,
+                detained=request.data.get('detained', []),
+                left=request.data.get('left', []),
+                academic_year=request.data.get('academic_year', ''),
+                dry_run=bool(request.data.get('dry_run', False)),
+                user=request.user,
+            )
+        except (RolloverError, TypeError, ValueError) as e:
+            raise ValidationError({"error": str(e)})
+
+        return Response(report, status=status.HTTP_200_OK)
+
     @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -349,6 +435,7 @@ class ClassroomSessionViewSet(viewsets.ModelViewSet):
 
 class JoinRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = JoinRequestInboxPagination
     
     def get_serializer_class(self):
         if self.action == "create" or self.action == "join":
@@ -357,7 +444,8 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        qs = JoinRequest.objects.all().select_related('session', 'user', 'session__organization')
+        # session.teacher.user tak ek hi JOIN mein (serializer ka class_teacher isi ko padhta hai)
+        qs = JoinRequest.objects.all().select_related('session__teacher__user', 'user')
 
         # 🎯 Step 1: Check karo kya user Admin hai (Strict & Safe)
         # hasattr(user, 'school_admin_profile') check karega relationship hai ya nahi
@@ -376,6 +464,31 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
         # Isse normal user ko 500 Error nahi aayega
         return qs.filter(user=user)
 
+    def filter_queryset(self, queryset):
+        """
+        Inbox filters: ?status=PENDING&session=<id>&standard=<id>
+        Sirf list pe lagte hain; detail/actions pe get_object normal rehta hai.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list":
+            return queryset
+
+        params = self.request.query_params
+        status_param = params.get("status")
+        if status_param:
+            status_param = status_param.upper()
+            if status_param not in dict(JoinRequestStatus.CHOICES):
+                raise ValidationError({"status": "Bhai, status PENDING/ACCEPTED/REJECTED mein se hona chahiye."})
+            queryset = queryset.filter(status=status_param)
+
+        for param, lookup in (("session", "session_id"), ("standard", "session__target_standard_id")):
+            value = params.get(param)
+            if value:
+                if not value.isdigit():
+                    raise ValidationError({param: "Bhai, valid id bhejo."})
+                queryset = queryset.filter(**{lookup: int(value)})
+        return queryset
+
     def create(self, request, *args, **kwargs):
         """
         Bhai, ye method tab chalega jab aap bina '/join/' ke hit karoge.
@@ -406,9 +519,50 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
         join_request = serializer.save()
         
         # Response wahi rakha hai jo tujhe chahiye tha
-        return Response({
+        payload = {
             "id": join_request.id,
             "status": join_request.status,
             "message": "Aapki request bhej di gayi hai! 👍",
-            "session_code": join_request.session.session_code
-        }, status=status.HTTP_201_CREATED)
\ No newline at end of file
+            "session_code": serializer.validated_data["session_code"],
+            "waitlisted": False,
+        }
+
+        entry = getattr(join_request, "waitlist_entry", None)
+        if entry is not None:
+            payload.update({
+                "waitlisted": True,
+                "waitlist_position": entry.position,
+                "message": "Session full hai, aapko waitlist mein daal diya gaya hai. Seat khali hote hi auto-accept ho jayega!",
+            })
+
+        return Response(payload, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"], url_path="waitlist-position")
+    def waitlist_position(self, request):
+        """
+        GET /join-requests/waitlist-position/?session_code=CLS-XXXXXX
+        (session, user) unique index se seedha entry -> queue scan nahi hota.
+        """
+        snapshot = get_session_snapshot(request.query_params.get("session_code", ""))
+        if snapshot is None:
+            raise ValidationError({"session_code": _("Invalid session code.")})
+
+        entry = (
+            SessionWaitlistEntry.objects
+            .select_related("session")
+            .filter(session_id=snapshot.id, user=request.user)
+            .first()
+        )
+        if entry is None:
+            return Response(
+                {"error": "Aap is session ki waitlist mein nahi ho."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response({
+            "session_code": snapshot.session_code,
+            "status": entry.status,
+            "position": entry.position,
+            "places_ahead": entry.places_ahead(entry.session.waitlist_head),
+            "joined_at": entry.created_at,
+        }, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 10:46
+
+import normal_user.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='teacher',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=normal_user.storage.blob_storage, upload_to='teacher_profiles/%Y/%m/', verbose_name='Profile Picture'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 import uuid
 from django.core.validators import MinValueValidator, MaxValueValidator
+from normal_user.storage import blob_storage
 
 
 class Teacher(models.Model):
@@ -84,6 +85,7 @@ class Teacher(models.Model):
     # ── Professional / Marketplace Fields (freelance tutors ke liye must-have) ─
     profile_picture = models.ImageField(
         upload_to='teacher_profiles/%Y/%m/',
+        storage=blob_storage,
         blank=True,
         null=True,
         verbose_name=_("Profile Picture")
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from normal_user.images import ImageVariantsField
 from .models import Teacher
 
 class TeacherPublicSerializer(serializers.ModelSerializer):
@@ -6,11 +7,12 @@ class TeacherPublicSerializer(serializers.ModelSerializer):
     full_name = serializers.CharField(read_only=True)
     expertise_summary = serializers.CharField(source='get_expertise_summary', read_only=True)
     organization_name = serializers.CharField(source='organization.name', read_only=True)
+    profile_picture_variants = ImageVariantsField(source='profile_picture')
 
     class Meta:
         model = Teacher
         fields = [
-            'id', 'full_name', 'profile_picture', 'bio', 
+            'id', 'full_name', 'profile_picture', 'profile_picture_variants', 'bio', 
             'expertise_summary', 'experience_years', 'hourly_rate', 
             'preferred_mode', 'is_verified', 'organization_name'
         ]
@@ -18,6 +20,7 @@ class TeacherPublicSerializer(serializers.ModelSerializer):
 class TeacherProfileSerializer(serializers.ModelSerializer):
     """Objective #9: Teacher apni details manage karega tab ke liye"""
     email = serializers.EmailField(source='user.email', read_only=True)
+    profile_picture_variants = ImageVariantsField(source='profile_picture')
 
     class Meta:
         model = Teacher
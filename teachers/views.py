@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from search.filters import FullTextSearchFilter
 from .models import Teacher
 from .serializers import TeacherPublicSerializer, TeacherProfileSerializer
 from .permissions import IsTeacherOwnerOrSchoolAdmin
@@ -13,11 +14,12 @@ class TeacherViewSet(viewsets.ModelViewSet):
     """
     queryset = Teacher.objects.filter(is_active_teacher=True)
     permission_classes = [IsTeacherOwnerOrSchoolAdmin]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     
     # Marketplace Filtering
     filterset_fields = ['is_verified', 'preferred_mode', 'organization']
-    search_fields = ['user__first_name', 'user__last_name', 'bio', 'subject_expertise']
+    search_index = 'teacher'   # naam + subjects + bio, FTS5 (search/indexes.py)
+    search_fields = ['user__first_name', 'user__last_name', 'bio', 'subject_expertise']   # fallback
     ordering_fields = ['hourly_rate', 'experience_years']
 
     def get_serializer_class(self):
@@ -44,7 +46,8 @@ class TeacherViewSet(viewsets.ModelViewSet):
         Objective #3: Teacher join request logic using session_code.
         """
         # Circular import se bachne ke liye import yahan andar kiya hai
-        from students_classroom.models import ClassroomSession, JoinRequest
+        from students_classroom.models import JoinRequest
+        from students_classroom.cache import get_session_snapshot
         
         # 1. Frontend se Code uthao (e.g. "CLS-X7Y2Z")
         session_code = request.data.get('session_code') 
@@ -52,11 +55,10 @@ class TeacherViewSet(viewsets.ModelViewSet):
         if not session_code:
             return Response({"error": "Session code is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 2. Database mein session check karo
-        session = get_object_or_404(
-            ClassroomSession.objects.active(), # Sirf wahi jo delete nahi hue
-            session_code=session_code
-        )
+        # 2. Session check karo (hot cache se snapshot, DB tabhi jab cache miss ho)
+        session = get_session_snapshot(session_code)
+        if session is None:
+            return Response({"error": "Invalid session code."}, status=status.HTTP_404_NOT_FOUND)
 
         # 3. Check karo session joinable hai (Time aur Capacity check)
         if not session.is_joinable:
@@ -67,7 +69,7 @@ class TeacherViewSet(viewsets.ModelViewSet):
 
         # 4. Join Request create karo (Ya existing wali uthao)
         join_request, created = JoinRequest.objects.get_or_create(
-            session=session,
+            session_id=session.id,
             user=request.user,
             defaults={'status': 'PENDING'}
         )
@@ -81,4 +83,4 @@ class TeacherViewSet(viewsets.ModelViewSet):
         return Response(
             {"message": "Join request sent successfully! Wait for school admin to accept."}, 
             status=status.HTTP_201_CREATED
-        )
\ No newline at end of file
+        )